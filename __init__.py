@@ -1,51 +1,259 @@
-import logging
-from enum import Enum
-from typing import Any
+from __future__ import annotations
 
-from pydantic import BaseModel, HttpUrl, ValidationError
+import importlib
+import itertools
+import logging
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any
 
+from .batch import BatchResult, aiter_bounded, gather_bounded, iter_bounded, map_bounded
+from .cache import CachePolicy, CacheStats, FileCache, PersistentCache, ReferenceCache, SQLiteCache
+from .coalesce import CoalescingStats
+from .compression import CompressionPolicy, TransferStats
+from .endpoints import AsyncRushAnalyticsAPI as BaseAsyncAPI
+from .endpoints import DEFAULT_CACHE_POLICIES, Endpoints
 from .endpoints import RushAnalyticsAPI as BaseAPI
+from .export import ResultColumns
+from .incremental import DEFAULT_KEY_FIELDS, IncrementalSync, RowChange, SyncCheckpoint
+from .instrumentation import LoggingHooks, MetricsHooks, MetricsRegistry, RequestHooks, RequestInfo
+from .journal import JobJournal, JournalEntry
+from .keypool import APIKey, AsyncKeyPool, KeyPool
+from .pipeline import PipelineResult, PipelineSummary, TaskPipeline
+from .polling import TaskOutcome, async_wait_for_tasks, wait_for_tasks
+from .ratelimit import RateLimiter
+from .regions import Region, RegionCatalog
+from .results_store import RankPoint, RankTrend, ResultsStore, result_rows
+from .retry import NO_RETRY, CircuitBreaker, RetryPolicy
+from .sharding import DEFAULT_SHARD_SIZE, Shard, ShardedJob
+from .transport import DEFAULT_LIMITS, DEFAULT_TIMEOUT, Transport
+
+if TYPE_CHECKING:
+    from .payload import TaskPayload, build_task_payload, build_task_request, keywords_from_rows, normalize_keywords
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Exported names loaded on first access; the payload models pull in pydantic,
+# which is most of the package's import time.
+_LAZY_EXPORTS = {
+    "TaskPayload": ".payload",
+    "build_task_payload": ".payload",
+    "build_task_request": ".payload",
+    "keywords_from_rows": ".payload",
+    "normalize_keywords": ".payload",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
-class Endpoints(Enum):
-    """Define API endpoints for Rush Analytics."""
-    CREATE_TASK = "tasks"
-    TASK_STATUS = "tasks/{task_id}"
-    TASK_RESULTS = "tasks/{task_id}/results"
-    LIST_LANGUAGES = "apiLanguages.php"
-    LIST_GOOGLE_REGIONS = "apiRegionsGoogle.php"
-    LIST_YANDEX_REGIONS = "apiRegionsYandex.php"
-
-class TaskPayload(BaseModel):
-    name: str
-    url: HttpUrl
-    competitors: list[str] = []
-    data_collection_frequency: int = 0
-    yandex_regions: list[dict[str, Any]] = []
-    google_regions: list[dict[str, Any]] = []
-    keywords: list[dict[str, str]] = []
-
-def build_task_payload(**kwargs) -> TaskPayload:
-    try:
-        return TaskPayload(**kwargs)
-    except ValidationError as e:
-        logger.error(f"Validation error: {e}")
-        raise
+
+# Default time-to-live, in seconds, of reference data kept in a persistent cache.
+REFERENCE_TTLS: dict[Endpoints, float] = {
+    Endpoints.LIST_LANGUAGES: 7 * 24 * 3600,
+    Endpoints.LIST_GOOGLE_REGIONS: 24 * 3600,
+    Endpoints.LIST_YANDEX_REGIONS: 24 * 3600,
+}
+
+# Endpoints whose responses change from one call to the next and must never be cached.
+VOLATILE_ENDPOINTS = frozenset({Endpoints.CREATE_TASK, Endpoints.TASK_STATUS, Endpoints.TASK_RESULTS})
+
+def _reject_volatile(endpoints: Iterable[Endpoints], setting: str) -> None:
+    volatile = VOLATILE_ENDPOINTS.intersection(endpoints)
+    if volatile:
+        names = ", ".join(sorted(endpoint.name for endpoint in volatile))
+        raise ValueError(f"{setting} cannot enable caching for {names}")
 
 class RushAnalyticsAPI(BaseAPI):
-    """Interact with the Rush Analytics API."""
+    """Interact with the Rush Analytics API.
+
+    Args:
+        api_key (str): The API key used to authenticate requests.
+        persistent_cache (PersistentCache | None): Optional backend, such as
+            ``SQLiteCache`` or ``FileCache``, used to keep reference data
+            (languages and regions) across processes.
+        reference_ttls (Mapping[Endpoints, float] | None): Per-endpoint TTL
+            overrides, in seconds, for the persistent cache.
+        cache_policies (Mapping[Endpoints, CachePolicy] | None): Per-endpoint
+            overrides of the in-memory response cache policy.
+        rate_limiter (RateLimiter | None): Paces outgoing requests. Pass the
+            same instance to several clients to share one budget.
+        retry_policy (RetryPolicy | None): How failed requests are retried.
+            Defaults to ``RetryPolicy()``; pass ``NO_RETRY`` to disable retries.
+        circuit_breaker (CircuitBreaker | None): Fails fast while the API is
+            down. Defaults to a breaker private to this client.
+        coalesce_requests (bool): Share one request between concurrent
+            identical GETs. See ``coalescing_stats`` for the savings.
+        transport (Transport | None): Connection pool to send requests over.
+            Pass the same instance to several clients, even with different
+            API keys, to share connections; the caller closes it. Defaults
+            to a pool private to this client.
+        compression (CompressionPolicy | None): Compress large request bodies,
+            such as tasks with many keywords. Responses are always negotiated
+            compressed; see ``transfer_stats`` for the bytes saved.
+        hooks (Iterable[RequestHooks] | None): Callbacks for request, retry,
+            cache and rate limiter events, such as ``MetricsHooks`` or ``LoggingHooks``.
+        results_store (ResultsStore | None): Local database that every task
+            result fetched is also written to, for offline history queries.
+
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        persistent_cache: PersistentCache | None = None,
+        reference_ttls: Mapping[Endpoints, float] | None = None,
+        cache_policies: Mapping[Endpoints, CachePolicy] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        coalesce_requests: bool = True,
+        transport: Transport | None = None,
+        compression: CompressionPolicy | None = None,
+        hooks: Iterable[RequestHooks] | None = None,
+        results_store: ResultsStore | None = None,
+    ) -> None:
+        _reject_volatile((e for e, policy in (cache_policies or {}).items() if policy.cacheable), "cache_policies")
+        _reject_volatile(reference_ttls or {}, "reference_ttls")
+        super().__init__(
+            api_key,
+            cache_policies=cache_policies,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            coalesce_requests=coalesce_requests,
+            transport=transport,
+            compression=compression,
+            hooks=hooks,
+        )
+        ttls = {**REFERENCE_TTLS, **(reference_ttls or {})}
+        self.reference_cache = (
+            ReferenceCache(persistent_cache, {endpoint.value: ttl for endpoint, ttl in ttls.items()})
+            if persistent_cache is not None
+            else None
+        )
+        self._region_catalogs: dict[Endpoints, tuple[Any, RegionCatalog]] = {}
+        self.results_store = results_store
+
+    def _region_catalog(self, endpoint: Endpoints, response: Any) -> RegionCatalog:
+        # Rebuild only when the underlying region list was actually refetched.
+        cached = self._region_catalogs.get(endpoint)
+        if cached is not None and cached[0] is response:
+            return cached[1]
+        catalog = RegionCatalog.from_response(response)
+        self._region_catalogs[endpoint] = (response, catalog)
+        return catalog
+
+    def _get_reference(self, endpoint: Endpoints) -> dict[str, Any]:
+        params = {"apikey": self.api_key}
+        if self.reference_cache is None:
+            return self.get_data(endpoint.value, params)
+        return self.reference_cache.get_or_fetch(
+            endpoint.value,
+            params,
+            lambda: self.get_data(endpoint.value, params),
+            self._cache_observer(endpoint.value, "reference"),
+        )
 
     def create_task(self, **kwargs) -> dict[str, Any]:
+        from .payload import ValidationError, build_task_request
+
         try:
-            payload = TaskPayload(**kwargs).dict()
+            payload = build_task_request(self.api_key, kwargs)
             endpoint = Endpoints.CREATE_TASK.value
             return self.post_data(endpoint, payload)
         except ValidationError as e:
-            logger.error(f"Validation error while creating task: {e}")
+            logger.error("Validation error while creating task: %s", e)
             raise
 
+    def create_tasks(
+        self,
+        payloads: Iterable[TaskPayload | dict[str, Any]],
+        max_concurrency: int = 10,
+        journal: JobJournal | None = None,
+        job: str = "default",
+    ) -> list[BatchResult[dict[str, Any]]]:
+        """Create many tasks at once over a bounded thread pool.
+
+        Every payload is validated with ``TaskPayload`` and submitted on the
+        shared ``httpx.Client``. A failing item does not abort the batch; its
+        exception is stored on the corresponding result instead.
+
+        Args:
+            payloads (Iterable[TaskPayload | dict[str, Any]]): Task payloads or their keyword arguments.
+            max_concurrency (int): Maximum number of requests in flight.
+            journal (JobJournal | None): Records every submission, so calling again with
+                the same ``job`` and payloads after a crash skips the tasks already created.
+            job (str): Name of the run in the journal.
+
+        Returns:
+            list[BatchResult[dict[str, Any]]]: One result per payload, in input order.
+
+        """
+        from .payload import build_task_request
+
+        endpoint = Endpoints.CREATE_TASK.value
+
+        def submit(payload: TaskPayload | dict[str, Any]) -> dict[str, Any]:
+            return self.post_data(endpoint, build_task_request(self.api_key, payload))
+
+        if journal is None:
+            return map_bounded(submit, payloads, max_concurrency)
+
+        def submit_once(item: tuple[str, Any, JournalEntry | None]) -> dict[str, Any]:
+            key, payload, entry = item
+            return journal.submit(job, key, entry, lambda: submit(payload))
+
+        results = map_bounded(submit_once, journal.plan(job, payloads), max_concurrency)
+        journal.flush()
+        return results
+
+    def create_sharded_task(
+        self,
+        shard_size: int | None = DEFAULT_SHARD_SIZE,
+        by_region: bool = False,
+        max_concurrency: int = 10,
+        **kwargs: Any,
+    ) -> ShardedJob:
+        """Split a large task into several smaller tasks and submit them concurrently.
+
+        The payload is validated once, split with ``sharding.split_task`` and
+        the shards are created with ``create_tasks``. Shards that fail to
+        submit are recorded on the returned job and can be resubmitted alone
+        with ``submit_shards``.
+
+        Args:
+            shard_size (int | None): Maximum keywords per task.
+            by_region (bool): Create separate tasks for every region.
+            max_concurrency (int): Maximum number of requests in flight.
+            **kwargs: The fields of the task, as for ``create_task``.
+
+        Returns:
+            ShardedJob: The job tracking every shard and its task ID.
+
+        """
+        from .payload import build_task_payload
+
+        payload = build_task_payload(**kwargs)
+        job = ShardedJob.split(payload.model_dump(), shard_size, by_region)
+        return self.submit_shards(job, max_concurrency)
+
+    def submit_shards(self, job: ShardedJob, max_concurrency: int = 10) -> ShardedJob:
+        """Submit the shards of ``job`` that have no task yet, such as failed ones.
+
+        Returns:
+            ShardedJob: The same job, updated in place.
+
+        """
+        shards = job.pending
+        job.record(shards, self.create_tasks([shard.payload for shard in shards], max_concurrency))
+        return job
+
     def get_task_status(self, task_id: str) -> dict[str, Any]:
         """Retrieve the status of a specific task.
 
@@ -72,14 +280,174 @@ class RushAnalyticsAPI(BaseAPI):
         """
         endpoint = Endpoints.TASK_RESULTS.value.format(task_id=task_id)
         params = {"apikey": self.api_key}
-        return self.get_data(endpoint, params)
+        response = self.get_data(endpoint, params)
+        if self.results_store is not None:
+            self.results_store.upsert(task_id, result_rows(response))
+        return response
+
+    def get_task_statuses(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> list[BatchResult[dict[str, Any]]]:
+        """Fetch the status of many tasks over a bounded thread pool.
+
+        Every request goes through the shared ``httpx.Client``, so the threads
+        reuse the same keep-alive connections, rate limiter and retry policy. A
+        failing task does not abort the batch; its exception is stored on the
+        corresponding result instead.
+
+        Args:
+            task_ids (Iterable[str]): The IDs of the tasks.
+            max_concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            list[BatchResult[dict[str, Any]]]: One result per task, in input order.
+
+        """
+        return map_bounded(self.get_task_status, task_ids, max_concurrency)
+
+    def iter_task_statuses(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> Iterator[BatchResult[dict[str, Any]]]:
+        """Like ``get_task_statuses``, but yield each result as soon as it arrives.
+
+        Yields:
+            BatchResult[dict[str, Any]]: One result per task, in completion order;
+            ``index`` is the position of the task in ``task_ids``.
+
+        """
+        return iter_bounded(self.get_task_status, task_ids, max_concurrency)
+
+    def get_task_results_many(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> list[BatchResult[dict[str, Any]]]:
+        """Fetch the results of many completed tasks over a bounded thread pool.
+
+        Args:
+            task_ids (Iterable[str]): The IDs of the tasks.
+            max_concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            list[BatchResult[dict[str, Any]]]: One result per task, in input order.
+
+        """
+        return map_bounded(self.get_task_results, task_ids, max_concurrency)
+
+    def iter_task_results_many(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> Iterator[BatchResult[dict[str, Any]]]:
+        """Like ``get_task_results_many``, but yield each result as soon as it arrives."""
+        return iter_bounded(self.get_task_results, task_ids, max_concurrency)
+
+    def wait_for_tasks(self, task_ids: Iterable[str], **options: Any) -> Iterator[TaskOutcome]:
+        """Poll the status of many tasks and yield each one as it finishes.
+
+        Args:
+            task_ids (Iterable[str]): The IDs of the tasks to wait for.
+            **options: Scheduling options accepted by ``polling.wait_for_tasks``.
+
+        Yields:
+            TaskOutcome: The final state of each task, in completion order.
+
+        """
+        return wait_for_tasks(self.get_task_status, task_ids, **options)
+
+    def iter_task_results(
+        self, task_id: str, key: str | None = None, params: Mapping[str, Any] | None = None
+    ) -> Iterator[Any]:
+        """Stream the results of a completed task one row at a time.
+
+        Unlike ``get_task_results``, the response is parsed incrementally, so
+        memory use stays flat regardless of the size of the result set.
+
+        Args:
+            task_id (str): The ID of the task.
+            key (str | None): Member of the response object holding the result rows.
+                Defaults to the first array in the response.
+            params (Mapping[str, Any] | None): Extra query parameters, such as a date filter.
+
+        Yields:
+            Any: Each result row, in order.
+
+        """
+        endpoint = Endpoints.TASK_RESULTS.value.format(task_id=task_id)
+        rows = self.stream_data(endpoint, {**(params or {}), "apikey": self.api_key}, key)
+        return rows if self.results_store is None else self.results_store.tee(task_id, rows)
+
+    def get_task_results_columns(
+        self, task_id: str, key: str | None = None, defaults: Mapping[str, Any] | None = None
+    ) -> ResultColumns:
+        """Stream the results of a task straight into columnar form.
+
+        Args:
+            task_id (str): The ID of the task.
+            key (str | None): Member of the response object holding the result rows.
+            defaults (Mapping[str, Any] | None): Values for columns missing from the rows.
+
+        Returns:
+            ResultColumns: The results, ready for ``to_pandas``, ``to_arrow`` or ``write_parquet``.
+
+        """
+        columns = ResultColumns(defaults)
+        columns.extend(self.iter_task_results(task_id, key))
+        return columns
+
+    def sync_task_results(self, task_id: str, sync: IncrementalSync, key: str | None = None) -> Iterator[RowChange]:
+        """Stream only the result rows of a task that are new or changed since its last sync.
+
+        The task checkpoint is updated once the iterator is exhausted; stopping
+        early leaves it untouched, so the next sync reports the same rows again.
+
+        Args:
+            task_id (str): The ID of the task.
+            sync (IncrementalSync): Holds the checkpoints and the diff settings.
+            key (str | None): Member of the response object holding the result rows.
+
+        Yields:
+            RowChange: Each new or changed row, in response order.
+
+        """
+        checkpoint = sync.checkpoint(task_id)
+        return sync.diff(checkpoint, self.iter_task_results(task_id, key, sync.params(checkpoint)))
+
+    def sync_tasks(
+        self, task_ids: Iterable[str], sync: IncrementalSync, key: str | None = None, max_concurrency: int = 10
+    ) -> list[BatchResult[list[RowChange]]]:
+        """Sync many recurring tasks on a bounded thread pool.
+
+        Args:
+            task_ids (Iterable[str]): The IDs of the tasks to sync.
+            sync (IncrementalSync): Holds the checkpoints and the diff settings.
+            key (str | None): Member of the response object holding the result rows.
+            max_concurrency (int): Maximum number of tasks synced at once.
+
+        Returns:
+            list[BatchResult[list[RowChange]]]: The changes of each task, in input
+            order. A failed task keeps its previous checkpoint.
+
+        """
+        return map_bounded(lambda task_id: list(self.sync_task_results(task_id, sync, key)), task_ids, max_concurrency)
+
+    def iter_job_results(self, job: ShardedJob, key: str | None = None) -> Iterator[Any]:
+        """Stream the merged results of every shard of a job, in shard order.
+
+        Raises:
+            ValueError: If some shards of the job were never submitted.
+
+        """
+        job.require_complete()
+        return itertools.chain.from_iterable(self.iter_task_results(task_id, key) for task_id in job.task_ids)
+
+    def get_job_results_columns(
+        self, job: ShardedJob, key: str | None = None, defaults: Mapping[str, Any] | None = None
+    ) -> ResultColumns:
+        """Collect the merged results of every shard of a job in columnar form."""
+        columns = ResultColumns(defaults)
+        columns.extend(self.iter_job_results(job, key))
+        return columns
 
-    @cached(cache)
     def list_languages(self) -> dict[str, Any]:
         logger.info("Fetching supported languages from API.")
-        endpoint = Endpoints.LIST_LANGUAGES.value
-        params = {"apikey": self.api_key}
-        return self.get_data(endpoint, params)
+        return self._get_reference(Endpoints.LIST_LANGUAGES)
 
     def list_google_regions(self) -> dict[str, Any]:
         """Fetch the list of supported Google regions from the API.
@@ -88,9 +456,7 @@ class RushAnalyticsAPI(BaseAPI):
             dict[str, Any]: The API response containing the list of Google regions.
 
         """
-        endpoint = Endpoints.LIST_GOOGLE_REGIONS.value
-        params = {"apikey": self.api_key}
-        return self.get_data(endpoint, params)
+        return self._get_reference(Endpoints.LIST_GOOGLE_REGIONS)
 
     def list_yandex_regions(self) -> dict[str, Any]:
         """Fetch the list of supported Yandex regions from the API.
@@ -99,57 +465,248 @@ class RushAnalyticsAPI(BaseAPI):
             dict[str, Any]: The API response containing the list of Yandex regions.
 
         """
-        endpoint = Endpoints.LIST_YANDEX_REGIONS.value
-        params = {"apikey": self.api_key}
-        return self.get_data(endpoint, params)
+        return self._get_reference(Endpoints.LIST_YANDEX_REGIONS)
+
+    def google_region_catalog(self) -> RegionCatalog:
+        """Return an indexed catalog of the supported Google regions.
+
+        The catalog is built once per region list and reused while the list is
+        served from cache.
+
+        Returns:
+            RegionCatalog: Regions indexed by ID, name, prefix, parent and country.
+
+        """
+        return self._region_catalog(Endpoints.LIST_GOOGLE_REGIONS, self.list_google_regions())
 
-class AsyncRushAnalyticsAPI(RushAnalyticsAPI):
-    """Asynchronous version of RushAnalyticsAPI."""
+    def yandex_region_catalog(self) -> RegionCatalog:
+        """Return an indexed catalog of the supported Yandex regions.
 
-    async def create_task(
+        Returns:
+            RegionCatalog: Regions indexed by ID, name, prefix, parent and country.
+
+        """
+        return self._region_catalog(Endpoints.LIST_YANDEX_REGIONS, self.list_yandex_regions())
+
+class AsyncRushAnalyticsAPI(RushAnalyticsAPI, BaseAsyncAPI):
+    """Asynchronous version of RushAnalyticsAPI.
+
+    Takes the same arguments and offers the same methods as ``RushAnalyticsAPI``,
+    each returning a coroutine or async iterator that runs on the shared
+    ``httpx.AsyncClient``. The ``async_`` prefixed names are kept as aliases.
+    Use ``async with`` to close the connection pool when done.
+    """
+
+    async def create_task(self, **kwargs) -> dict[str, Any]:
+        from .payload import ValidationError, build_task_request
+
+        try:
+            payload = build_task_request(self.api_key, kwargs)
+        except ValidationError as e:
+            logger.error("Validation error while creating task: %s", e)
+            raise
+        return await self.async_post_data(Endpoints.CREATE_TASK.value, payload)
+
+    async def create_tasks(
         self,
-        name: str,
-        url: str,
-        competitors: list[str] | None = None,
-        data_collection_frequency: int = 0,
-        yandex_regions: list[dict[str, Any]] | None = None,
-        google_regions: list[dict[str, Any]] | None = None,
-        keywords: list[dict[str, str]] | None = None,
-    ) -> dict[str, Any]:
+        payloads: Iterable[TaskPayload | dict[str, Any]],
+        max_concurrency: int = 10,
+        journal: JobJournal | None = None,
+        job: str = "default",
+    ) -> list[BatchResult[dict[str, Any]]]:
+        """Create many tasks concurrently over the shared ``httpx.AsyncClient``.
+
+        Args:
+            payloads (Iterable[TaskPayload | dict[str, Any]]): Task payloads or their keyword arguments.
+            max_concurrency (int): Maximum number of requests in flight.
+            journal (JobJournal | None): Records every submission; see ``RushAnalyticsAPI.create_tasks``.
+            job (str): Name of the run in the journal.
+
+        Returns:
+            list[BatchResult[dict[str, Any]]]: One result per payload, in input order.
+
+        """
+        from .payload import build_task_request
+
         endpoint = Endpoints.CREATE_TASK.value
-        payload = {
-            "apikey": self.api_key,
-            "name": name,
-            "url": url,
-            "competitors": competitors or [],
-            "dataCollectionFrequency": data_collection_frequency,
-            "yandexRegions": yandex_regions or [],
-            "googleRegions": google_regions or [],
-            "keywords": keywords or [],
-        }
-        return await self.post_data(endpoint, payload)
+
+        async def submit(payload: TaskPayload | dict[str, Any]) -> dict[str, Any]:
+            return await self.async_post_data(endpoint, build_task_request(self.api_key, payload))
+
+        if journal is None:
+            return await gather_bounded(submit, payloads, max_concurrency)
+
+        async def submit_once(item: tuple[str, Any, JournalEntry | None]) -> dict[str, Any]:
+            key, payload, entry = item
+            return await journal.async_submit(job, key, entry, lambda: submit(payload))
+
+        results = await gather_bounded(submit_once, journal.plan(job, payloads), max_concurrency)
+        journal.flush()
+        return results
+
+    async def create_sharded_task(
+        self,
+        shard_size: int | None = DEFAULT_SHARD_SIZE,
+        by_region: bool = False,
+        max_concurrency: int = 10,
+        **kwargs: Any,
+    ) -> ShardedJob:
+        from .payload import build_task_payload
+
+        payload = build_task_payload(**kwargs)
+        job = ShardedJob.split(payload.model_dump(), shard_size, by_region)
+        return await self.submit_shards(job, max_concurrency)
+
+    async def submit_shards(self, job: ShardedJob, max_concurrency: int = 10) -> ShardedJob:
+        shards = job.pending
+        job.record(shards, await self.create_tasks([shard.payload for shard in shards], max_concurrency))
+        return job
 
     async def async_get_task_status(self, task_id: str) -> dict[str, Any]:
         endpoint = Endpoints.TASK_STATUS.value.format(task_id=task_id)
         params = {"apikey": self.api_key}
-        return await self.get_data(endpoint, params)
+        return await self.async_get_data(endpoint, params)
+
+    async def async_get_task_statuses(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> list[BatchResult[dict[str, Any]]]:
+        return await gather_bounded(self.async_get_task_status, task_ids, max_concurrency)
+
+    def async_iter_task_statuses(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> AsyncIterator[BatchResult[dict[str, Any]]]:
+        return aiter_bounded(self.async_get_task_status, task_ids, max_concurrency)
+
+    async def async_get_task_results_many(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> list[BatchResult[dict[str, Any]]]:
+        return await gather_bounded(self.async_get_task_results, task_ids, max_concurrency)
+
+    def async_iter_task_results_many(
+        self, task_ids: Iterable[str], max_concurrency: int = 10
+    ) -> AsyncIterator[BatchResult[dict[str, Any]]]:
+        return aiter_bounded(self.async_get_task_results, task_ids, max_concurrency)
+
+    def wait_for_tasks(self, task_ids: Iterable[str], **options: Any) -> AsyncIterator[TaskOutcome]:
+        """Asynchronously poll many tasks and yield each one as it finishes.
+
+        Args:
+            task_ids (Iterable[str]): The IDs of the tasks to wait for.
+            **options: Scheduling options accepted by ``polling.async_wait_for_tasks``.
+
+        Yields:
+            TaskOutcome: The final state of each task, in completion order.
+
+        """
+        return async_wait_for_tasks(self.async_get_task_status, task_ids, **options)
 
     async def async_get_task_results(self, task_id: str) -> dict[str, Any]:
         endpoint = Endpoints.TASK_RESULTS.value.format(task_id=task_id)
         params = {"apikey": self.api_key}
-        return await self.get_data(endpoint, params)
+        response = await self.async_get_data(endpoint, params)
+        if self.results_store is not None:
+            await self.results_store.async_upsert(task_id, result_rows(response))
+        return response
 
-    async def async_list_languages(self) -> dict[str, Any]:
-        endpoint = Endpoints.LIST_LANGUAGES.value
+    def async_iter_task_results(
+        self, task_id: str, key: str | None = None, params: Mapping[str, Any] | None = None
+    ) -> AsyncIterator[Any]:
+        """Asynchronously stream the results of a completed task one row at a time.
+
+        Args:
+            task_id (str): The ID of the task.
+            key (str | None): Member of the response object holding the result rows.
+            params (Mapping[str, Any] | None): Extra query parameters, such as a date filter.
+
+        Yields:
+            Any: Each result row, in order.
+
+        """
+        endpoint = Endpoints.TASK_RESULTS.value.format(task_id=task_id)
+        rows = self.async_stream_data(endpoint, {**(params or {}), "apikey": self.api_key}, key)
+        return rows if self.results_store is None else self.results_store.async_tee(task_id, rows)
+
+    async def async_get_task_results_columns(
+        self, task_id: str, key: str | None = None, defaults: Mapping[str, Any] | None = None
+    ) -> ResultColumns:
+        columns = ResultColumns(defaults)
+        async for row in self.async_iter_task_results(task_id, key):
+            columns.extend((row,))
+        return columns
+
+    def async_sync_task_results(
+        self, task_id: str, sync: IncrementalSync, key: str | None = None
+    ) -> AsyncIterator[RowChange]:
+        """Asynchronously stream only the result rows of a task that are new or changed since its last sync."""
+        checkpoint = sync.checkpoint(task_id)
+        return sync.async_diff(checkpoint, self.async_iter_task_results(task_id, key, sync.params(checkpoint)))
+
+    async def async_sync_tasks(
+        self, task_ids: Iterable[str], sync: IncrementalSync, key: str | None = None, max_concurrency: int = 10
+    ) -> list[BatchResult[list[RowChange]]]:
+        """Sync many recurring tasks with at most ``max_concurrency`` in flight."""
+
+        async def sync_one(task_id: str) -> list[RowChange]:
+            return [change async for change in self.async_sync_task_results(task_id, sync, key)]
+
+        return await gather_bounded(sync_one, task_ids, max_concurrency)
+
+    async def async_iter_job_results(self, job: ShardedJob, key: str | None = None) -> AsyncIterator[Any]:
+        job.require_complete()
+        for task_id in job.task_ids:
+            async for row in self.async_iter_task_results(task_id, key):
+                yield row
+
+    async def async_get_job_results_columns(
+        self, job: ShardedJob, key: str | None = None, defaults: Mapping[str, Any] | None = None
+    ) -> ResultColumns:
+        columns = ResultColumns(defaults)
+        async for row in self.async_iter_job_results(job, key):
+            columns.extend((row,))
+        return columns
+
+    async def _async_get_reference(self, endpoint: Endpoints) -> dict[str, Any]:
         params = {"apikey": self.api_key}
-        return await self.get_data(endpoint, params)
+        if self.reference_cache is None:
+            return await self.async_get_data(endpoint.value, params)
+        return await self.reference_cache.async_get_or_fetch(
+            endpoint.value,
+            params,
+            lambda: self.async_get_data(endpoint.value, params),
+            self._cache_observer(endpoint.value, "reference"),
+        )
+
+    async def async_list_languages(self) -> dict[str, Any]:
+        return await self._async_get_reference(Endpoints.LIST_LANGUAGES)
 
     async def async_list_google_regions(self) -> dict[str, Any]:
-        endpoint = Endpoints.LIST_GOOGLE_REGIONS.value
-        params = {"apikey": self.api_key}
-        return await self.get_data(endpoint, params)
+        return await self._async_get_reference(Endpoints.LIST_GOOGLE_REGIONS)
 
     async def async_list_yandex_regions(self) -> dict[str, Any]:
-        endpoint = Endpoints.LIST_YANDEX_REGIONS.value
-        params = {"apikey": self.api_key}
-        return await self.get_data(endpoint, params)
+        return await self._async_get_reference(Endpoints.LIST_YANDEX_REGIONS)
+
+    async def async_google_region_catalog(self) -> RegionCatalog:
+        return self._region_catalog(Endpoints.LIST_GOOGLE_REGIONS, await self.async_list_google_regions())
+
+    async def async_yandex_region_catalog(self) -> RegionCatalog:
+        return self._region_catalog(Endpoints.LIST_YANDEX_REGIONS, await self.async_list_yandex_regions())
+
+    # Every I/O method of the synchronous client under its own name, as a coroutine or
+    # async iterator, so nothing inherited from RushAnalyticsAPI blocks the event loop.
+    get_task_status = async_get_task_status
+    get_task_results = async_get_task_results
+    get_task_statuses = async_get_task_statuses
+    iter_task_statuses = async_iter_task_statuses
+    get_task_results_many = async_get_task_results_many
+    iter_task_results_many = async_iter_task_results_many
+    iter_task_results = async_iter_task_results
+    get_task_results_columns = async_get_task_results_columns
+    sync_task_results = async_sync_task_results
+    sync_tasks = async_sync_tasks
+    iter_job_results = async_iter_job_results
+    get_job_results_columns = async_get_job_results_columns
+    list_languages = async_list_languages
+    list_google_regions = async_list_google_regions
+    list_yandex_regions = async_list_yandex_regions
+    google_region_catalog = async_google_region_catalog
+    yandex_region_catalog = async_yandex_region_catalog
@@ -0,0 +1,175 @@
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BatchResult(Generic[R]):
+    """Outcome of a single item in a batch call.
+
+    Attributes:
+        index (int): Position of the item in the input sequence.
+        value (R | None): The result when the call succeeded.
+        error (Exception | None): The exception raised for this item, if any.
+
+    """
+
+    index: int
+    value: R | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> R:
+        """Return the value, re-raising the stored error if the item failed."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+async def gather_bounded(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    max_concurrency: int = 10,
+) -> list[BatchResult[R]]:
+    """Run ``func`` over ``items`` with at most ``max_concurrency`` calls in flight.
+
+    A fixed pool of workers pulls items from a shared iterator, so memory stays
+    bounded no matter how many items are submitted. Exceptions are captured per
+    item instead of cancelling the whole batch.
+
+    Args:
+        func (Callable[[T], Awaitable[R]]): Coroutine function applied to each item.
+        items (Iterable[T]): The items to process.
+        max_concurrency (int): Maximum number of concurrent calls.
+
+    Returns:
+        list[BatchResult[R]]: One result per item, in input order.
+
+    """
+    import asyncio
+
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    pending = enumerate(items)
+    results: dict[int, BatchResult[R]] = {}
+
+    async def worker() -> None:
+        for index, item in pending:
+            try:
+                results[index] = BatchResult(index, value=await func(item))
+            except Exception as e:
+                results[index] = BatchResult(index, error=e)
+
+    await asyncio.gather(*(worker() for _ in range(max_concurrency)))
+    return [results[index] for index in range(len(results))]
+
+
+def map_bounded(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_concurrency: int = 10,
+) -> list[BatchResult[R]]:
+    """Run ``func`` over ``items`` on a bounded thread pool.
+
+    Args:
+        func (Callable[[T], R]): Function applied to each item.
+        items (Iterable[T]): The items to process.
+        max_concurrency (int): Maximum number of worker threads.
+
+    Returns:
+        list[BatchResult[R]]: One result per item, in input order.
+
+    """
+    return sorted(iter_bounded(func, items, max_concurrency), key=lambda result: result.index)
+
+
+def iter_bounded(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_concurrency: int = 10,
+) -> Iterator[BatchResult[R]]:
+    """Run ``func`` over ``items`` on a bounded thread pool, yielding results as they complete.
+
+    Items are only taken from ``items`` as workers free up, so memory stays
+    bounded for long or lazy inputs. Closing the iterator early cancels the
+    items not yet started.
+
+    Args:
+        func (Callable[[T], R]): Function applied to each item.
+        items (Iterable[T]): The items to process.
+        max_concurrency (int): Maximum number of worker threads.
+
+    Yields:
+        BatchResult[R]: One result per item, in completion order; ``index`` gives its input position.
+
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    def call(index: int, item: T) -> BatchResult[R]:
+        try:
+            return BatchResult(index, value=func(item))
+        except Exception as e:
+            return BatchResult(index, error=e)
+
+    pending = enumerate(items)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    running: set[Future[BatchResult[R]]] = set()
+    try:
+        for index, item in pending:
+            running.add(executor.submit(call, index, item))
+            if len(running) >= max_concurrency:
+                break
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for index, item in pending:
+                    running.add(executor.submit(call, index, item))
+                    break
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def aiter_bounded(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    max_concurrency: int = 10,
+) -> AsyncIterator[BatchResult[R]]:
+    """Asynchronous version of ``iter_bounded``; closing the iterator early cancels the calls in flight."""
+    import asyncio
+
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    async def call(index: int, item: T) -> BatchResult[R]:
+        try:
+            return BatchResult(index, value=await func(item))
+        except Exception as e:
+            return BatchResult(index, error=e)
+
+    pending = enumerate(items)
+    running: set[asyncio.Task[BatchResult[R]]] = set()
+    try:
+        for index, item in pending:
+            running.add(asyncio.ensure_future(call(index, item)))
+            if len(running) >= max_concurrency:
+                break
+        while running:
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                for index, item in pending:
+                    running.add(asyncio.ensure_future(call(index, item)))
+                    break
+                yield task.result()
+    finally:
+        for task in running:
+            task.cancel()
@@ -0,0 +1,16 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+# In a source checkout the repository root is the package itself; load it
+# under its import name, as tests/conftest.py does, unless it is installed.
+if importlib.util.find_spec("rush_analytics") is None and "rush_analytics" not in sys.modules:
+    ROOT = Path(__file__).resolve().parent.parent
+    spec = importlib.util.spec_from_file_location(
+        "rush_analytics",
+        ROOT / "__init__.py",
+        submodule_search_locations=[str(ROOT)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["rush_analytics"] = module
+    spec.loader.exec_module(module)
@@ -0,0 +1,142 @@
+"""In-process stand-in for the Rush Analytics API.
+
+``FakeRushAnalytics`` answers every endpoint of ``Endpoints`` through an
+``httpx.MockTransport``, with configurable latency, server errors, 429
+responses and result size, so clients can be benchmarked without a network
+or an API key::
+
+    fake = FakeRushAnalytics(FakeAPIConfig(latency=0.02, rate_limit_rate=0.05))
+    client = RushAnalyticsAPI(api_key="bench", transport=fake.transport())
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import httpx
+
+from rush_analytics import Transport
+
+
+@dataclass
+class FakeAPIConfig:
+    """Behaviour of a ``FakeRushAnalytics`` instance.
+
+    Attributes:
+        latency (float): Seconds every request takes before it is answered.
+        jitter (float): Extra random latency of up to this many seconds.
+        error_rate (float): Probability of answering with a 500.
+        rate_limit_rate (float): Probability of answering with a 429.
+        retry_after (float): ``Retry-After`` sent with 429 responses.
+        result_rows (int): Rows returned by the task results endpoint.
+        polls_until_complete (int): Status requests a task answers with ``pending`` before completing.
+        seed (int | None): Seed for the fault injection, for repeatable runs.
+
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 0.0
+    result_rows: int = 1000
+    polls_until_complete: int = 1
+    seed: int | None = 0
+
+
+def result_rows(count: int) -> list[dict[str, object]]:
+    """Return ``count`` result rows shaped like the ones the API returns."""
+    return [
+        {
+            "keyword": f"keyword number {i}",
+            "region": "Moscow",
+            "engine": "google",
+            "position": i % 100 + 1,
+            "url": f"https://example.com/catalog/page-{i}",
+            "date": "2024-05-01",
+            "competitors": {"competitor.example": (i * 7) % 100 + 1},
+        }
+        for i in range(count)
+    ]
+
+
+class FakeRushAnalytics:
+    """Fake API server answering requests in process.
+
+    Attributes:
+        requests (Counter[str]): Requests received, by ``"METHOD path"`` with IDs replaced by ``{task_id}``.
+
+    """
+
+    def __init__(self, config: FakeAPIConfig | None = None) -> None:
+        self.config = config if config is not None else FakeAPIConfig()
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(self.config.seed)
+        self._polls: dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._results: bytes | None = None
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        return self.config.latency + (self._random.uniform(0, self.config.jitter) if self.config.jitter else 0.0)
+
+    def _results_body(self) -> bytes:
+        if self._results is None:
+            self._results = json.dumps({"status": "completed", "results": result_rows(self.config.result_rows)}).encode()
+        return self._results
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        """Answer ``request`` immediately, without the configured latency."""
+        path = request.url.path.removeprefix("/api/")
+        parts = path.split("/")
+        route = "/".join("{task_id}" if index == 1 else part for index, part in enumerate(parts))
+        with self._lock:
+            self.requests[f"{request.method} {route}"] += 1
+            roll = self._random.random()
+
+        if roll < self.config.error_rate:
+            return httpx.Response(500, json={"error": "internal error"})
+        if roll < self.config.error_rate + self.config.rate_limit_rate:
+            return httpx.Response(429, headers={"Retry-After": str(self.config.retry_after)})
+
+        if parts == ["tasks"] and request.method == "POST":
+            return httpx.Response(200, json={"task_id": str(next(self._ids)), "status": "created"})
+        if len(parts) == 2 and parts[0] == "tasks":
+            with self._lock:
+                polls = self._polls[parts[1]] = self._polls.get(parts[1], 0) + 1
+            status = "completed" if polls >= self.config.polls_until_complete else "pending"
+            return httpx.Response(200, json={"task_id": parts[1], "status": status})
+        if len(parts) == 3 and parts[0] == "tasks" and parts[2] == "results":
+            return httpx.Response(200, stream=httpx.ByteStream(self._results_body()))
+        if path == "apiLanguages.php":
+            return httpx.Response(200, json={"languages": [{"code": "en", "name": "English"}]})
+        if path in ("apiRegionsGoogle.php", "apiRegionsYandex.php"):
+            regions = [{"id": i, "name": f"Region {i}", "country_code": "RU"} for i in range(1, 101)]
+            return httpx.Response(200, json={"regions": regions})
+        return httpx.Response(404)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        """Synchronous ``MockTransport`` handler."""
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self.respond(request)
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        """Asynchronous ``MockTransport`` handler."""
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self.respond(request)
+
+    def transport(self) -> Transport:
+        """Return a ``Transport`` whose sync and async clients talk to this fake."""
+        return Transport(
+            http_transport=httpx.MockTransport(self.handler),
+            async_http_transport=httpx.MockTransport(self.async_handler),
+        )
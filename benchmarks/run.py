@@ -0,0 +1,317 @@
+"""Benchmark the client against the in-process fake API.
+
+Run from the repository root::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --baseline bench.json --tolerance 0.25
+
+Results are written as JSON. With ``--baseline`` the run is compared with an
+earlier report, and the exit status is 1 if any benchmark got worse by more
+than ``--tolerance``.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tomllib
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .fake_api import FakeAPIConfig, FakeRushAnalytics
+
+from rush_analytics import (
+    AsyncRushAnalyticsAPI,
+    RetryPolicy,
+    RushAnalyticsAPI,
+    build_task_request,
+    gather_bounded,
+    map_bounded,
+)
+from rush_analytics.serialization import dumps
+
+REPORT_SCHEMA = 1
+
+# Retries without sleeping, so injected faults cost round trips rather than backoff time.
+BENCH_RETRY = RetryPolicy(max_attempts=10, deadline=None, base_delay=0.0, max_delay=0.0)
+
+
+@dataclass
+class Result:
+    """One measurement.
+
+    Attributes:
+        name (str): Benchmark and variant, such as ``throughput.async``.
+        value (float): The measured value.
+        unit (str): Unit of ``value``.
+        higher_is_better (bool): Direction used when comparing with a baseline.
+        params (dict[str, Any]): Settings the measurement was taken with.
+
+    """
+
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+    params: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return self.name + json.dumps(self.params, sort_keys=True)
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs of ``func``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func: Callable[[], Any]) -> float:
+    """Return the peak Python heap allocated while running ``func``, in MiB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def _client(fake: FakeRushAnalytics) -> RushAnalyticsAPI:
+    return RushAnalyticsAPI(api_key="bench", transport=fake.transport(), retry_policy=BENCH_RETRY)
+
+
+def _async_client(fake: FakeRushAnalytics) -> AsyncRushAnalyticsAPI:
+    return AsyncRushAnalyticsAPI(api_key="bench", transport=fake.transport(), retry_policy=BENCH_RETRY)
+
+
+def bench_throughput(quick: bool) -> list[Result]:
+    """Status requests per second: sequential, on a thread pool and with asyncio."""
+    count = 100 if quick else 1000
+    concurrency = 16
+    results = []
+    for config in (
+        FakeAPIConfig(latency=0.0),
+        FakeAPIConfig(latency=0.005),
+        FakeAPIConfig(latency=0.005, error_rate=0.05, rate_limit_rate=0.05),
+    ):
+        params = {
+            "requests": count,
+            "concurrency": concurrency,
+            "latency": config.latency,
+            "error_rate": config.error_rate,
+            "rate_limit_rate": config.rate_limit_rate,
+        }
+        task_ids = [str(i) for i in range(count)]
+
+        fake = FakeRushAnalytics(config)
+        client = _client(fake)
+        if config.latency == 0.0:
+            elapsed = _timed(lambda: [client.get_task_status(task_id) for task_id in task_ids], 1)
+            results.append(Result("throughput.sync_sequential", count / elapsed, "req/s", True, params))
+        elapsed = _timed(lambda: map_bounded(client.get_task_status, task_ids, concurrency), 1)
+        results.append(Result("throughput.sync_threads", count / elapsed, "req/s", True, params))
+
+        fake = FakeRushAnalytics(config)
+
+        async def run_async() -> None:
+            async with _async_client(fake) as async_client:
+                await gather_bounded(async_client.async_get_task_status, task_ids, concurrency)
+
+        elapsed = _timed(lambda: asyncio.run(run_async()), 1)
+        results.append(Result("throughput.async", count / elapsed, "req/s", True, params))
+        sent = sum(fake.requests.values())
+        results.append(Result("throughput.async_requests_per_call", sent / count, "requests", False, params))
+    return results
+
+
+def bench_polling(quick: bool) -> list[Result]:
+    """Cost of waiting for many tasks that need several polls to complete."""
+    tasks = 50 if quick else 500
+    config = FakeAPIConfig(polls_until_complete=3)
+    params = {"tasks": tasks, "polls_until_complete": config.polls_until_complete}
+    options = {"initial_interval": 0.001, "max_interval": 0.004, "jitter": 0.0}
+    task_ids = [str(i) for i in range(tasks)]
+
+    fake = FakeRushAnalytics(config)
+    client = _client(fake)
+    elapsed = _timed(lambda: list(client.wait_for_tasks(task_ids, **options)), 1)
+    polls = fake.requests["GET tasks/{task_id}"]
+    results = [
+        Result("polling.sync_seconds", elapsed, "s", False, params),
+        Result("polling.sync_polls_per_task", polls / tasks, "requests", False, params),
+    ]
+
+    fake = FakeRushAnalytics(config)
+
+    async def run_async() -> None:
+        async with _async_client(fake) as async_client:
+            async for _ in async_client.wait_for_tasks(task_ids, **options):
+                pass
+
+    elapsed = _timed(lambda: asyncio.run(run_async()), 1)
+    results.append(Result("polling.async_seconds", elapsed, "s", False, params))
+    return results
+
+
+def bench_payload(quick: bool) -> list[Result]:
+    """Time to validate and serialize a task with a large keyword list."""
+    count = 10_000 if quick else 200_000
+    repeat = 3
+    params = {"keywords": count}
+    words = [f"keyword number {i}" for i in range(count)]
+    urls = [f"https://example.com/catalog/page-{i}" for i in range(count)]
+    forms = {
+        "dicts": [{"keyword": word, "url": url} for word, url in zip(words, urls)],
+        "strings": words,
+        "columns": {"keyword": words, "url": urls},
+    }
+    results = []
+    for form, keywords in forms.items():
+        payload = {"name": "Benchmark", "url": "https://example.com", "keywords": keywords}
+        elapsed = _timed(lambda: build_task_request("bench", payload), repeat)
+        results.append(Result(f"payload.build_{form}", elapsed, "s", False, params))
+
+    body = build_task_request("bench", {"name": "Benchmark", "url": "https://example.com", "keywords": forms["dicts"]})
+    results.append(Result("payload.serialize", _timed(lambda: dumps(body), repeat), "s", False, params))
+    results.append(Result("payload.serialized_size", len(dumps(body)) / 2**20, "MiB", False, params))
+    return results
+
+
+def bench_results(quick: bool) -> list[Result]:
+    """Time and peak memory to download and parse a large result set."""
+    rows = 5_000 if quick else 100_000
+    params = {"rows": rows}
+    fake = FakeRushAnalytics(FakeAPIConfig(result_rows=rows))
+    client = _client(fake)
+    variants: dict[str, Callable[[], Any]] = {
+        "buffered": lambda: client.get_task_results("1"),
+        "streamed": lambda: sum(1 for _ in client.iter_task_results("1", key="results")),
+        "columns": lambda: client.get_task_results_columns("1", key="results"),
+    }
+    results = []
+    for name, func in variants.items():
+        results.append(Result(f"results.{name}_seconds", _timed(func, 3), "s", False, params))
+        results.append(Result(f"results.{name}_peak_memory", _peak_memory(func), "MiB", False, params))
+    return results
+
+
+IMPORT_PROBE = """
+import importlib.util, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location(
+    "rush_analytics", sys.argv[1] + "/__init__.py", submodule_search_locations=[sys.argv[1]]
+)
+module = importlib.util.module_from_spec(spec)
+sys.modules["rush_analytics"] = module
+spec.loader.exec_module(module)
+print(time.perf_counter() - start)
+"""
+
+
+def bench_import(quick: bool) -> list[Result]:
+    """Cold ``import rush_analytics`` time in a fresh interpreter."""
+    runs = 3 if quick else 11
+    root = str(Path(__file__).resolve().parent.parent)
+    times = [
+        float(subprocess.run([sys.executable, "-c", IMPORT_PROBE, root], capture_output=True, check=True, text=True).stdout)
+        for _ in range(runs)
+    ]
+    return [Result("import.seconds", statistics.median(times), "s", False, {"runs": runs})]
+
+
+BENCHMARKS: dict[str, Callable[[bool], list[Result]]] = {
+    "import": bench_import,
+    "throughput": bench_throughput,
+    "polling": bench_polling,
+    "payload": bench_payload,
+    "results": bench_results,
+}
+
+
+def _package_version() -> str:
+    pyproject = Path(__file__).resolve().parent.parent / "pyproject.toml"
+    try:
+        return tomllib.loads(pyproject.read_text(encoding="utf-8"))["project"]["version"]
+    except (OSError, KeyError, tomllib.TOMLDecodeError):
+        return "unknown"
+
+
+def run(names: list[str] | None = None, quick: bool = False) -> dict[str, Any]:
+    """Run the selected benchmarks and return a JSON-serializable report."""
+    results = []
+    for name, benchmark in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        results.extend(benchmark(quick))
+    return {
+        "schema": REPORT_SCHEMA,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "version": _package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return a description of every result that regressed by more than ``tolerance``."""
+    previous = {Result(**item).key: Result(**item) for item in baseline["results"]}
+    regressions = []
+    for item in report["results"]:
+        result = Result(**item)
+        old = previous.get(result.key)
+        if old is None or old.value == 0:
+            continue
+        change = (result.value - old.value) / old.value
+        if (-change if result.higher_is_better else change) > tolerance:
+            regressions.append(f"{result.name} {result.params}: {old.value:.6g} -> {result.value:.6g} {result.unit}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--quick", action="store_true", help="use small sizes, for smoke tests")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default: 0.2)")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    logging.disable(logging.INFO)
+    report = run(args.benchmarks, args.quick)
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline is not None:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,471 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Bump whenever the layout of stored entries changes; older entries are then ignored.
+CACHE_SCHEMA_VERSION = 1
+
+SENSITIVE_PARAMS = frozenset({"apikey", "api_key"})
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user directory used for persistent cache files."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "rush_analytics"
+
+
+def upgrade_schema(
+    conn: sqlite3.Connection, path: Any, version: int, migrations: Mapping[int, Iterable[str]], kind: str
+) -> None:
+    """Bring the tables of a SQLite database up to schema ``version`` without losing rows.
+
+    A new database is stamped with ``version``. An older one is upgraded in
+    one transaction by ``migrations``, the statements that upgrade each
+    version to the next, keyed by the version they start from.
+
+    Raises:
+        RuntimeError: If the database is newer than ``version`` or no migration leads
+            from its version; the connection is closed and the file left untouched.
+
+    """
+    found = conn.execute("PRAGMA user_version").fetchone()[0]
+    if found == version:
+        return
+    if found == 0:
+        conn.execute(f"PRAGMA user_version={version}")
+        return
+    steps = range(found, version)
+    if found > version or any(step not in migrations for step in steps):
+        conn.close()
+        raise RuntimeError(
+            f"{path} holds {kind} schema version {found}, which this version of the package "
+            f"cannot read (it uses version {version}); open it with a matching version."
+        )
+    conn.execute("BEGIN")
+    try:
+        for step in steps:
+            for statement in migrations[step]:
+                conn.execute(statement)
+        conn.execute(f"PRAGMA user_version={version}")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def cache_key(endpoint: str, params: Mapping[str, Any] | None = None) -> str:
+    """Build a stable cache key from an endpoint and its query parameters.
+
+    Parameters are sorted so that their order does not matter, and credentials
+    are replaced by a short hash so the key can be stored or logged safely.
+
+    Args:
+        endpoint (str): The API endpoint.
+        params (Mapping[str, Any] | None): Query parameters sent with the request.
+
+    Returns:
+        str: The normalized cache key.
+
+    """
+    parts = []
+    for name in sorted(params or {}):
+        value = params[name]
+        if name in SENSITIVE_PARAMS:
+            value = "sha256:" + hashlib.sha256(str(value).encode()).hexdigest()[:16]
+        parts.append(f"{name}={json.dumps(value, sort_keys=True, default=str)}")
+    return endpoint + ("?" + "&".join(parts) if parts else "")
+
+
+@dataclass
+class CacheEntry:
+    """A cached response together with the time it was stored."""
+
+    value: Any
+    stored_at: float
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class PersistentCache(ABC):
+    """Storage backend that keeps cached responses across processes."""
+
+    def __init__(self, version: int = CACHE_SCHEMA_VERSION) -> None:
+        self.version = version
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry stored under ``key``, or None if it is missing or outdated."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, stored_at: float | None = None) -> None:
+        """Store a JSON-serializable ``value`` under ``key``."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under ``key``, if any."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class SQLiteCache(PersistentCache):
+    """Persistent cache stored in a single SQLite database file.
+
+    SQLite takes care of locking, so one file can be shared by many worker
+    processes and cron jobs on the same machine.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None, version: int = CACHE_SCHEMA_VERSION) -> None:
+        super().__init__(version)
+        self.path = Path(path) if path is not None else default_cache_dir() / "cache.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, version INTEGER NOT NULL, stored_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM cache WHERE key = ? AND version = ?", (key, self.version)
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[1]), row[0])
+
+    def set(self, key: str, value: Any, stored_at: float | None = None) -> None:
+        data = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, version, stored_at, value) VALUES (?, ?, ?, ?)",
+                (key, self.version, time.time() if stored_at is None else stored_at, data),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FileCache(PersistentCache):
+    """Persistent cache storing one JSON file per entry in a directory.
+
+    Files are written to a temporary name and atomically renamed, so readers in
+    other processes never see a partially written entry.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str] | None = None, version: int = CACHE_SCHEMA_VERSION) -> None:
+        super().__init__(version)
+        self.directory = Path(directory) if directory is not None else default_cache_dir() / "files"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, key: str) -> CacheEntry | None:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != self.version or data.get("key") != key:
+            return None
+        return CacheEntry(data["value"], data["stored_at"])
+
+    def set(self, key: str, value: Any, stored_at: float | None = None) -> None:
+        data = {
+            "version": self.version,
+            "key": key,
+            "stored_at": time.time() if stored_at is None else stored_at,
+            "value": value,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class ReferenceCache:
+    """Serve rarely changing reference data from a persistent backend.
+
+    Entries are read from the backend on first use and kept in memory for the
+    lifetime of the client, so a fresh process starts warm without a network
+    round trip. Data is fetched again only once it is older than the TTL
+    configured for its endpoint.
+
+    Args:
+        backend (PersistentCache): Where entries are persisted.
+        ttls (Mapping[str, float]): TTL in seconds per endpoint path. Endpoints
+            without a TTL are never cached.
+
+    """
+
+    def __init__(self, backend: PersistentCache, ttls: Mapping[str, float]) -> None:
+        self.backend = backend
+        self.ttls = dict(ttls)
+        self._memory: dict[str, CacheEntry] = {}
+
+    def _lookup(self, endpoint: str, key: str) -> CacheEntry | None:
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = self.backend.get(key)
+            if entry is not None:
+                self._memory[key] = entry
+        if entry is not None and entry.age() < self.ttls[endpoint]:
+            return entry
+        return None
+
+    def _store(self, key: str, value: Any) -> None:
+        entry = CacheEntry(value, time.time())
+        self._memory[key] = entry
+        self.backend.set(key, value, entry.stored_at)
+
+    def get_or_fetch(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        fetch: Callable[[], Any],
+        on_lookup: Callable[[bool], None] | None = None,
+    ) -> Any:
+        """Return the cached value for a request, calling ``fetch`` when it is missing or stale.
+
+        ``on_lookup``, if given, is called with True on a hit and False on a miss.
+        """
+        if endpoint not in self.ttls:
+            return fetch()
+        key = cache_key(endpoint, params)
+        entry = self._lookup(endpoint, key)
+        if on_lookup is not None:
+            on_lookup(entry is not None)
+        if entry is not None:
+            return entry.value
+        value = fetch()
+        self._store(key, value)
+        return value
+
+    async def async_get_or_fetch(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        fetch: Callable[[], Awaitable[Any]],
+        on_lookup: Callable[[bool], None] | None = None,
+    ) -> Any:
+        """Asynchronous version of ``get_or_fetch``."""
+        if endpoint not in self.ttls:
+            return await fetch()
+        key = cache_key(endpoint, params)
+        entry = self._lookup(endpoint, key)
+        if on_lookup is not None:
+            on_lookup(entry is not None)
+        if entry is not None:
+            return entry.value
+        value = await fetch()
+        self._store(key, value)
+        return value
+
+    def invalidate(self, endpoint: str, params: Mapping[str, Any] | None = None) -> None:
+        """Drop the cached value for a request so the next call refreshes it."""
+        key = cache_key(endpoint, params)
+        self._memory.pop(key, None)
+        self.backend.delete(key)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How responses from one endpoint are cached in memory.
+
+    Attributes:
+        cacheable (bool): Whether responses may be cached at all.
+        ttl (float): Seconds a cached response stays valid.
+        maxsize (int): Maximum number of entries kept for the endpoint.
+
+    """
+
+    cacheable: bool = False
+    ttl: float = 0.0
+    maxsize: int = 128
+
+
+NO_CACHE = CachePolicy()
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the cache of a single endpoint."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    maxsize: int = 0
+    ttl: float = 0.0
+
+
+@dataclass
+class _Bucket:
+    policy: CachePolicy
+    pattern: re.Pattern[str]
+    entries: OrderedDict[str, tuple[float, Any]] = field(default_factory=OrderedDict)
+    stats: CacheStats = field(default_factory=CacheStats)
+
+
+def _template_pattern(template: str) -> re.Pattern[str]:
+    """Compile an endpoint template such as ``tasks/{task_id}`` into a full-match regex."""
+    return re.compile(re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(template)))
+
+
+class ResponseCache:
+    """Per-client, in-memory cache of GET responses with a policy per endpoint.
+
+    Endpoints are matched against the templates the policies are registered
+    under, so ``tasks/123`` is governed by the ``tasks/{task_id}`` policy.
+    Endpoints without a cacheable policy always go to the network.
+
+    Args:
+        policies (Mapping[str, CachePolicy]): Policy per endpoint template.
+
+    """
+
+    def __init__(self, policies: Mapping[str, CachePolicy]) -> None:
+        self._buckets = {template: _Bucket(policy, _template_pattern(template)) for template, policy in policies.items()}
+        self._lock = threading.Lock()
+
+    def _bucket(self, endpoint: str) -> _Bucket | None:
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            bucket = next((b for b in self._buckets.values() if b.pattern.fullmatch(endpoint)), None)
+        if bucket is None or not bucket.policy.cacheable:
+            return None
+        return bucket
+
+    def get(
+        self, endpoint: str, params: Mapping[str, Any] | None = None, on_lookup: Callable[[bool], None] | None = None
+    ) -> tuple[bool, Any]:
+        """Look up a response; return ``(True, value)`` on a hit and ``(False, None)`` otherwise.
+
+        ``on_lookup``, if given, is called with the hit flag for cacheable endpoints.
+        """
+        bucket = self._bucket(endpoint)
+        if bucket is None:
+            return False, None
+        key = cache_key(endpoint, params)
+        with self._lock:
+            item = bucket.entries.get(key)
+            hit = item is not None and item[0] > time.monotonic()
+            if hit:
+                bucket.entries.move_to_end(key)
+                bucket.stats.hits += 1
+            else:
+                if item is not None:
+                    del bucket.entries[key]
+                bucket.stats.misses += 1
+        if on_lookup is not None:
+            on_lookup(hit)
+        return (True, item[1]) if hit else (False, None)
+
+    def set(self, endpoint: str, params: Mapping[str, Any] | None, value: Any) -> None:
+        """Store a response if its endpoint is cacheable."""
+        bucket = self._bucket(endpoint)
+        if bucket is None:
+            return
+        key = cache_key(endpoint, params)
+        with self._lock:
+            bucket.entries[key] = (time.monotonic() + bucket.policy.ttl, value)
+            bucket.entries.move_to_end(key)
+            while len(bucket.entries) > bucket.policy.maxsize:
+                bucket.entries.popitem(last=False)
+                bucket.stats.evictions += 1
+
+    def get_or_fetch(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        fetch: Callable[[], Any],
+        on_lookup: Callable[[bool], None] | None = None,
+    ) -> Any:
+        """Return the cached response for a request, calling ``fetch`` on a miss."""
+        hit, value = self.get(endpoint, params, on_lookup)
+        if hit:
+            return value
+        value = fetch()
+        self.set(endpoint, params, value)
+        return value
+
+    async def async_get_or_fetch(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        fetch: Callable[[], Awaitable[Any]],
+        on_lookup: Callable[[bool], None] | None = None,
+    ) -> Any:
+        """Asynchronous version of ``get_or_fetch``."""
+        hit, value = self.get(endpoint, params, on_lookup)
+        if hit:
+            return value
+        value = await fetch()
+        self.set(endpoint, params, value)
+        return value
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Return a snapshot of the counters for every endpoint template."""
+        with self._lock:
+            return {
+                template: CacheStats(
+                    hits=bucket.stats.hits,
+                    misses=bucket.stats.misses,
+                    evictions=bucket.stats.evictions,
+                    size=len(bucket.entries),
+                    maxsize=bucket.policy.maxsize if bucket.policy.cacheable else 0,
+                    ttl=bucket.policy.ttl,
+                )
+                for template, bucket in self._buckets.items()
+            }
+
+    def keys(self) -> dict[str, list[str]]:
+        """Return the keys currently cached for every endpoint template."""
+        with self._lock:
+            return {template: list(bucket.entries) for template, bucket in self._buckets.items()}
+
+    def clear(self, template: str | None = None) -> None:
+        """Drop cached responses for one endpoint template, or for all of them."""
+        with self._lock:
+            for name, bucket in self._buckets.items():
+                if template is None or name == template:
+                    bucket.entries.clear()
@@ -0,0 +1,112 @@
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalescingStats:
+    """Counters describing how many requests were shared instead of sent.
+
+    Attributes:
+        calls (int): Requests made through the coalescer.
+        executed (int): Requests actually sent to the API.
+        coalesced (int): Requests that reused the result of one already in flight.
+
+    """
+
+    calls: int = 0
+    executed: int = 0
+    coalesced: int = 0
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls from several threads into one.
+
+    While a call for ``key`` is running, later callers with the same key block
+    until it finishes and receive its result (or exception) instead of making
+    their own call.
+
+    Args:
+        stats (CoalescingStats | None): Counters to update; a new instance is used when omitted.
+
+    """
+
+    def __init__(self, stats: CoalescingStats | None = None) -> None:
+        self.stats = stats if stats is not None else CoalescingStats()
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """Run ``func`` unless an identical call is already in flight, and return its result."""
+        with self._lock:
+            self.stats.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats.executed += 1
+            else:
+                self.stats.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Collapse concurrent identical coroutine calls into one.
+
+    The shared call runs as its own task, so cancelling one waiting caller does
+    not cancel the request for the others.
+
+    Args:
+        stats (CoalescingStats | None): Counters to update; a new instance is used when omitted.
+
+    """
+
+    def __init__(self, stats: CoalescingStats | None = None) -> None:
+        self.stats = stats if stats is not None else CoalescingStats()
+        self._tasks: dict[tuple[int, Hashable], asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Await ``func`` unless an identical call is already in flight, and return its result."""
+        import asyncio
+
+        self.stats.calls += 1
+        # Tasks belong to one event loop, so calls are only shared within a loop.
+        slot = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(slot)
+        if task is None:
+            self.stats.executed += 1
+            task = asyncio.ensure_future(func())
+            self._tasks[slot] = task
+            task.add_done_callback(lambda _: self._tasks.pop(slot, None))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
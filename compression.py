@@ -0,0 +1,113 @@
+import gzip
+import threading
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Opt-in compression of request bodies.
+
+    Bodies of at least ``threshold`` bytes are compressed and sent with a
+    matching ``Content-Encoding`` header; smaller ones are sent as is, since
+    compressing them costs more time than it saves on the wire. ``zstd``
+    needs ``pip install rush-analytics[zstd]``.
+
+    Attributes:
+        encoding (str): ``"gzip"`` or ``"zstd"``.
+        threshold (int): Smallest body, in bytes, that is compressed.
+        level (int | None): Compression level; None uses a fast default for the encoding.
+
+    """
+
+    encoding: str = GZIP
+    threshold: int = 16 * 1024
+    level: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.encoding not in (GZIP, ZSTD):
+            raise ValueError(f"Unsupported encoding: {self.encoding!r}")
+        if self.encoding == ZSTD:
+            _zstd()
+
+    def encode(self, body: bytes) -> tuple[bytes, dict[str, str]]:
+        """Compress ``body`` if it is large enough.
+
+        Returns:
+            tuple[bytes, dict[str, str]]: The body to send and the headers describing it.
+
+        """
+        if len(body) < self.threshold:
+            return body, {}
+        if self.encoding == ZSTD:
+            compressor = _zstd().ZstdCompressor(level=self.level if self.level is not None else 3)
+            return compressor.compress(body), {"Content-Encoding": ZSTD}
+        return gzip.compress(body, compresslevel=self.level if self.level is not None else 6, mtime=0), {
+            "Content-Encoding": GZIP
+        }
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires `pip install rush-analytics[zstd]`.") from e
+    return zstandard
+
+
+@dataclass
+class TransferStats:
+    """Bytes moved by a client, on the wire and after decoding.
+
+    Attributes:
+        requests (int): Responses received.
+        bytes_sent (int): Request body bytes sent on the wire, after compression.
+        bytes_sent_decoded (int): Request body bytes before compression.
+        bytes_received (int): Response body bytes received on the wire.
+        bytes_received_decoded (int): Response body bytes after decompression.
+
+    """
+
+    requests: int = 0
+    bytes_sent: int = 0
+    bytes_sent_decoded: int = 0
+    bytes_received: int = 0
+    bytes_received_decoded: int = 0
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decoded bytes per byte on the wire, in both directions; 1.0 means no savings."""
+        wire = self.bytes_sent + self.bytes_received
+        return (self.bytes_sent_decoded + self.bytes_received_decoded) / wire if wire else 1.0
+
+    def record_request(self, wire: int, decoded: int) -> None:
+        with self._lock:
+            self.bytes_sent += wire
+            self.bytes_sent_decoded += decoded
+
+    def record_response(self, wire: int, decoded: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += wire
+            self.bytes_received_decoded += decoded
+
+
+def count_chunks(chunks: Iterator[bytes], counter: list[int]) -> Iterator[bytes]:
+    """Pass ``chunks`` through, adding their total size to ``counter[0]``."""
+    for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
+
+
+async def acount_chunks(chunks: AsyncIterator[bytes], counter: list[int]) -> AsyncIterator[bytes]:
+    """Asynchronous version of ``count_chunks``."""
+    async for chunk in chunks:
+        counter[0] += len(chunk)
+        yield chunk
@@ -1,60 +1,120 @@
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping
+from enum import Enum
 from typing import Any, Coroutine, override
 
-import requests
 import httpx
 import time
-import asyncio
 import logging
-from cachetools import TTLCache, cached
 
-logger = logging.getLogger(__name__)
-
-cache = TTLCache(maxsize=100, ttl=3600)
-
-
-class RequestError(Exception):
-    """Custom exception for request-related errors."""
-
-    def __init__(self, message: str, status_code: int | None = None) -> None:
-        if status_code is not None:
-            message = f"{message} (HTTP {status_code})"
-        super().__init__(message)
-
-
-class InvalidAPIKeyError(RequestError):
-    """Raised when an invalid API key is detected."""
-
-    def __init__(self, message: str = "Invalid API key provided. Please check your API key.", status_code: int = 403) -> None:
-        super().__init__(message, status_code)
-
-
-class RateLimitExceededError(RequestError):
-    """Raised when the API rate limit is exceeded."""
+from .cache import CachePolicy, CacheStats, ResponseCache, cache_key
+from .compression import CompressionPolicy, TransferStats, acount_chunks, count_chunks
+from .coalesce import AsyncSingleFlight, CoalescingStats, SingleFlight
+from .instrumentation import RequestHooks, RequestInfo, emit, summarize_payload
+from .exceptions import (
+    InternalServerError,
+    InvalidAPIKeyError,
+    NotFoundError,
+    RateLimitExceededError,
+    RequestError,
+)
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import CircuitBreaker, RetryPolicy
+from .serialization import JSON_HEADERS, dumps, loads
+from .streaming import aiter_json_array, iter_json_array
+from .transport import Transport
 
-    def __init__(self, message: str = "Rate limit exceeded. Please wait before making additional requests.", status_code: int = 429) -> None:
-        super().__init__(message, status_code)
-
-
-class NotFoundError(RequestError):
-    """Raised when a requested resource is not found."""
-
-    def __init__(self, message: str = "Resource not found.", status_code: int = 404) -> None:
-        super().__init__(message, status_code)
-
-
-class InternalServerError(RequestError):
-    """Raised when the server encounters an internal error."""
+logger = logging.getLogger(__name__)
 
-    def __init__(self, message: str = "Internal server error. Please try again later.", status_code: int = 500) -> None:
-        super().__init__(message, status_code)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _log_body(endpoint: str, data: Any, content: bytes) -> None:
+    # Bodies can hold 100,000 keywords; summarize them only when the record is emitted.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "POST %s: %d bytes, %s",
+            endpoint,
+            len(content),
+            summarize_payload(data),
+            extra={"endpoint": endpoint, "bytes_sent": len(content)},
+        )
+
+
+class Endpoints(Enum):
+    """Define API endpoints for Rush Analytics."""
+    CREATE_TASK = "tasks"
+    TASK_STATUS = "tasks/{task_id}"
+    TASK_RESULTS = "tasks/{task_id}/results"
+    LIST_LANGUAGES = "apiLanguages.php"
+    LIST_GOOGLE_REGIONS = "apiRegionsGoogle.php"
+    LIST_YANDEX_REGIONS = "apiRegionsYandex.php"
+
+
+# Methods that can be repeated without changing the outcome, and so are safe to retry.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# In-memory cache policy per endpoint. Task status and results change while a
+# task runs, so they are always fetched from the API.
+DEFAULT_CACHE_POLICIES: dict[Endpoints, CachePolicy] = {
+    Endpoints.CREATE_TASK: CachePolicy(cacheable=False),
+    Endpoints.TASK_STATUS: CachePolicy(cacheable=False),
+    Endpoints.TASK_RESULTS: CachePolicy(cacheable=False),
+    Endpoints.LIST_LANGUAGES: CachePolicy(cacheable=True, ttl=24 * 3600, maxsize=8),
+    Endpoints.LIST_GOOGLE_REGIONS: CachePolicy(cacheable=True, ttl=24 * 3600, maxsize=8),
+    Endpoints.LIST_YANDEX_REGIONS: CachePolicy(cacheable=True, ttl=24 * 3600, maxsize=8),
+}
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Return the ``Endpoints`` template a concrete endpoint path was built from.
+
+    For example ``tasks/123/results`` maps to ``tasks/{task_id}/results``.
+    Paths that match no known endpoint are returned unchanged.
+    """
+    parts = endpoint.split("/")
+    for member in Endpoints:
+        template = member.value.split("/")
+        if len(template) == len(parts) and all(
+            t == p or (t.startswith("{") and t.endswith("}")) for t, p in zip(template, parts)
+        ):
+            return member.value
+    return endpoint
 
 
 class RushAnalyticsAPI:
     BASE_URL = "https://rush-analytics.com/api"
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache_policies: Mapping[Endpoints, CachePolicy] | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        coalesce_requests: bool = True,
+        transport: Transport | None = None,
+        compression: CompressionPolicy | None = None,
+        hooks: Iterable[RequestHooks] | None = None,
+    ):
         self.api_key = api_key
-        self.client = httpx.Client(headers=self._get_headers(), timeout=10)
+        # Credentials travel with each request so the pool can be shared across API keys.
+        self.headers = self._get_headers()
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else Transport()
+        self.client = self._open_client()
+        policies = {**DEFAULT_CACHE_POLICIES, **(cache_policies or {})}
+        self.response_cache = ResponseCache({endpoint.value: policy for endpoint, policy in policies.items()})
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.coalescing_stats = CoalescingStats()
+        self.single_flight = SingleFlight(self.coalescing_stats) if coalesce_requests else None
+        self.compression = compression
+        self.transfer_stats = TransferStats()
+        self.hooks = tuple(hooks or ())
+
+    def _open_client(self) -> httpx.Client:
+        return self.transport.client
 
     def _get_headers(self) -> dict[str, str]:
         return {
@@ -62,50 +122,200 @@ class RushAnalyticsAPI:
             "Content-Type": "application/json"
         }
 
-    @cached(cache)
     def get_data(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        return self.response_cache.get_or_fetch(
+            endpoint, params, lambda: self._fetch(endpoint, params), self._cache_observer(endpoint, "response")
+        )
+
+    def _fetch(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if self.single_flight is None:
+            return self._get_json(endpoint, params)
+        # Identical GETs already in flight on other threads share one request.
+        return self.single_flight.do(cache_key(endpoint, params), lambda: self._get_json(endpoint, params))
+
+    def _get_json(self, endpoint: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        return loads(self._send("GET", endpoint, params=params).content)
+
+    def _send(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying it according to the client's retry policy."""
+        kwargs["headers"] = {**self.headers, **kwargs.get("headers", {})}
+        return self.retry_policy.call(
+            lambda: self._send_once(method, endpoint, **kwargs),
+            idempotent=method in IDEMPOTENT_METHODS,
+            breaker=self.circuit_breaker,
+            on_retry=self._retry_observer(method, endpoint),
+        )
+
+    def _send_once(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Send a paced request and map HTTP errors to ``RequestError`` subclasses."""
+        self._pace(endpoint)
         url = f"{self.BASE_URL}/{endpoint}"
+        if not self.hooks:
+            response = self.client.request(method, url, **kwargs)
+        else:
+            start = self._request_started(method, endpoint)
+            try:
+                response = self.client.request(method, url, **kwargs)
+            except Exception as e:
+                self._request_ended(method, endpoint, start, kwargs, None, error=e)
+                raise
+            self._request_ended(method, endpoint, start, kwargs, response)
+        self.transfer_stats.record_response(response.num_bytes_downloaded, len(response.content))
+        self._check_response(response)
+        return response
+
+    def _pace(self, endpoint: str) -> None:
+        if self.rate_limiter is not None:
+            template = endpoint_template(endpoint)
+            waited = self.rate_limiter.acquire(template)
+            if waited and self.hooks:
+                emit(self.hooks, "on_rate_limit_wait", template, waited)
+
+    def _request_started(self, method: str, endpoint: str) -> float:
+        emit(self.hooks, "on_request_start", method, endpoint_template(endpoint))
+        return time.perf_counter()
+
+    def _request_ended(
+        self,
+        method: str,
+        endpoint: str,
+        start: float,
+        request: Mapping[str, Any],
+        response: httpx.Response | None,
+        received: int | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        if received is None:
+            received = len(response.content) if response is not None else 0
+        info = RequestInfo(
+            method=method,
+            endpoint=endpoint_template(endpoint),
+            status_code=response.status_code if response is not None else None,
+            duration=time.perf_counter() - start,
+            bytes_sent=len(request.get("content") or b""),
+            bytes_received=received,
+            error=error,
+        )
+        emit(self.hooks, "on_request_end", info)
+
+    def _retry_observer(self, method: str, endpoint: str) -> Callable[[Exception, int, float], None] | None:
+        if not self.hooks:
+            return None
+        template = endpoint_template(endpoint)
+        return lambda error, attempt, delay: emit(self.hooks, "on_retry", method, template, attempt, delay, error)
+
+    def _cache_observer(self, endpoint: str, cache: str) -> Callable[[bool], None] | None:
+        if not self.hooks:
+            return None
+        template = endpoint_template(endpoint)
+        return lambda hit: emit(self.hooks, "on_cache_hit" if hit else "on_cache_miss", template, cache)
+
+    def _check_response(self, response: httpx.Response) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(response.status_code, response.headers)
         try:
-            response = self.client.get(url, params=params)
             response.raise_for_status()
-            return response.json()
         except httpx.HTTPStatusError as e:
             self._handle_http_error(e)
 
-    def post_data(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
-        logger.info(f"POST request to {endpoint} with data: {data}")
+    def stream_data(self, endpoint: str, params: dict[str, Any] | None = None, key: str | None = None) -> Iterator[Any]:
+        """Stream a JSON array from the API one item at a time.
+
+        The response body is read in chunks and parsed incrementally, so only the
+        item being decoded is held in memory.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict[str, Any] | None): Query parameters to include in the request.
+            key (str | None): Name of the member holding the array when the body is an object.
+
+        Yields:
+            Any: Each item of the array, in order.
+
+        """
+        self._pace(endpoint)
+        start = self._request_started("GET", endpoint) if self.hooks else 0.0
+        response: httpx.Response | None = None
+        decoded = [0]
+        error: Exception | None = None
         try:
-            url = f"{self.BASE_URL}/{endpoint}"
-            response = self.client.post(url, json=data)
-            response.raise_for_status()
-            logger.info(f"POST request to {endpoint} succeeded.")
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            self._handle_http_error(e)
+            with self.client.stream("GET", f"{self.BASE_URL}/{endpoint}", params=params, headers=self.headers) as response:
+                self._check_response(response)
+                yield from iter_json_array(count_chunks(response.iter_bytes(STREAM_CHUNK_SIZE), decoded), key)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if response is not None:
+                self.transfer_stats.record_response(response.num_bytes_downloaded, decoded[0])
+            if self.hooks:
+                self._request_ended("GET", endpoint, start, {}, response, decoded[0], error if response is None else None)
+
+    def post_data(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
+        content, headers = self._encode_body(data)
+        _log_body(endpoint, data, content)
+        response = self._send("POST", endpoint, content=content, headers=headers)
+        return loads(response.content)
+
+    def _encode_body(self, data: Any) -> tuple[bytes, dict[str, str]]:
+        """Serialize a JSON body once, compressing it when the compression policy applies."""
+        body = dumps(data)
+        content, encoding_headers = self.compression.encode(body) if self.compression is not None else (body, {})
+        self.transfer_stats.record_request(len(content), len(body))
+        return content, {**JSON_HEADERS, **encoding_headers}
 
     def _handle_http_error(self, e: httpx.HTTPStatusError) -> None:
         status_code = e.response.status_code
         if status_code == 403:
             raise InvalidAPIKeyError() from e
         elif status_code == 429:
-            raise RateLimitExceededError() from e
+            raise RateLimitExceededError(retry_after=parse_retry_after(e.response.headers.get("Retry-After"))) from e
         elif status_code == 404:
             raise NotFoundError() from e
         elif status_code == 500:
             raise InternalServerError() from e
         else:
-            raise RequestError(f"HTTP error occurred: {status_code}") from e
+            raise RequestError("HTTP error occurred", status_code) from e
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """Return hit, miss and size counters of the response cache per endpoint.
+
+        Returns:
+            dict[str, CacheStats]: Counters keyed by endpoint template.
+
+        """
+        return self.response_cache.stats()
+
+    def clear_cache(self, endpoint: Endpoints | None = None) -> None:
+        """Drop cached responses for one endpoint, or for all endpoints.
+
+        Args:
+            endpoint (Endpoints | None): The endpoint to clear. Clears everything when omitted.
+
+        """
+        self.response_cache.clear(endpoint.value if endpoint is not None else None)
 
     def close(self) -> None:
-        self.client.close()
+        """Close the connection pool, unless it is a shared ``Transport`` passed in by the caller."""
+        if self._owns_transport:
+            self.client.close()
+
+    def __enter__(self) -> "RushAnalyticsAPI":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
 
 class AsyncRushAnalyticsAPI(RushAnalyticsAPI):
     """Asynchronous version of RushAnalyticsAPI."""
 
-    def __init__(self, api_key: str):
-        super().__init__(api_key)
-        self.client = httpx.AsyncClient(headers=self._get_headers(), timeout=10)
+    def __init__(self, api_key: str, **kwargs: Any):
+        super().__init__(api_key, **kwargs)
+        self.async_single_flight = AsyncSingleFlight(self.coalescing_stats) if self.single_flight else None
+
+    def _open_client(self) -> httpx.AsyncClient:
+        return self.transport.async_client
 
     async def async_get_data(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         """Asynchronously fetch data from the specified API endpoint.
@@ -127,13 +337,88 @@ class AsyncRushAnalyticsAPI(RushAnalyticsAPI):
         RequestError
             If a request or HTTP error occurs, including rate limits, forbidden access, or other HTTP errors.
         """
+        return await self.response_cache.async_get_or_fetch(
+            endpoint, params, lambda: self._async_fetch(endpoint, params), self._cache_observer(endpoint, "response")
+        )
+
+    async def _async_fetch(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if self.async_single_flight is None:
+            return await self._async_get_json(endpoint, params)
+        # Concurrent coroutines asking for the same resource await one shared request.
+        return await self.async_single_flight.do(cache_key(endpoint, params), lambda: self._async_get_json(endpoint, params))
+
+    async def _async_get_json(self, endpoint: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        return loads((await self._async_send("GET", endpoint, params=params)).content)
+
+    async def _async_send(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Asynchronously send a request, retrying it according to the retry policy."""
+        kwargs["headers"] = {**self.headers, **kwargs.get("headers", {})}
+        return await self.retry_policy.async_call(
+            lambda: self._async_send_once(method, endpoint, **kwargs),
+            idempotent=method in IDEMPOTENT_METHODS,
+            breaker=self.circuit_breaker,
+            on_retry=self._retry_observer(method, endpoint),
+        )
+
+    async def _async_send_once(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Asynchronously send a paced request and map HTTP errors to exceptions."""
+        await self._async_pace(endpoint)
         url = f"{self.BASE_URL}/{endpoint}"
+        if not self.hooks:
+            response = await self.client.request(method, url, **kwargs)
+        else:
+            start = self._request_started(method, endpoint)
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except Exception as e:
+                self._request_ended(method, endpoint, start, kwargs, None, error=e)
+                raise
+            self._request_ended(method, endpoint, start, kwargs, response)
+        self.transfer_stats.record_response(response.num_bytes_downloaded, len(response.content))
+        self._check_response(response)
+        return response
+
+    async def _async_pace(self, endpoint: str) -> None:
+        if self.rate_limiter is not None:
+            template = endpoint_template(endpoint)
+            waited = await self.rate_limiter.async_acquire(template)
+            if waited and self.hooks:
+                emit(self.hooks, "on_rate_limit_wait", template, waited)
+
+    async def async_stream_data(
+        self, endpoint: str, params: dict[str, Any] | None = None, key: str | None = None
+    ) -> AsyncIterator[Any]:
+        """Asynchronously stream a JSON array from the API one item at a time.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict[str, Any] | None): Query parameters to include in the request.
+            key (str | None): Name of the member holding the array when the body is an object.
+
+        Yields:
+            Any: Each item of the array, in order.
+
+        """
+        await self._async_pace(endpoint)
+        start = self._request_started("GET", endpoint) if self.hooks else 0.0
+        response: httpx.Response | None = None
+        decoded = [0]
+        error: Exception | None = None
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            self._handle_http_error(e)
+            async with self.client.stream(
+                "GET", f"{self.BASE_URL}/{endpoint}", params=params, headers=self.headers
+            ) as response:
+                self._check_response(response)
+                async for item in aiter_json_array(acount_chunks(response.aiter_bytes(STREAM_CHUNK_SIZE), decoded), key):
+                    yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if response is not None:
+                self.transfer_stats.record_response(response.num_bytes_downloaded, decoded[0])
+            if self.hooks:
+                self._request_ended("GET", endpoint, start, {}, response, decoded[0], error if response is None else None)
 
     async def async_post_data(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
         """Perform an asynchronous POST request to the API.
@@ -145,29 +430,28 @@ class AsyncRushAnalyticsAPI(RushAnalyticsAPI):
         Returns:
             dict[str, Any]: The JSON response from the API.
         """
-        url = f"{self.BASE_URL}/{endpoint}"
-        try:
-            response = await self.client.post(url, json=data)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            self._handle_http_error(e)
-
-    def _handle_http_error(self, e: httpx.HTTPStatusError) -> None:
-        status_code = e.response.status_code
-        if status_code == 403:
-            raise InvalidAPIKeyError() from e
-        elif status_code == 429:
-            raise RateLimitExceededError() from e
-        elif status_code == 404:
-            raise NotFoundError() from e
-        elif status_code == 500:
-            raise InternalServerError() from e
-        else:
-            raise RequestError(f"HTTP error occurred: {status_code}") from e
+        content, headers = self._encode_body(data)
+        _log_body(endpoint, data, content)
+        response = await self._async_send("POST", endpoint, content=content, headers=headers)
+        return loads(response.content)
 
     async def close(self) -> None:
-        await self.client.aclose()
+        if self._owns_transport:
+            await self.client.aclose()
+
+    def __enter__(self) -> "AsyncRushAnalyticsAPI":
+        raise TypeError("Use 'async with' with AsyncRushAnalyticsAPI")
+
+    async def __aenter__(self) -> "AsyncRushAnalyticsAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    # The synchronous client's method names, as coroutines, so code moves between the clients by adding ``await``.
+    get_data = async_get_data
+    post_data = async_post_data
+    stream_data = async_stream_data
 
 
 def retry_request(func, retries=3, backoff=2):
@@ -182,6 +466,8 @@ def retry_request(func, retries=3, backoff=2):
 
 
 async def async_retry_request(func, retries=3, backoff=2):
+    import asyncio
+
     for attempt in range(retries):
         try:
             return await func()
@@ -0,0 +1,77 @@
+class RequestError(Exception):
+    """Custom exception for request-related errors."""
+
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        self.status_code = status_code
+        if status_code is not None:
+            message = f"{message} (HTTP {status_code})"
+        super().__init__(message)
+
+
+class InvalidAPIKeyError(RequestError):
+    """Raised when an invalid API key is detected."""
+
+    def __init__(self, message: str = "Invalid API key provided. Please check your API key.", status_code: int = 403) -> None:
+        super().__init__(message, status_code)
+
+
+class RateLimitExceededError(RequestError):
+    """Raised when the API rate limit is exceeded."""
+
+    def __init__(
+        self,
+        message: str = "Rate limit exceeded. Please wait before making additional requests.",
+        status_code: int = 429,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(message, status_code)
+        self.retry_after = retry_after
+
+
+class NotFoundError(RequestError):
+    """Raised when a requested resource is not found."""
+
+    def __init__(self, message: str = "Resource not found.", status_code: int = 404) -> None:
+        super().__init__(message, status_code)
+
+
+class InternalServerError(RequestError):
+    """Raised when the server encounters an internal error."""
+
+    def __init__(self, message: str = "Internal server error. Please try again later.", status_code: int = 500) -> None:
+        super().__init__(message, status_code)
+
+
+class CircuitOpenError(RequestError):
+    """Raised without contacting the API while the circuit breaker is open."""
+
+    def __init__(self, message: str = "The API appears to be unavailable; failing fast until it recovers.", retry_in: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+class NoAvailableKeyError(RequestError):
+    """Raised by a key pool when every eligible key is quarantined or out of credits."""
+
+    def __init__(self, message: str = "No API key in the pool is available.", retry_in: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+class TaskFailedError(RequestError):
+    """Raised when a task finishes with a failed or cancelled status."""
+
+    def __init__(self, message: str = "The task failed.", status: dict | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class UncertainSubmissionError(RequestError):
+    """Raised for a journaled task whose creation was interrupted, so it may or may not exist."""
+
+    def __init__(
+        self,
+        message: str = "An earlier run stopped while creating this task; it may already exist. "
+        "Check the tasks in your account, or set resubmit_uncertain to create it again.",
+    ) -> None:
+        super().__init__(message)
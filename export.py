@@ -0,0 +1,216 @@
+import importlib
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+# Columns produced for every result row, in output order.
+RESULT_COLUMNS = ("keyword", "region", "engine", "position", "url", "date")
+
+# Alternative field names accepted in result rows, most common first.
+_FIELD_ALIASES: dict[str, tuple[str, ...]] = {
+    "keyword": ("keyword", "query", "phrase"),
+    "region": ("region", "region_name", "region_id"),
+    "engine": ("engine", "search_engine", "se"),
+    "position": ("position", "pos", "rank"),
+    "url": ("url", "page", "landing_page"),
+    "date": ("date", "checked_at", "collected_at"),
+}
+
+# Members holding a nested list of per-date/per-region positions for a keyword.
+_NESTED_KEYS = ("positions", "results", "history")
+
+COMPETITOR_PREFIX = "competitor:"
+
+
+def _require(module: str, extra: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{module} is required for this export; install it with `pip install rush-analytics[{extra}]`."
+        ) from e
+
+
+def _field(row: Mapping[str, Any], name: str) -> Any:
+    for alias in _FIELD_ALIASES.get(name, (name,)):
+        if alias in row:
+            return row[alias]
+    return None
+
+
+def flatten_row(
+    row: Mapping[str, Any], inherited: Mapping[str, Any] | None = None
+) -> Iterator[tuple[Mapping[str, Any], Mapping[str, Any]]]:
+    """Flatten nested per-keyword position lists of a result row.
+
+    A row holding a ``positions``, ``results`` or ``history`` list yields one
+    entry per item of that list, which inherits the keyword, region and other
+    fields of the row. Read fields with ``row_field``, which also resolves
+    alternative field names.
+
+    Args:
+        row (Mapping[str, Any]): A result row as returned by the API.
+        inherited (Mapping[str, Any] | None): Values for fields the row does not have.
+
+    Yields:
+        tuple[Mapping[str, Any], Mapping[str, Any]]: Each innermost row and the
+        fields it inherits.
+
+    """
+    inherited = inherited if inherited is not None else {}
+    nested = next((row[key] for key in _NESTED_KEYS if isinstance(row.get(key), list)), None)
+    if nested is None:
+        yield row, inherited
+        return
+    context = dict(inherited)
+    for name in RESULT_COLUMNS:
+        value = _field(row, name)
+        if value is not None:
+            context[name] = value
+    for entry in nested:
+        if isinstance(entry, Mapping):
+            yield from flatten_row(entry, context)
+
+
+def row_field(row: Mapping[str, Any], inherited: Mapping[str, Any], name: str) -> Any:
+    """Return the field ``name`` of a row from ``flatten_row``, or None.
+
+    Alternative names of the ``RESULT_COLUMNS`` fields are recognized.
+    """
+    value = _field(row, name)
+    return inherited.get(name) if value is None else value
+
+
+def _position(value: Any) -> int | None:
+    """Normalize a position to an int; "not ranked" markers become None."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        position = int(value)
+    except (TypeError, ValueError):
+        return None
+    return position if position > 0 else None
+
+
+def _competitor_positions(value: Any) -> Iterable[tuple[str, Any]]:
+    if isinstance(value, Mapping):
+        return value.items()
+    if isinstance(value, list):
+        return (
+            (item.get("domain") or item.get("url"), item.get("position"))
+            for item in value
+            if isinstance(item, Mapping)
+        )
+    return ()
+
+
+class ResultColumns:
+    """Columnar accumulator for task results.
+
+    Rows from ``get_task_results`` or ``iter_task_results`` are appended
+    straight into one list per column, so no intermediate per-row records are
+    built. Keyword rows holding a nested ``positions`` list are flattened into
+    one row per entry. Competitor positions become one column per competitor,
+    named ``competitor:<domain>``.
+
+    The collected columns convert to NumPy arrays, a pyarrow ``Table`` or a
+    pandas ``DataFrame`` in a single vectorized step, and can be written to
+    Parquet or Arrow IPC files. NumPy, pyarrow and pandas are optional and are
+    only imported when those conversions are used.
+
+    Args:
+        defaults (Mapping[str, Any] | None): Values for columns missing from the
+            rows, such as ``{"engine": "google"}``.
+
+    """
+
+    def __init__(self, defaults: Mapping[str, Any] | None = None) -> None:
+        self.defaults = dict(defaults or {})
+        self.columns: dict[str, list[Any]] = {name: [] for name in RESULT_COLUMNS}
+        self.competitors: dict[str, list[int | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["keyword"])
+
+    @classmethod
+    def from_results(cls, results: Any, defaults: Mapping[str, Any] | None = None) -> "ResultColumns":
+        """Build columns from a full results response or an iterable of rows."""
+        columns = cls(defaults)
+        if isinstance(results, Mapping):
+            rows = next((results[key] for key in ("results", "data", "keywords") if isinstance(results.get(key), list)), [])
+        else:
+            rows = results
+        columns.extend(rows)
+        return columns
+
+    def extend(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Append result rows, flattening nested per-keyword position lists."""
+        for row in rows:
+            self._append(row, self.defaults)
+
+    def _append(self, row: Mapping[str, Any], inherited: Mapping[str, Any]) -> None:
+        columns = self.columns
+        for leaf, context in flatten_row(row, inherited):
+            index = len(columns["keyword"])
+            for name in RESULT_COLUMNS:
+                value = row_field(leaf, context, name)
+                columns[name].append(_position(value) if name == "position" else value)
+            self._append_competitors(leaf, index)
+
+    def _append_competitors(self, row: Mapping[str, Any], index: int) -> None:
+        for domain, position in _competitor_positions(row.get("competitors")):
+            if domain is None:
+                continue
+            column = self.competitors.get(domain)
+            if column is None:
+                column = self.competitors[domain] = [None] * index
+            else:
+                column.extend([None] * (index - len(column)))
+            column.append(_position(position))
+
+    def to_dict(self) -> dict[str, list[Any]]:
+        """Return every column as a plain list, padded to the same length."""
+        total = len(self)
+        data = dict(self.columns)
+        for domain, column in self.competitors.items():
+            data[COMPETITOR_PREFIX + domain] = column + [None] * (total - len(column))
+        return data
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return the columns as NumPy arrays; missing positions become NaN."""
+        np = _require("numpy", "numpy")
+        arrays = {}
+        for name, column in self.to_dict().items():
+            if name == "position" or name.startswith(COMPETITOR_PREFIX):
+                arrays[name] = np.array([np.nan if v is None else v for v in column], dtype=np.float64)
+            else:
+                arrays[name] = np.array(column, dtype=object)
+        return arrays
+
+    def to_arrow(self) -> Any:
+        """Return the columns as a ``pyarrow.Table``."""
+        pa = _require("pyarrow", "arrow")
+        arrays = {}
+        for name, column in self.to_dict().items():
+            if name == "position" or name.startswith(COMPETITOR_PREFIX):
+                arrays[name] = pa.array(column, type=pa.int32())
+            else:
+                arrays[name] = pa.array([None if v is None else str(v) for v in column], type=pa.string())
+        return pa.table(arrays)
+
+    def to_pandas(self) -> Any:
+        """Return the columns as a ``pandas.DataFrame`` backed by Arrow arrays."""
+        _require("pandas", "pandas")
+        return self.to_arrow().to_pandas()
+
+    def write_parquet(self, path: str | os.PathLike[str], **options: Any) -> None:
+        """Write the columns to a Parquet file; ``options`` go to ``pyarrow.parquet.write_table``."""
+        pq = _require("pyarrow.parquet", "arrow")
+        pq.write_table(self.to_arrow(), path, **options)
+
+    def write_ipc(self, path: str | os.PathLike[str]) -> None:
+        """Write the columns to an Arrow IPC (Feather v2) file."""
+        pa = _require("pyarrow", "arrow")
+        table = self.to_arrow()
+        with pa.OSFile(os.fspath(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, NamedTuple
+
+from .cache import PersistentCache
+from .export import flatten_row, row_field
+
+# Fields that identify one observation of a keyword in the results of a recurring task.
+DEFAULT_KEY_FIELDS = ("keyword", "region", "engine", "date")
+
+CHECKPOINT_PREFIX = "sync:"
+
+
+class RowChange(NamedTuple):
+    """A result row that is new or differs from the last sync.
+
+    Attributes:
+        task_id (str): The task the row belongs to.
+        kind (str): ``"new"`` for a row not seen before, ``"changed"`` for one whose content changed.
+        row (Mapping[str, Any]): The row as returned by the API.
+
+    """
+
+    task_id: str
+    kind: str
+    row: Mapping[str, Any]
+
+
+@dataclass
+class SyncCheckpoint:
+    """What is known about a task after its last sync.
+
+    Attributes:
+        task_id (str): The task ID.
+        watermark (str | None): Latest ISO date seen in the task results.
+        fingerprints (dict[str, list[Any]]): ``[date, digest]`` per row key,
+            for the rows that can still change.
+        synced_at (float): Unix time the checkpoint was committed.
+        scanned (int): Rows read during the last sync.
+        emitted (int): Rows reported as new or changed during the last sync.
+
+    """
+
+    task_id: str
+    watermark: str | None = None
+    fingerprints: dict[str, list[Any]] = field(default_factory=dict)
+    synced_at: float = 0.0
+    scanned: int = 0
+    emitted: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "watermark": self.watermark,
+            "fingerprints": self.fingerprints,
+            "synced_at": self.synced_at,
+            "scanned": self.scanned,
+            "emitted": self.emitted,
+        }
+
+    @classmethod
+    def from_dict(cls, task_id: str, data: Mapping[str, Any]) -> "SyncCheckpoint":
+        return cls(
+            task_id,
+            data.get("watermark"),
+            dict(data.get("fingerprints") or {}),
+            data.get("synced_at", 0.0),
+            data.get("scanned", 0),
+            data.get("emitted", 0),
+        )
+
+
+def row_digest(row: Mapping[str, Any]) -> str:
+    """Return a short digest of the content of ``row``, independent of key order."""
+    data = json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+
+class _Diff:
+    """Compare the rows of one sync with a checkpoint, one row at a time."""
+
+    def __init__(self, sync: "IncrementalSync", checkpoint: SyncCheckpoint) -> None:
+        self.sync = sync
+        self.checkpoint = checkpoint
+        self.cutoff = sync.cutoff(checkpoint)
+        self.fingerprints = checkpoint.fingerprints
+        self.watermark = checkpoint.watermark
+        self.scanned = 0
+        self.emitted = 0
+
+    def feed(self, row: Mapping[str, Any]) -> Iterator[RowChange]:
+        """Yield a change for every entry of ``row`` that is new or differs; nested position lists are flattened."""
+        for leaf, context in flatten_row(row):
+            change = self._compare(leaf, context)
+            if change is not None:
+                yield change
+
+    def _compare(self, leaf: Mapping[str, Any], context: Mapping[str, Any]) -> RowChange | None:
+        self.scanned += 1
+        day = row_field(leaf, context, self.sync.date_field) if self.sync.date_field else None
+        if not isinstance(day, str):
+            day = None
+        if day is not None:
+            if self.cutoff is not None and day < self.cutoff:
+                # Settled rows were reported by an earlier sync and no longer change.
+                return None
+            if self.watermark is None or day > self.watermark:
+                self.watermark = day
+
+        # Entries of a nested list are reported with the keyword, region and engine of their parent row.
+        row = {**context, **leaf} if context else leaf
+        digest = row_digest(row)
+        key = self.sync.row_key(leaf, context) or digest
+        previous = self.fingerprints.get(key)
+        if previous is not None and previous[1] == digest:
+            return None
+        self.fingerprints[key] = [day, digest]
+        self.emitted += 1
+        return RowChange(self.checkpoint.task_id, "new" if previous is None else "changed", row)
+
+    def finish(self) -> SyncCheckpoint:
+        checkpoint = SyncCheckpoint(
+            self.checkpoint.task_id, self.watermark, self.fingerprints, time.time(), self.scanned, self.emitted
+        )
+        cutoff = self.sync.cutoff(checkpoint)
+        if cutoff is not None:
+            checkpoint.fingerprints = {
+                key: value for key, value in self.fingerprints.items() if value[0] is None or value[0] >= cutoff
+            }
+        self.sync.save(checkpoint)
+        return checkpoint
+
+
+class IncrementalSync:
+    """Report only the new or changed result rows of recurring tasks.
+
+    Each task has a checkpoint in ``store`` holding the latest date seen (the
+    watermark) and a digest per row key. A sync streams the task results,
+    compares every row with its digest and yields the rows that are new or
+    differ. The checkpoint is saved once all rows have been read, so a sync
+    interrupted part way is repeated in full by the next one.
+
+    With ``settle_days``, rows dated more than that many days before the
+    watermark are considered final: they are skipped without hashing and their
+    digests are dropped, keeping checkpoints small however long the history.
+    With ``since_param``, the start of the unsettled window (or the watermark)
+    is also sent as that query parameter, so an API that supports date
+    filtering returns only the recent rows.
+
+    Args:
+        store (PersistentCache): Where checkpoints are kept, such as ``SQLiteCache``.
+        key_fields (Sequence[str]): Row fields identifying an observation.
+            Rows without any of them are identified by their content.
+        date_field (str | None): Row field holding the ISO date of the observation.
+        settle_days (int | None): Days after which a row no longer changes, or
+            None to compare every row on every sync.
+        since_param (str | None): Query parameter the API accepts as a start date.
+
+    """
+
+    def __init__(
+        self,
+        store: PersistentCache,
+        key_fields: Sequence[str] = DEFAULT_KEY_FIELDS,
+        date_field: str | None = "date",
+        settle_days: int | None = None,
+        since_param: str | None = None,
+    ) -> None:
+        if settle_days is not None and settle_days < 0:
+            raise ValueError("settle_days must not be negative")
+        self.store = store
+        self.key_fields = tuple(key_fields)
+        self.date_field = date_field
+        self.settle_days = settle_days
+        self.since_param = since_param
+
+    def row_key(self, row: Mapping[str, Any], inherited: Mapping[str, Any] | None = None) -> str | None:
+        """Return the key identifying ``row``, or None if it has no key fields.
+
+        Args:
+            row (Mapping[str, Any]): A result row, or an entry of its nested position list.
+            inherited (Mapping[str, Any] | None): Fields the entry inherits from its parent row.
+
+        """
+        values = [row_field(row, inherited or {}, name) for name in self.key_fields]
+        if all(value is None for value in values):
+            return None
+        return json.dumps(values, separators=(",", ":"), default=str)
+
+    def checkpoint(self, task_id: str) -> SyncCheckpoint:
+        """Return the checkpoint of ``task_id``, empty if it was never synced."""
+        entry = self.store.get(CHECKPOINT_PREFIX + str(task_id))
+        if entry is None:
+            return SyncCheckpoint(str(task_id))
+        return SyncCheckpoint.from_dict(str(task_id), entry.value)
+
+    def save(self, checkpoint: SyncCheckpoint) -> None:
+        self.store.set(CHECKPOINT_PREFIX + checkpoint.task_id, checkpoint.to_dict(), checkpoint.synced_at)
+
+    def reset(self, task_id: str) -> None:
+        """Forget the checkpoint of ``task_id``, so its next sync reports every row."""
+        self.store.delete(CHECKPOINT_PREFIX + str(task_id))
+
+    def cutoff(self, checkpoint: SyncCheckpoint) -> str | None:
+        """Return the first date that can still change, or None if every row is compared."""
+        if self.settle_days is None or checkpoint.watermark is None:
+            return None
+        try:
+            return (date.fromisoformat(checkpoint.watermark[:10]) - timedelta(days=self.settle_days)).isoformat()
+        except ValueError:
+            return None
+
+    def params(self, checkpoint: SyncCheckpoint) -> dict[str, Any]:
+        """Return the query parameters that limit the results to what may have changed."""
+        if self.since_param is None:
+            return {}
+        since = self.cutoff(checkpoint) or checkpoint.watermark
+        return {self.since_param: since} if since is not None else {}
+
+    def diff(self, checkpoint: SyncCheckpoint, rows: Iterable[Mapping[str, Any]]) -> Iterator[RowChange]:
+        """Yield the new or changed ``rows``, saving the checkpoint once they are exhausted."""
+        diff = _Diff(self, checkpoint)
+        for row in rows:
+            yield from diff.feed(row)
+        diff.finish()
+
+    async def async_diff(
+        self, checkpoint: SyncCheckpoint, rows: AsyncIterable[Mapping[str, Any]]
+    ) -> AsyncIterator[RowChange]:
+        """Asynchronous version of ``diff``."""
+        diff = _Diff(self, checkpoint)
+        async for row in rows:
+            for change in diff.feed(row):
+                yield change
+        diff.finish()
@@ -0,0 +1,377 @@
+import logging
+import math
+import random
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Request latency buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Payload size buckets, in bytes: 1 KiB to 64 MiB in powers of four.
+SIZE_BUCKETS = tuple(float(1024 * 4**i) for i in range(9))
+
+# Request body fields whose values are never written to logs.
+SENSITIVE_FIELDS = frozenset({"apikey", "api_key", "authorization", "password", "token"})
+
+# Longest string value copied into a payload summary.
+MAX_LOGGED_STRING = 100
+
+
+@dataclass
+class RequestInfo:
+    """Description of one HTTP request attempt, passed to ``RequestHooks.on_request_end``.
+
+    Attributes:
+        method (str): The HTTP method.
+        endpoint (str): The endpoint template, such as ``tasks/{task_id}``.
+        status_code (int | None): The response status, or None if no response arrived.
+        duration (float): Seconds from sending the request to reading the whole response.
+        bytes_sent (int): Size of the request body as sent.
+        bytes_received (int): Size of the response body after decoding.
+        error (Exception | None): The transport error, if the request failed without a response.
+
+    """
+
+    method: str
+    endpoint: str
+    status_code: int | None
+    duration: float
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: Exception | None = None
+
+
+class RequestHooks:
+    """Callbacks for client activity; override the events you need.
+
+    Endpoints are reported as templates, such as ``tasks/{task_id}``, so they
+    can be used as metric labels. Hooks run synchronously on the calling
+    thread or event loop and should return quickly. An exception raised by a
+    hook is logged and does not affect the request. Clients without hooks
+    skip all of this bookkeeping.
+    """
+
+    def on_request_start(self, method: str, endpoint: str) -> None:
+        """A request attempt is about to be sent."""
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        """A request attempt finished, successfully or not."""
+
+    def on_retry(self, method: str, endpoint: str, attempt: int, delay: float, error: Exception) -> None:
+        """Attempt number ``attempt`` failed with ``error`` and will be retried after ``delay`` seconds."""
+
+    def on_cache_hit(self, endpoint: str, cache: str) -> None:
+        """A response was served from ``cache``, either ``"response"`` or ``"reference"``."""
+
+    def on_cache_miss(self, endpoint: str, cache: str) -> None:
+        """A cacheable response was not in ``cache`` and is fetched from the API."""
+
+    def on_rate_limit_wait(self, endpoint: str, seconds: float) -> None:
+        """The rate limiter delayed a request by ``seconds``."""
+
+
+def emit(hooks: Iterable[RequestHooks], event: str, *args: object) -> None:
+    """Call ``event`` on every hook, logging instead of raising hook errors."""
+    for hook in hooks:
+        try:
+            getattr(hook, event)(*args)
+        except Exception:
+            logger.exception("Instrumentation hook %r failed in %s", hook, event)
+
+
+def summarize_payload(data: Any) -> dict[str, Any]:
+    """Describe a request body for logging without copying it.
+
+    Sensitive fields are redacted, lists and objects are replaced by their
+    length and long strings are truncated, so the summary stays small however
+    many keywords the body holds.
+
+    Args:
+        data (Any): The request body.
+
+    Returns:
+        dict[str, Any]: One entry per top-level field of the body.
+
+    """
+    if not isinstance(data, Mapping):
+        return {"type": type(data).__name__}
+    summary: dict[str, Any] = {}
+    for key, value in data.items():
+        if str(key).lower() in SENSITIVE_FIELDS:
+            summary[key] = "[redacted]"
+        elif isinstance(value, (list, tuple, Mapping)):
+            summary[key] = f"[{len(value)} items]"
+        elif isinstance(value, str) and len(value) > MAX_LOGGED_STRING:
+            summary[key] = value[:MAX_LOGGED_STRING] + "..."
+        else:
+            summary[key] = value
+    return summary
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add ``amount`` to the series identified by ``labels``, given in ``labelnames`` order."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets, with labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: a count per bucket plus one for +Inf, the sum and the total count.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record ``value`` in the series identified by ``labels``."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+            series[0][index] += 1
+            series[1][0] += value
+            series[1][1] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(series[1][1]) if series is not None else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series[1][0] if series is not None else 0.0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), list(totals))) for labels, (counts, totals) in self._series.items())
+        lines = []
+        for labels, (counts, (total, count)) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_format_value(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Dependency-free collection of metrics that renders in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Counter | Histogram) -> Counter | Histogram:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name!r} is already registered with a different definition")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter called ``name``, creating it on first use."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Return the histogram called ``name``, creating it on first use."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class MetricsHooks(RequestHooks):
+    """Hooks that record client activity in a ``MetricsRegistry``.
+
+    Args:
+        registry (MetricsRegistry | None): Where the metrics are registered. A
+            new registry is created when omitted; share one between clients to
+            aggregate them.
+        prefix (str): Prefix of every metric name.
+
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None, prefix: str = "rush_analytics") -> None:
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.requests = self.registry.counter(
+            f"{prefix}_requests_total", "HTTP requests sent, by response status.", ("method", "endpoint", "status")
+        )
+        self.latency = self.registry.histogram(
+            f"{prefix}_request_duration_seconds", "Time to send a request and read its response.", ("method", "endpoint")
+        )
+        self.request_size = self.registry.histogram(
+            f"{prefix}_request_size_bytes", "Request body size as sent.", ("method", "endpoint"), SIZE_BUCKETS
+        )
+        self.response_size = self.registry.histogram(
+            f"{prefix}_response_size_bytes", "Response body size after decoding.", ("method", "endpoint"), SIZE_BUCKETS
+        )
+        self.retries = self.registry.counter(f"{prefix}_retries_total", "Requests retried.", ("method", "endpoint"))
+        self.cache = self.registry.counter(
+            f"{prefix}_cache_lookups_total", "Cache lookups, by result.", ("cache", "endpoint", "result")
+        )
+        self.rate_limit_wait = self.registry.counter(
+            f"{prefix}_rate_limit_wait_seconds_total", "Time spent waiting for the rate limiter.", ("endpoint",)
+        )
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        status = str(info.status_code) if info.status_code is not None else "error"
+        self.requests.inc(info.method, info.endpoint, status)
+        self.latency.observe(info.duration, info.method, info.endpoint)
+        if info.bytes_sent:
+            self.request_size.observe(info.bytes_sent, info.method, info.endpoint)
+        if info.status_code is not None:
+            self.response_size.observe(info.bytes_received, info.method, info.endpoint)
+
+    def on_retry(self, method: str, endpoint: str, attempt: int, delay: float, error: Exception) -> None:
+        self.retries.inc(method, endpoint)
+
+    def on_cache_hit(self, endpoint: str, cache: str) -> None:
+        self.cache.inc(cache, endpoint, "hit")
+
+    def on_cache_miss(self, endpoint: str, cache: str) -> None:
+        self.cache.inc(cache, endpoint, "miss")
+
+    def on_rate_limit_wait(self, endpoint: str, seconds: float) -> None:
+        self.rate_limit_wait.inc(endpoint, amount=seconds)
+
+    def render(self) -> str:
+        """Render the registry in the Prometheus text format."""
+        return self.registry.render()
+
+
+class LoggingHooks(RequestHooks):
+    """Hooks that write one structured log record per request attempt.
+
+    Records carry the method, endpoint template, status code, duration and
+    body sizes both in the message and as ``LogRecord`` attributes of the same
+    names, for JSON formatters. Endpoint templates contain no task IDs and no
+    query parameters, so the API key never reaches the log. Nothing is
+    formatted unless the logger is enabled for the record's level, and
+    ``sample_rate`` drops a share of the records of successful requests
+    before they are built; failures and retries are always logged.
+
+    Args:
+        logger (logging.Logger | None): Where records go. Defaults to ``rush_analytics.requests``.
+        level (int): Level of the records of successful requests.
+        sample_rate (float): Fraction of successful requests that are logged.
+
+    """
+
+    def __init__(
+        self, logger: logging.Logger | None = None, level: int = logging.INFO, sample_rate: float = 1.0
+    ) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.logger = logger if logger is not None else logging.getLogger("rush_analytics.requests")
+        self.level = level
+        self.sample_rate = sample_rate
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        failed = info.error is not None or info.status_code is None or info.status_code >= 400
+        level = logging.WARNING if failed else self.level
+        if not self.logger.isEnabledFor(level):
+            return
+        if not failed and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self.logger.log(
+            level,
+            "%s %s -> %s in %.3fs (%d bytes sent, %d received)",
+            info.method,
+            info.endpoint,
+            info.status_code if info.error is None else type(info.error).__name__,
+            info.duration,
+            info.bytes_sent,
+            info.bytes_received,
+            extra={
+                "method": info.method,
+                "endpoint": info.endpoint,
+                "status_code": info.status_code,
+                "duration": info.duration,
+                "bytes_sent": info.bytes_sent,
+                "bytes_received": info.bytes_received,
+            },
+        )
+
+    def on_retry(self, method: str, endpoint: str, attempt: int, delay: float, error: Exception) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            # Only the error type: some transport errors quote the URL, query string included.
+            self.logger.warning(
+                "Retrying %s %s in %.2fs after attempt %d failed with %s",
+                method,
+                endpoint,
+                delay,
+                attempt,
+                type(error).__name__,
+                extra={"method": method, "endpoint": endpoint, "attempt": attempt, "delay": delay},
+            )
+
+    def on_rate_limit_wait(self, endpoint: str, seconds: float) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Rate limiter delayed %s by %.3fs", endpoint, seconds, extra={"endpoint": endpoint})
@@ -0,0 +1,359 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .cache import default_cache_dir, upgrade_schema
+from .exceptions import UncertainSubmissionError
+from .incremental import row_digest
+from .retry import _NOT_SENT_ERRORS
+from .serialization import dumps, loads
+from .sharding import task_id_of
+
+# Bump whenever the table layout changes, and add a migration from the previous version.
+JOURNAL_SCHEMA_VERSION = 1
+
+# Statements that upgrade a journal from the version of their key to the next one.
+_MIGRATIONS: dict[int, tuple[str, ...]] = {}
+
+# Progress records held in memory before they are written in one transaction.
+DEFAULT_JOURNAL_BATCH = 100
+
+SUBMITTING = "submitting"
+CREATED = "created"
+FAILED = "failed"
+FINISHED = "finished"
+FETCHED = "fetched"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS submissions ("
+    "job TEXT NOT NULL, key TEXT NOT NULL, state TEXT NOT NULL, task_id TEXT, status TEXT, error TEXT, "
+    "updated REAL NOT NULL, PRIMARY KEY (job, key)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS submissions_by_task ON submissions (job, task_id)",
+)
+
+_UPSERT = (
+    "INSERT INTO submissions (job, key, state, task_id, status, error, updated) VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (job, key) DO UPDATE SET state = excluded.state, "
+    "task_id = coalesce(excluded.task_id, task_id), status = coalesce(excluded.status, status), "
+    "error = excluded.error, updated = excluded.updated"
+)
+
+
+@dataclass
+class JournalEntry:
+    """What a ``JobJournal`` knows about one payload of a job.
+
+    Attributes:
+        key (str): Identifies the payload within the job.
+        state (str): ``submitting``, ``created``, ``failed``, ``finished`` or ``fetched``.
+        task_id (str | None): The ID of the created task.
+        status (dict[str, Any] | None): The terminal status response, once finished.
+        error (str | None): Why the last submission failed, or the response it got
+            if that response had no task ID.
+        updated (float): UNIX time of the last change.
+
+    """
+
+    key: str
+    state: str
+    task_id: str | None = None
+    status: dict[str, Any] | None = None
+    error: str | None = None
+    updated: float = 0.0
+
+
+def payload_digest(payload: Any) -> str:
+    """Return a digest of the request body that creates the task of ``payload``.
+
+    Hashing the validated body rather than the arguments makes keyword lists
+    given as NumPy arrays or pandas Series, whose ``str()`` is abbreviated,
+    count in full. Payloads that do not validate get a digest of their
+    arguments; creating their task fails anyway.
+    """
+    from .payload import build_task_request
+
+    try:
+        body = build_task_request("", payload)
+    except ValueError:
+        return "invalid-" + row_digest(payload if isinstance(payload, Mapping) else vars(payload))
+    del body["apikey"]
+    return hashlib.blake2b(dumps(body), digest_size=16).hexdigest()
+
+
+def payload_keys(payloads: Iterable[Any]) -> Iterator[tuple[str, Any]]:
+    """Pair every payload, a ``TaskPayload`` or its keyword arguments, with a key derived from its content.
+
+    Identical payloads are numbered in order, so a job may submit the same
+    payload several times and still resume correctly.
+    """
+    seen: dict[str, int] = {}
+    for payload in payloads:
+        digest = payload_digest(payload)
+        seen[digest] = seen.get(digest, -1) + 1
+        yield f"{digest}.{seen[digest]}", payload
+
+
+def _was_not_created(error: Exception) -> bool:
+    """Return True when a failed ``create_task`` certainly did not create a task.
+
+    Transport errors count only if the request never left; a 5xx response may
+    arrive after the server created the task, so only 4xx responses do.
+    """
+    if isinstance(error, httpx.TransportError):
+        return isinstance(error, _NOT_SENT_ERRORS)
+    status_code = getattr(error, "status_code", None)
+    return status_code is None or status_code < 500
+
+
+class JobJournal:
+    """Local SQLite record of a bulk run, so a restarted run picks up where it stopped.
+
+    Each payload of a job is recorded before its ``create_task`` request is
+    sent and again once the task exists, followed by its final status and
+    whether its results were delivered. A run that is restarted with the same
+    job name and payloads then skips tasks already created, polls only the
+    unfinished ones and fetches only the missing results.
+
+    The record written before a request is committed immediately, together
+    with every progress record buffered so far; progress on its own is written
+    every ``batch_size`` records or ``flush_interval`` seconds. With WAL and
+    ``synchronous=NORMAL`` a commit costs no disk sync, so the journal adds
+    little to submission time. If the process dies between sending a request
+    and recording its task, the payload is left as ``submitting``: the task
+    may exist, so it is reported with ``UncertainSubmissionError`` rather than
+    created a second time, unless ``resubmit_uncertain`` is set.
+
+    Args:
+        path (str | os.PathLike[str] | None): Database file, or ``":memory:"``.
+            Defaults to ``journal.sqlite3`` in the user cache directory.
+        batch_size (int): Progress records buffered before they are written.
+        flush_interval (float): Seconds after which buffered progress is written anyway.
+        resubmit_uncertain (bool): Create interrupted submissions again, accepting possible duplicates.
+
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        batch_size: int = DEFAULT_JOURNAL_BATCH,
+        flush_interval: float = 1.0,
+        resubmit_uncertain: bool = False,
+    ) -> None:
+        if path is None:
+            path = default_cache_dir() / "journal.sqlite3"
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.resubmit_uncertain = resubmit_uncertain
+        self._lock = threading.Lock()
+        self._buffer: list[tuple[Any, ...]] = []
+        self._flushed_at = time.monotonic()
+        self._keys: dict[tuple[str, str], str] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Never rebuilt: losing the journal would create paid tasks a second time.
+        upgrade_schema(self._conn, path, JOURNAL_SCHEMA_VERSION, _MIGRATIONS, "journal")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def _record(
+        self,
+        job: str,
+        key: str,
+        state: str,
+        task_id: str | None = None,
+        status: Any = None,
+        error: str | None = None,
+        durable: bool = False,
+    ) -> None:
+        record = (job, key, state, task_id, None if status is None else dumps(status).decode(), error, time.time())
+        with self._lock:
+            self._buffer.append(record)
+            if (
+                durable
+                or len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._flushed_at >= self.flush_interval
+            ):
+                self._write()
+
+    def _write(self) -> None:
+        records, self._buffer = self._buffer, []
+        self._flushed_at = time.monotonic()
+        if not records:
+            return
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(_UPSERT, records)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            self._buffer = records + self._buffer
+            raise
+        self._conn.execute("COMMIT")
+
+    def flush(self) -> None:
+        """Write every buffered record."""
+        with self._lock:
+            self._write()
+
+    def _key_of(self, job: str, task_id: str) -> str:
+        key = self._keys.get((job, task_id))
+        if key is None:
+            with self._lock:
+                self._write()
+                row = self._conn.execute(
+                    "SELECT key FROM submissions WHERE job = ? AND task_id = ?", (job, task_id)
+                ).fetchone()
+            if row is None:
+                raise KeyError(f"Task {task_id} is not part of job {job!r}")
+            key = self._keys[(job, task_id)] = row[0]
+        return key
+
+    def entries(self, job: str) -> dict[str, JournalEntry]:
+        """Return every entry of a job by payload key."""
+        with self._lock:
+            self._write()
+            rows = self._conn.execute(
+                "SELECT key, state, task_id, status, error, updated FROM submissions WHERE job = ?", (job,)
+            ).fetchall()
+        entries = {}
+        for key, state, task_id, status, error, updated in rows:
+            entries[key] = JournalEntry(key, state, task_id, None if status is None else loads(status), error, updated)
+            if task_id is not None:
+                self._keys[(job, task_id)] = key
+        return entries
+
+    def plan(self, job: str, payloads: Iterable[Any]) -> Iterator[tuple[str, Any, JournalEntry | None]]:
+        """Pair every payload with its key and the entry an earlier run left, if any."""
+        entries = self.entries(job)
+        for key, payload in payload_keys(payloads):
+            yield key, payload, entries.get(key)
+
+    def _begin(self, job: str, key: str, entry: JournalEntry | None) -> dict[str, Any] | None:
+        if entry is not None and entry.task_id is not None:
+            return {"task_id": entry.task_id}
+        if entry is not None and entry.state == SUBMITTING and not self.resubmit_uncertain:
+            raise UncertainSubmissionError()
+        self._record(job, key, SUBMITTING, durable=True)
+        return None
+
+    def _end(self, job: str, key: str, response: Any = None, error: Exception | None = None) -> None:
+        if error is not None:
+            # A task that may exist stays ``submitting``, so a rerun does not create it twice.
+            self._record(job, key, FAILED if _was_not_created(error) else SUBMITTING, error=repr(error))
+            return
+        task_id = task_id_of(response)
+        if task_id is None:
+            error = f"No task ID in the create_task response: {dumps(response).decode()}"
+            self._record(job, key, SUBMITTING, error=error)
+            return
+        self._keys[(job, task_id)] = key
+        self._record(job, key, CREATED, task_id=task_id)
+
+    def submit(
+        self, job: str, key: str, entry: JournalEntry | None, create: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Create a task through ``create`` unless an earlier run already did.
+
+        Args:
+            job (str): Name of the run.
+            key (str): Key of the payload, from ``plan``.
+            entry (JournalEntry | None): The entry ``plan`` returned for the payload.
+            create (Callable[[], dict[str, Any]]): Sends the ``create_task`` request.
+
+        Returns:
+            dict[str, Any]: The ``create_task`` response, or ``{"task_id": ...}`` for
+            a task an earlier run created.
+
+        Raises:
+            UncertainSubmissionError: If an earlier run was interrupted while creating the task.
+
+        """
+        existing = self._begin(job, key, entry)
+        if existing is not None:
+            return existing
+        try:
+            response = create()
+        except Exception as e:
+            self._end(job, key, error=e)
+            raise
+        self._end(job, key, response)
+        return response
+
+    async def async_submit(
+        self, job: str, key: str, entry: JournalEntry | None, create: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Asynchronous version of ``submit``."""
+        existing = self._begin(job, key, entry)
+        if existing is not None:
+            return existing
+        try:
+            response = await create()
+        except Exception as e:
+            self._end(job, key, error=e)
+            raise
+        self._end(job, key, response)
+        return response
+
+    def finished(self, job: str, task_id: str, status: dict[str, Any]) -> None:
+        """Record the terminal status of a task."""
+        self._record(job, self._key_of(job, task_id), FINISHED, task_id=task_id, status=status)
+
+    def fetched(self, job: str, task_id: str) -> None:
+        """Record that the results of a task were delivered."""
+        self._record(job, self._key_of(job, task_id), FETCHED, task_id=task_id)
+
+    def _task_ids(self, job: str, states: tuple[str, ...]) -> list[str]:
+        with self._lock:
+            self._write()
+            rows = self._conn.execute(
+                f"SELECT task_id FROM submissions WHERE job = ? AND state IN ({', '.join('?' * len(states))}) "
+                "AND task_id IS NOT NULL ORDER BY updated",
+                (job, *states),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def pending(self, job: str) -> list[str]:
+        """Return the tasks of a job that were created but have not finished."""
+        return self._task_ids(job, (CREATED,))
+
+    def unfetched(self, job: str) -> list[str]:
+        """Return the finished tasks of a job whose results were not delivered yet."""
+        return self._task_ids(job, (FINISHED,))
+
+    def counts(self, job: str) -> dict[str, int]:
+        """Return the number of payloads of a job in each state."""
+        with self._lock:
+            self._write()
+            rows = self._conn.execute(
+                "SELECT state, count(*) FROM submissions WHERE job = ? GROUP BY state", (job,)
+            ).fetchall()
+        return dict(rows)
+
+    def delete(self, job: str) -> None:
+        """Forget a job, for instance once all of its results are stored."""
+        with self._lock:
+            self._write()
+            self._conn.execute("DELETE FROM submissions WHERE job = ?", (job,))
+        self._keys = {pair: key for pair, key in self._keys.items() if pair[0] != job}
+
+    def close(self) -> None:
+        with self._lock:
+            self._write()
+            self._conn.close()
+
+    def __enter__(self) -> "JobJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,491 @@
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from .batch import BatchResult, gather_bounded, map_bounded
+from .cache import PersistentCache
+from .endpoints import Endpoints
+from .exceptions import InvalidAPIKeyError, NoAvailableKeyError, RateLimitExceededError
+from .instrumentation import RequestHooks, RequestInfo
+from .polling import TaskOutcome, async_wait_for_tasks, wait_for_tasks
+from .ratelimit import RateLimiter
+from .sharding import task_id_of
+from .transport import Transport
+
+R = TypeVar("R")
+
+LEAST_LOADED = "least_loaded"
+WEIGHTED_ROUND_ROBIN = "weighted_round_robin"
+
+# Seconds a key is left out of rotation after the API rejects it or keeps answering 429.
+DEFAULT_QUARANTINE = 60.0
+INVALID_KEY_QUARANTINE = 15 * 60.0
+
+PIN_PREFIX = "pin:"
+
+
+@dataclass
+class APIKey:
+    """One API key of a ``KeyPool`` and its limits.
+
+    Attributes:
+        key (str): The API key.
+        name (str | None): Label used in statistics and task pins instead of the
+            key itself. Defaults to ``key0``, ``key1``... by position in the pool.
+        weight (float): Relative share of new work the key receives.
+        rate (float | None): Requests per second allowed on this key.
+        credits (float | None): Total credits the pool may spend with this key.
+
+    """
+
+    key: str
+    name: str | None = None
+    weight: float = 1.0
+    rate: float | None = None
+    credits: float | None = None
+
+
+class KeyState:
+    """Scheduling state and counters of one key in a pool."""
+
+    def __init__(self, api_key: APIKey, name: str) -> None:
+        self.api_key = api_key
+        self.name = name
+        self.weight = api_key.weight
+        self.credits = api_key.credits
+        self.credits_used = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.rate_limit_strikes = 0
+        self.quarantined_until = 0.0
+        self.current_weight = 0.0
+        self.client: Any = None
+
+    @property
+    def credits_remaining(self) -> float | None:
+        return None if self.credits is None else self.credits - self.credits_used
+
+    def quarantined(self, now: float | None = None) -> bool:
+        return self.quarantined_until > (time.monotonic() if now is None else now)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "credits_remaining": self.credits_remaining,
+            "quarantined_for": max(0.0, self.quarantined_until - time.monotonic()),
+        }
+
+
+class _KeyHooks(RequestHooks):
+    """Watches the responses of one key and quarantines it when the API pushes back."""
+
+    def __init__(self, pool: "KeyPool", state: KeyState) -> None:
+        self.pool = pool
+        self.state = state
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        if info.status_code == 429:
+            self.pool._rate_limited(self.state)
+        elif info.status_code == 403:
+            self.pool.quarantine(self.state.name, self.pool.invalid_key_quarantine)
+        elif info.status_code is not None and info.status_code < 400:
+            self.state.rate_limit_strikes = 0
+
+
+class KeyPool:
+    """Spread requests over several API keys.
+
+    Every key gets its own client, rate limiter and credit budget; all of them
+    share one connection pool. New work, such as creating a task or listing
+    regions, goes to the key chosen by ``strategy``:
+
+    - ``"least_loaded"`` picks the key with the fewest requests in flight per
+      unit of weight, breaking ties by the fewest requests sent.
+    - ``"weighted_round_robin"`` cycles through the keys in proportion to
+      their weights (smooth weighted round-robin).
+
+    A key is left out of rotation for ``invalid_key_quarantine`` seconds after
+    the API rejects it, and for ``quarantine`` seconds after
+    ``max_rate_limits`` consecutive 429 responses. Calls that are not tied to a
+    key move on to the next one when a key fails that way.
+
+    Tasks are pinned to the key that created them, so their status and results
+    are always requested with that key. Pass a ``PersistentCache`` as ``pins``
+    to keep the pins across processes, or call ``pin`` for tasks created
+    elsewhere.
+
+    Args:
+        keys (Iterable[APIKey | str]): The keys, with their limits.
+        strategy (str): ``"least_loaded"`` or ``"weighted_round_robin"``.
+        costs (Mapping[Any, float] | None): Credits per endpoint template, keyed
+            by template string or ``Endpoints`` member. Unlisted endpoints cost 1.
+        quarantine (float): Seconds a key rests after repeated 429 responses.
+        max_rate_limits (int): Consecutive 429 responses that trigger a quarantine.
+        invalid_key_quarantine (float): Seconds a key rests after a 403 response.
+        pins (PersistentCache | None): Where task pins are kept. Defaults to memory.
+        transport (Transport | None): Connection pool shared by every key.
+        **client_options: Passed to each key's client, such as ``retry_policy``.
+
+    """
+
+    # Client created for each key; None means ``RushAnalyticsAPI``.
+    client_class: Any = None
+
+    def __init__(
+        self,
+        keys: Iterable[APIKey | str],
+        strategy: str = LEAST_LOADED,
+        costs: Mapping[Any, float] | None = None,
+        quarantine: float = DEFAULT_QUARANTINE,
+        max_rate_limits: int = 3,
+        invalid_key_quarantine: float = INVALID_KEY_QUARANTINE,
+        pins: PersistentCache | None = None,
+        transport: Transport | None = None,
+        **client_options: Any,
+    ) -> None:
+        if strategy not in (LEAST_LOADED, WEIGHTED_ROUND_ROBIN):
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        self.strategy = strategy
+        self.costs = {getattr(endpoint, "value", endpoint): cost for endpoint, cost in (costs or {}).items()}
+        self.quarantine_seconds = quarantine
+        self.max_rate_limits = max_rate_limits
+        self.invalid_key_quarantine = invalid_key_quarantine
+        self.pins = pins
+        self._pins: dict[str, str] = {}
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else Transport()
+        self._lock = threading.Lock()
+
+        hooks = tuple(client_options.pop("hooks", None) or ())
+        self.states: dict[str, KeyState] = {}
+        for index, api_key in enumerate(keys):
+            if isinstance(api_key, str):
+                api_key = APIKey(api_key)
+            if api_key.weight <= 0:
+                raise ValueError("Key weights must be positive")
+            state = KeyState(api_key, api_key.name or f"key{index}")
+            if state.name in self.states:
+                raise ValueError(f"Duplicate key name {state.name!r}")
+            rate_limiter = RateLimiter(api_key.rate) if api_key.rate is not None else None
+            state.client = self._client_class()(
+                api_key=api_key.key,
+                transport=self.transport,
+                rate_limiter=rate_limiter,
+                hooks=(*hooks, _KeyHooks(self, state)),
+                **client_options,
+            )
+            self.states[state.name] = state
+        if not self.states:
+            raise ValueError("A key pool needs at least one key")
+
+    def _client_class(self) -> Any:
+        if self.client_class is None:
+            from . import RushAnalyticsAPI
+
+            return RushAnalyticsAPI
+        return self.client_class
+
+    # Scheduling
+
+    def _cost(self, endpoint: str) -> float:
+        return self.costs.get(endpoint, 1.0)
+
+    def _available(self, state: KeyState, cost: float, now: float) -> bool:
+        remaining = state.credits_remaining
+        return not state.quarantined(now) and (remaining is None or remaining >= cost)
+
+    def _unavailable_error(self, states: Iterable[KeyState], cost: float) -> NoAvailableKeyError:
+        now = time.monotonic()
+        waits = [state.quarantined_until - now for state in states if state.quarantined(now)]
+        budget_left = [state for state in states if state.credits_remaining is None or state.credits_remaining >= cost]
+        return NoAvailableKeyError(retry_in=min(waits) if waits and budget_left else None)
+
+    def _pick(self, candidates: list[KeyState]) -> KeyState:
+        if self.strategy == LEAST_LOADED:
+            return min(candidates, key=lambda state: (state.in_flight / state.weight, state.requests / state.weight))
+        total = sum(state.weight for state in candidates)
+        for state in candidates:
+            state.current_weight += state.weight
+        chosen = max(candidates, key=lambda state: state.current_weight)
+        chosen.current_weight -= total
+        return chosen
+
+    def _acquire(self, endpoint: str, task_id: str | None = None, exclude: Iterable[str] = ()) -> KeyState:
+        """Reserve a key for one call: the pinned key for ``task_id``, otherwise the scheduled one."""
+        cost = self._cost(endpoint)
+        pinned = self.key_for(task_id) if task_id is not None else None
+        with self._lock:
+            now = time.monotonic()
+            if pinned is not None:
+                state = self.states[pinned]
+                if not self._available(state, cost, now):
+                    raise self._unavailable_error([state], cost)
+            else:
+                candidates = [
+                    state
+                    for name, state in self.states.items()
+                    if name not in exclude and self._available(state, cost, now)
+                ]
+                if not candidates:
+                    raise self._unavailable_error(self.states.values(), cost)
+                state = self._pick(candidates)
+            state.in_flight += 1
+            state.requests += 1
+            state.credits_used += cost
+        return state
+
+    def _release(self, state: KeyState, error: Exception | None = None, refund: float = 0.0) -> None:
+        with self._lock:
+            state.in_flight -= 1
+            state.credits_used -= refund
+            if error is not None:
+                state.failures += 1
+
+    def _failover(self, state: KeyState, endpoint: str, error: Exception, task_id: str | None, tried: list[str]) -> bool:
+        """Release ``state`` after ``error`` and decide whether to retry the call with another key."""
+        if not isinstance(error, (InvalidAPIKeyError, RateLimitExceededError)):
+            self._release(state, error)
+            return False
+        # The API rejected the request outright, so it is not charged to the key's budget.
+        self._release(state, error, refund=self._cost(endpoint))
+        tried.append(state.name)
+        return task_id is None and len(tried) < len(self.states)
+
+    def _rate_limited(self, state: KeyState) -> None:
+        with self._lock:
+            state.rate_limit_strikes += 1
+            strikes = state.rate_limit_strikes
+        if strikes >= self.max_rate_limits:
+            self.quarantine(state.name, self.quarantine_seconds)
+
+    def quarantine(self, name: str, seconds: float) -> None:
+        """Take the key called ``name`` out of rotation for ``seconds``."""
+        with self._lock:
+            state = self.states[name]
+            state.quarantined_until = max(state.quarantined_until, time.monotonic() + seconds)
+            state.rate_limit_strikes = 0
+
+    def release_quarantine(self, name: str) -> None:
+        """Put the key called ``name`` back into rotation."""
+        with self._lock:
+            self.states[name].quarantined_until = 0.0
+
+    # Task pins
+
+    def pin(self, task_id: str, name: str) -> None:
+        """Record that ``task_id`` belongs to the key called ``name``."""
+        if name not in self.states:
+            raise KeyError(f"Unknown key {name!r}")
+        self._pins[str(task_id)] = name
+        if self.pins is not None:
+            self.pins.set(PIN_PREFIX + str(task_id), name)
+
+    def key_for(self, task_id: str) -> str:
+        """Return the name of the key ``task_id`` is pinned to.
+
+        Raises:
+            KeyError: If the task was not created through this pool and was never pinned.
+
+        """
+        task_id = str(task_id)
+        name = self._pins.get(task_id)
+        if name is None and self.pins is not None:
+            entry = self.pins.get(PIN_PREFIX + task_id)
+            if entry is not None and entry.value in self.states:
+                name = self._pins[task_id] = entry.value
+        if name is None:
+            raise KeyError(f"Task {task_id} is not pinned to a key of this pool")
+        return name
+
+    def client_for(self, task_id: str) -> Any:
+        """Return the client of the key ``task_id`` is pinned to."""
+        return self.states[self.key_for(task_id)].client
+
+    # Calls
+
+    def _call(self, endpoint: str, func: Callable[[KeyState], R], task_id: str | None = None) -> R:
+        tried: list[str] = []
+        while True:
+            state = self._acquire(endpoint, task_id, tried)
+            try:
+                result = func(state)
+            except Exception as e:
+                if self._failover(state, endpoint, e, task_id, tried):
+                    continue
+                raise
+            self._release(state)
+            return result
+
+    def _stream(self, endpoint: str, func: Callable[[KeyState], Iterable[R]], task_id: str) -> Iterator[R]:
+        state = self._acquire(endpoint, task_id)
+        error: Exception | None = None
+        try:
+            yield from func(state)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._release(state, error)
+
+    def create_task(self, **kwargs: Any) -> dict[str, Any]:
+        """Create a task with the next key and pin the task to it."""
+
+        def create(state: KeyState) -> dict[str, Any]:
+            response = state.client.create_task(**kwargs)
+            task_id = task_id_of(response)
+            if task_id is not None:
+                self.pin(task_id, state.name)
+            return response
+
+        return self._call(Endpoints.CREATE_TASK.value, create)
+
+    def create_tasks(
+        self, payloads: Iterable[Mapping[str, Any]], max_concurrency: int = 10
+    ) -> list[BatchResult[dict[str, Any]]]:
+        """Create many tasks on a bounded thread pool, spread over the keys."""
+        return map_bounded(lambda payload: self.create_task(**payload), payloads, max_concurrency)
+
+    def get_task_status(self, task_id: str) -> dict[str, Any]:
+        return self._call(Endpoints.TASK_STATUS.value, lambda state: state.client.get_task_status(task_id), task_id)
+
+    def get_task_results(self, task_id: str) -> dict[str, Any]:
+        return self._call(Endpoints.TASK_RESULTS.value, lambda state: state.client.get_task_results(task_id), task_id)
+
+    def iter_task_results(self, task_id: str, key: str | None = None) -> Iterator[Any]:
+        return self._stream(
+            Endpoints.TASK_RESULTS.value, lambda state: state.client.iter_task_results(task_id, key), task_id
+        )
+
+    def wait_for_tasks(self, task_ids: Iterable[str], **options: Any) -> Iterator[TaskOutcome]:
+        """Poll tasks created through the pool, each with its own key."""
+        return wait_for_tasks(self.get_task_status, task_ids, **options)
+
+    def list_languages(self) -> dict[str, Any]:
+        return self._call(Endpoints.LIST_LANGUAGES.value, lambda state: state.client.list_languages())
+
+    def list_google_regions(self) -> dict[str, Any]:
+        return self._call(Endpoints.LIST_GOOGLE_REGIONS.value, lambda state: state.client.list_google_regions())
+
+    def list_yandex_regions(self) -> dict[str, Any]:
+        return self._call(Endpoints.LIST_YANDEX_REGIONS.value, lambda state: state.client.list_yandex_regions())
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return in-flight, request, failure, credit and quarantine counters per key name."""
+        with self._lock:
+            return {name: state.as_dict() for name, state in self.states.items()}
+
+    def close(self) -> None:
+        """Close the shared connection pool, unless it was passed in by the caller."""
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "KeyPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class AsyncKeyPool(KeyPool):
+    """Asynchronous version of ``KeyPool``, built on ``AsyncRushAnalyticsAPI`` clients."""
+
+    def _client_class(self) -> Any:
+        if self.client_class is None:
+            from . import AsyncRushAnalyticsAPI
+
+            return AsyncRushAnalyticsAPI
+        return self.client_class
+
+    async def _acall(self, endpoint: str, func: Callable[[KeyState], Any], task_id: str | None = None) -> Any:
+        tried: list[str] = []
+        while True:
+            state = self._acquire(endpoint, task_id, tried)
+            try:
+                result = await func(state)
+            except Exception as e:
+                if self._failover(state, endpoint, e, task_id, tried):
+                    continue
+                raise
+            self._release(state)
+            return result
+
+    async def create_task(self, **kwargs: Any) -> dict[str, Any]:
+        async def create(state: KeyState) -> dict[str, Any]:
+            response = await state.client.create_task(**kwargs)
+            task_id = task_id_of(response)
+            if task_id is not None:
+                self.pin(task_id, state.name)
+            return response
+
+        return await self._acall(Endpoints.CREATE_TASK.value, create)
+
+    async def create_tasks(
+        self, payloads: Iterable[Mapping[str, Any]], max_concurrency: int = 10
+    ) -> list[BatchResult[dict[str, Any]]]:
+        return await gather_bounded(lambda payload: self.create_task(**payload), payloads, max_concurrency)
+
+    async def async_get_task_status(self, task_id: str) -> dict[str, Any]:
+        return await self._acall(
+            Endpoints.TASK_STATUS.value, lambda state: state.client.async_get_task_status(task_id), task_id
+        )
+
+    async def async_get_task_results(self, task_id: str) -> dict[str, Any]:
+        return await self._acall(
+            Endpoints.TASK_RESULTS.value, lambda state: state.client.async_get_task_results(task_id), task_id
+        )
+
+    async def async_iter_task_results(self, task_id: str, key: str | None = None) -> AsyncIterator[Any]:
+        state = self._acquire(Endpoints.TASK_RESULTS.value, task_id)
+        error: Exception | None = None
+        try:
+            async for row in state.client.async_iter_task_results(task_id, key):
+                yield row
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._release(state, error)
+
+    def wait_for_tasks(self, task_ids: Iterable[str], **options: Any) -> AsyncIterator[TaskOutcome]:
+        return async_wait_for_tasks(self.async_get_task_status, task_ids, **options)
+
+    async def async_list_languages(self) -> dict[str, Any]:
+        return await self._acall(Endpoints.LIST_LANGUAGES.value, lambda state: state.client.async_list_languages())
+
+    async def async_list_google_regions(self) -> dict[str, Any]:
+        return await self._acall(
+            Endpoints.LIST_GOOGLE_REGIONS.value, lambda state: state.client.async_list_google_regions()
+        )
+
+    async def async_list_yandex_regions(self) -> dict[str, Any]:
+        return await self._acall(
+            Endpoints.LIST_YANDEX_REGIONS.value, lambda state: state.client.async_list_yandex_regions()
+        )
+
+    async def close(self) -> None:
+        """Close the shared connection pool, unless it was passed in by the caller."""
+        if self._owns_transport:
+            await self.transport.aclose()
+
+    def __enter__(self) -> "AsyncKeyPool":
+        raise TypeError("Use 'async with' with AsyncKeyPool")
+
+    async def __aenter__(self) -> "AsyncKeyPool":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    # The synchronous pool's method names, so that none of them bypasses the per-key accounting.
+    get_task_status = async_get_task_status
+    get_task_results = async_get_task_results
+    iter_task_results = async_iter_task_results
+    list_languages = async_list_languages
+    list_google_regions = async_list_google_regions
+    list_yandex_regions = async_list_yandex_regions
+    aclose = close
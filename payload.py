@@ -0,0 +1,114 @@
+import logging
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from pydantic import BaseModel, HttpUrl, TypeAdapter, ValidationError, ValidatorFunctionWrapHandler, field_validator
+
+logger = logging.getLogger(__name__)
+
+# Validators for whole keyword lists, built once and run in pydantic-core.
+_KEYWORDS = TypeAdapter(list[dict[str, str]])
+_STRINGS = TypeAdapter(list[str])
+
+
+def _as_list(values: Any) -> Any:
+    # NumPy arrays and pandas Series convert to plain lists in one C call.
+    tolist = getattr(values, "tolist", None)
+    return tolist() if callable(tolist) else values
+
+
+def keywords_from_rows(rows: Iterable[Sequence[str]], fields: Sequence[str] = ("keyword",)) -> dict[str, list[str]]:
+    """Transpose keyword tuples, such as ``("shoes", "https://example.com/shoes")``, into columns.
+
+    Args:
+        rows (Iterable[Sequence[str]]): One tuple per keyword, with values in ``fields`` order.
+        fields (Sequence[str]): The keyword field each tuple position maps to.
+
+    Returns:
+        dict[str, list[str]]: Parallel columns accepted by ``TaskPayload.keywords``.
+
+    """
+    rows = list(rows)
+    if any(len(row) != len(fields) for row in rows):
+        raise ValueError(f"Every keyword row must have {len(fields)} values: {', '.join(fields)}")
+    columns = list(zip(*rows)) or [()] * len(fields)
+    return {name: list(column) for name, column in zip(fields, columns)}
+
+
+def normalize_keywords(keywords: Any) -> list[dict[str, str]]:
+    """Validate keywords given in any supported form and return them as dicts.
+
+    Besides a list of dicts, keywords can be given compactly as a sequence of
+    strings or as a mapping of field name to a parallel sequence of values
+    (lists, tuples, NumPy arrays or pandas Series). Compact forms are
+    validated one column at a time in bulk, which is much cheaper than
+    validating a dict per keyword.
+
+    Raises:
+        ValueError: If the columns of a mapping differ in length.
+        ValidationError: If a value is not a string.
+
+    """
+    if isinstance(keywords, Mapping):
+        columns = {str(name): _STRINGS.validate_python(_as_list(values)) for name, values in keywords.items()}
+        if len({len(values) for values in columns.values()}) > 1:
+            raise ValueError("Keyword columns must all have the same length")
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+    keywords = _as_list(keywords)
+    if isinstance(keywords, Sequence) and keywords and isinstance(keywords[0], str):
+        return [{"keyword": keyword} for keyword in _STRINGS.validate_python(keywords)]
+    return _KEYWORDS.validate_python(keywords)
+
+
+class TaskPayload(BaseModel):
+    name: str
+    url: HttpUrl
+    competitors: list[str] = []
+    data_collection_frequency: int = 0
+    yandex_regions: list[dict[str, Any]] = []
+    google_regions: list[dict[str, Any]] = []
+    keywords: list[dict[str, str]] = []
+
+    @field_validator("keywords", mode="wrap")
+    @classmethod
+    def _validate_keywords(cls, value: Any, handler: ValidatorFunctionWrapHandler) -> list[dict[str, str]]:
+        if isinstance(value, list) and (not value or isinstance(value[0], Mapping)):
+            return handler(value)
+        return normalize_keywords(value)
+
+
+def build_task_payload(**kwargs) -> TaskPayload:
+    try:
+        return TaskPayload(**kwargs)
+    except ValidationError as e:
+        logger.error("Validation error: %s", e)
+        raise
+
+
+def build_task_request(api_key: str, payload: TaskPayload | Mapping[str, Any]) -> dict[str, Any]:
+    """Validate a task payload and convert it to the JSON body expected by the API.
+
+    The body references the validated lists instead of copying them through
+    ``model_dump``, so building it costs the same for ten keywords or 100,000.
+
+    Args:
+        api_key (str): The API key sent along with the task.
+        payload (TaskPayload | Mapping[str, Any]): A validated payload or its keyword arguments.
+
+    Returns:
+        dict[str, Any]: The request body for the ``tasks`` endpoint.
+
+    """
+    if not isinstance(payload, TaskPayload):
+        payload = TaskPayload.model_validate(payload)
+    return {
+        "apikey": api_key,
+        "name": payload.name,
+        "url": str(payload.url),
+        "competitors": payload.competitors,
+        "dataCollectionFrequency": payload.data_collection_frequency,
+        "yandexRegions": payload.yandex_regions,
+        "googleRegions": payload.google_regions,
+        "keywords": payload.keywords,
+    }
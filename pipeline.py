@@ -0,0 +1,307 @@
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import RequestError, TaskFailedError
+from .journal import CREATED, FETCHED, FINISHED, JobJournal
+from .polling import async_wait_for_tasks, is_terminal_status
+from .sharding import task_id_of
+
+if TYPE_CHECKING:
+    import asyncio
+
+SUBMIT = "submit"
+WAIT = "wait"
+RESULTS = "results"
+
+# Terminal statuses whose task has no results to download.
+FAILED_STATUSES = frozenset({"failed", "error", "cancelled", "canceled"})
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one payload that went through a ``TaskPipeline``.
+
+    Attributes:
+        index (int): Position of the payload in the input.
+        task_id (str | None): The ID of the created task, once submitted.
+        results (Any): The task results, when every stage succeeded.
+        status (dict[str, Any] | None): The terminal status response of the task.
+        error (Exception | None): Why the task failed, if it did.
+        stage (str | None): The stage that failed: ``"submit"``, ``"wait"`` or ``"results"``.
+
+    """
+
+    index: int
+    task_id: str | None = None
+    results: Any = None
+    status: dict[str, Any] | None = None
+    error: Exception | None = None
+    stage: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class PipelineSummary:
+    """Counters of a ``TaskPipeline`` run.
+
+    Attributes:
+        submitted (int): Tasks created.
+        completed (int): Tasks whose results were delivered.
+        failures (list[PipelineResult]): Every failed payload, in the order delivered.
+        abandoned (list[str]): Tasks created but not delivered because the run was stopped early.
+        cancelled (bool): Whether the run was stopped before every payload was processed.
+        resumed (int): Tasks created by an earlier run of a journaled job and picked up again.
+        skipped (int): Payloads of a journaled job whose results an earlier run delivered.
+
+    """
+
+    submitted: int = 0
+    completed: int = 0
+    failures: list[PipelineResult] = field(default_factory=list)
+    abandoned: list[str] = field(default_factory=list)
+    cancelled: bool = False
+    resumed: int = 0
+    skipped: int = 0
+
+    @property
+    def failed(self) -> dict[str, int]:
+        """Number of failed payloads per stage."""
+        return dict(Counter(result.stage for result in self.failures))
+
+
+class TaskPipeline:
+    """Create tasks, wait for them and download their results as one async stream.
+
+    Payloads are submitted, polled and downloaded concurrently, each stage with
+    its own concurrency limit, and every task is handed to the consumer as soon
+    as its results arrive. At most ``max_pending`` tasks are between submission
+    and the consumer at any time: when the consumer falls behind, submission
+    pauses, so memory stays bounded however many payloads there are.
+
+    Calling ``cancel`` stops the run: ``create_task`` requests in flight are
+    allowed to finish, polls and downloads are cancelled, and the tasks created
+    but not delivered are listed in ``summary.abandoned``. Leaving the loop
+    with ``break`` or an exception does the same once the generator is closed;
+    wrap ``run`` in ``contextlib.aclosing`` to close it right away. ``summary``
+    describes the last run.
+
+    Args:
+        client (AsyncRushAnalyticsAPI | AsyncKeyPool): Sends every request.
+        submit_concurrency (int): Maximum ``create_task`` requests in flight.
+        poll_concurrency (int): Maximum status requests in flight.
+        results_concurrency (int): Maximum result downloads in flight.
+        max_pending (int): Maximum tasks submitted but not yet taken by the consumer.
+        initial_interval (float): Delay in seconds before a task is polled again.
+        max_interval (float): Upper bound for the per-task polling delay.
+        multiplier (float): Factor applied to the delay after each unfinished poll.
+        jitter (float): Fraction of the delay that is randomized.
+        timeout (float | None): Give up on a task this many seconds after it was created.
+        is_complete (Callable[[dict[str, Any]], bool]): Predicate for terminal status responses.
+
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        submit_concurrency: int = 10,
+        poll_concurrency: int = 10,
+        results_concurrency: int = 5,
+        max_pending: int = 100,
+        initial_interval: float = 5.0,
+        max_interval: float = 300.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        timeout: float | None = None,
+        is_complete: Callable[[dict[str, Any]], bool] = is_terminal_status,
+    ) -> None:
+        for name, value in (
+            ("submit_concurrency", submit_concurrency),
+            ("poll_concurrency", poll_concurrency),
+            ("results_concurrency", results_concurrency),
+            ("max_pending", max_pending),
+        ):
+            if value < 1:
+                raise ValueError(f"{name} must be at least 1")
+        self.client = client
+        self.submit_concurrency = submit_concurrency
+        self.poll_concurrency = poll_concurrency
+        self.results_concurrency = results_concurrency
+        self.max_pending = max_pending
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.timeout = timeout
+        self.is_complete = is_complete
+        self.summary = PipelineSummary()
+        self._output: asyncio.Queue[PipelineResult | None] | None = None
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """Stop the current run; the ``async for`` loop ends after the result it is handling."""
+        self._cancelled = True
+        if self._output is not None:
+            self._output.put_nowait(None)
+
+    async def run(
+        self, payloads: Iterable[Mapping[str, Any]], journal: JobJournal | None = None, job: str = "default"
+    ) -> AsyncIterator[PipelineResult]:
+        """Process ``payloads`` and yield each task once its results are downloaded.
+
+        With a ``journal``, running the same ``job`` again after a crash creates
+        only the tasks that do not exist yet, polls only the unfinished ones and
+        skips those whose results the consumer already handled. A result counts
+        as handled once the consumer asks for the next one or calls ``cancel``;
+        one it was processing when the loop was left otherwise is delivered again.
+
+        Args:
+            payloads (Iterable[Mapping[str, Any]]): Keyword arguments of ``create_task``,
+                read lazily as submission capacity frees up.
+            journal (JobJournal | None): Records the progress of every payload.
+            job (str): Name of the run in the journal.
+
+        Yields:
+            PipelineResult: One result per payload, in completion order.
+
+        """
+        import asyncio
+
+        self.summary = summary = PipelineSummary()
+        self._cancelled = False
+        self._output = output = asyncio.Queue()
+        pending = asyncio.Semaphore(self.max_pending)
+        polls = asyncio.Semaphore(self.poll_concurrency)
+        downloads = asyncio.Semaphore(self.results_concurrency)
+        followers: dict[asyncio.Task[None], str] = {}
+        stopped: list[str] = []
+        if journal is None:
+            inputs = ((index, "", payload, None) for index, payload in enumerate(payloads))
+        else:
+            inputs = ((index, *planned) for index, planned in enumerate(journal.plan(job, payloads)))
+
+        async def follow(index: int, task_id: str, status: dict[str, Any] | None = None) -> None:
+            result = PipelineResult(index, task_id, status=status)
+            stage = WAIT
+            try:
+                if result.status is None:
+                    result.status = await self._wait(task_id, polls)
+                    if journal is not None:
+                        journal.finished(job, task_id, result.status)
+                state = result.status.get("status")
+                if str(state).lower() in FAILED_STATUSES:
+                    raise TaskFailedError(f"Task {task_id} finished with status {state!r}", result.status)
+                stage = RESULTS
+                async with downloads:
+                    result.results = await self.client.async_get_task_results(task_id)
+            except Exception as e:
+                result.error, result.stage = e, stage
+            del followers[asyncio.current_task()]
+            output.put_nowait(result)
+
+        async def submit() -> None:
+            for index, key, payload, entry in inputs:
+                if entry is not None and entry.state == FETCHED:
+                    summary.skipped += 1
+                    continue
+                await pending.acquire()
+                if self._cancelled:
+                    return
+                if entry is not None and entry.state in (CREATED, FINISHED):
+                    summary.resumed += 1
+                    status = entry.status if entry.state == FINISHED else None
+                    followers[asyncio.ensure_future(follow(index, entry.task_id, status))] = entry.task_id
+                    continue
+                try:
+                    create = partial(self.client.create_task, **payload)
+                    response = await (create() if journal is None else journal.async_submit(job, key, entry, create))
+                    task_id = task_id_of(response)
+                    if task_id is None:
+                        raise RequestError("The create_task response has no task ID")
+                except Exception as e:
+                    output.put_nowait(PipelineResult(index, error=e, stage=SUBMIT))
+                    continue
+                summary.submitted += 1
+                if self._cancelled:
+                    stopped.append(task_id)
+                    return
+                followers[asyncio.ensure_future(follow(index, task_id))] = task_id
+
+        async def supervise() -> None:
+            try:
+                await asyncio.gather(*(submit() for _ in range(self.submit_concurrency)))
+                # No new followers start once every submitter has returned.
+                await asyncio.gather(*followers)
+            finally:
+                output.put_nowait(None)
+
+        supervisor = asyncio.ensure_future(supervise())
+        try:
+            while (result := await output.get()) is not None:
+                pending.release()
+                if result.ok:
+                    summary.completed += 1
+                else:
+                    summary.failures.append(result)
+                yield result
+                if journal is not None and result.ok:
+                    journal.fetched(job, result.task_id)
+                if self._cancelled:
+                    break
+            if supervisor.done() and not self._cancelled:
+                # Surface errors raised while reading the payloads.
+                supervisor.result()
+        finally:
+            summary.cancelled = not supervisor.done() or self._cancelled
+            # Let create_task requests in flight finish, so that every task created is accounted for.
+            self._cancelled = True
+            for _ in range(self.submit_concurrency):
+                pending.release()
+            for follower in followers:
+                follower.cancel()
+            await asyncio.gather(supervisor, *followers, return_exceptions=True)
+            undelivered = [item.task_id for item in (output.get_nowait() for _ in range(output.qsize())) if item]
+            summary.abandoned = sorted({*followers.values(), *stopped, *filter(None, undelivered)})
+            self._output = None
+            if journal is not None:
+                journal.flush()
+
+    async def _wait(self, task_id: str, polls: "asyncio.Semaphore") -> dict[str, Any]:
+        """Poll one task with the backoff of ``async_wait_for_tasks`` until its status is terminal."""
+        last_error: Exception | None = None
+
+        async def get_status(task_id: str) -> dict[str, Any]:
+            nonlocal last_error
+            async with polls:
+                try:
+                    return await self.client.async_get_task_status(task_id)
+                except Exception as e:
+                    # Retries are exhausted for this poll, but the task itself may still finish.
+                    last_error = e
+                    raise
+
+        outcomes = async_wait_for_tasks(
+            get_status,
+            [task_id],
+            initial_interval=self.initial_interval,
+            max_interval=self.max_interval,
+            multiplier=self.multiplier,
+            jitter=self.jitter,
+            timeout=self.timeout,
+            max_concurrency=1,
+            is_complete=self.is_complete,
+        )
+        async with aclosing(outcomes):
+            outcome = await anext(outcomes)
+        if isinstance(outcome.error, TimeoutError):
+            raise outcome.error from last_error
+        if outcome.error is not None:
+            raise outcome.error
+        return outcome.status
@@ -0,0 +1,250 @@
+import heapq
+import itertools
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .endpoints import InvalidAPIKeyError, NotFoundError
+
+TERMINAL_STATUSES = frozenset({"completed", "complete", "done", "finished", "failed", "error", "cancelled", "canceled"})
+
+# Errors that will not go away by polling again.
+FATAL_ERRORS: tuple[type[Exception], ...] = (InvalidAPIKeyError, NotFoundError)
+
+
+def is_terminal_status(response: dict[str, Any]) -> bool:
+    """Return True if a task status response describes a finished task."""
+    status = response.get("status")
+    return isinstance(status, str) and status.lower() in TERMINAL_STATUSES
+
+
+@dataclass
+class TaskOutcome:
+    """Final state of a task handed out by ``wait_for_tasks``.
+
+    Attributes:
+        task_id (str): The ID of the task.
+        status (dict[str, Any] | None): The last status response, once terminal.
+        error (Exception | None): Set when the task could not be polled to completion.
+        polls (int): Number of status requests sent for this task.
+
+    """
+
+    task_id: str
+    status: dict[str, Any] | None = None
+    error: Exception | None = None
+    polls: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(order=True)
+class _PollEntry:
+    due: float
+    priority: int
+    seq: int
+    task_id: str = field(compare=False)
+    interval: float = field(compare=False)
+    polls: int = field(default=0, compare=False)
+
+
+class _PollScheduler:
+    """Priority queue of pending status polls shared by the sync and async waiters."""
+
+    def __init__(
+        self,
+        task_ids: Iterable[str],
+        priorities: Mapping[str, int] | None,
+        initial_interval: float,
+        max_interval: float,
+        multiplier: float,
+        jitter: float,
+        requests_per_second: float | None,
+        timeout: float | None,
+        is_complete: Callable[[dict[str, Any]], bool],
+    ) -> None:
+        if requests_per_second is not None and requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.min_spacing = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.is_complete = is_complete
+        self.next_send = 0.0
+        self._seq = itertools.count()
+        now = time.monotonic()
+        self.deadline = now + timeout if timeout is not None else None
+        self.heap: list[_PollEntry] = []
+        for task_id in dict.fromkeys(task_ids):
+            priority = priorities.get(task_id, 0) if priorities else 0
+            self.heap.append(_PollEntry(now, priority, next(self._seq), task_id, initial_interval))
+        heapq.heapify(self.heap)
+
+    def __bool__(self) -> bool:
+        return bool(self.heap)
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until the head of the queue may be sent under the request budget."""
+        return max(self.heap[0].due, self.next_send) - now
+
+    def pop(self, now: float) -> _PollEntry:
+        entry = heapq.heappop(self.heap)
+        entry.polls += 1
+        self.next_send = max(now, self.next_send) + self.min_spacing
+        return entry
+
+    def handle(self, entry: _PollEntry, response: dict[str, Any] | None, error: Exception | None) -> TaskOutcome | None:
+        """Record a poll result; return an outcome once the task is done, otherwise requeue it."""
+        if error is not None and isinstance(error, FATAL_ERRORS):
+            return TaskOutcome(entry.task_id, error=error, polls=entry.polls)
+        if response is not None and self.is_complete(response):
+            return TaskOutcome(entry.task_id, status=response, polls=entry.polls)
+        delay = random.uniform(entry.interval * (1 - self.jitter), entry.interval)
+        entry.interval = min(self.max_interval, entry.interval * self.multiplier)
+        entry.due = time.monotonic() + delay
+        entry.seq = next(self._seq)
+        heapq.heappush(self.heap, entry)
+        return None
+
+    def expired(self, now: float) -> bool:
+        return self.deadline is not None and now >= self.deadline
+
+    def drain_expired(self) -> list[TaskOutcome]:
+        """Give up on every task still queued once the overall timeout has passed."""
+        outcomes = [
+            TaskOutcome(entry.task_id, error=TimeoutError(f"Task {entry.task_id} did not finish in time"), polls=entry.polls)
+            for entry in sorted(self.heap, key=lambda e: (e.priority, e.seq))
+        ]
+        self.heap.clear()
+        return outcomes
+
+
+def wait_for_tasks(
+    get_status: Callable[[str], dict[str, Any]],
+    task_ids: Iterable[str],
+    *,
+    priorities: Mapping[str, int] | None = None,
+    initial_interval: float = 5.0,
+    max_interval: float = 300.0,
+    multiplier: float = 2.0,
+    jitter: float = 0.5,
+    requests_per_second: float | None = None,
+    timeout: float | None = None,
+    is_complete: Callable[[dict[str, Any]], bool] = is_terminal_status,
+) -> Iterator[TaskOutcome]:
+    """Poll many tasks from one priority queue and yield each as it finishes.
+
+    Every task backs off exponentially, with jitter, between polls. Polls that
+    are due at the same time are sent in priority order (lower value first) and
+    never faster than ``requests_per_second`` overall.
+
+    Args:
+        get_status (Callable[[str], dict[str, Any]]): Function returning the status of a task.
+        task_ids (Iterable[str]): The IDs of the tasks to wait for.
+        priorities (Mapping[str, int] | None): Optional priority per task ID; lower is more urgent.
+        initial_interval (float): Delay in seconds before a task is polled again.
+        max_interval (float): Upper bound for the per-task delay.
+        multiplier (float): Factor applied to the delay after each unfinished poll.
+        jitter (float): Fraction of the delay that is randomized.
+        requests_per_second (float | None): Global request budget across all tasks.
+        timeout (float | None): Give up on unfinished tasks after this many seconds.
+        is_complete (Callable[[dict[str, Any]], bool]): Predicate for terminal status responses.
+
+    Yields:
+        TaskOutcome: The final state of each task, in completion order.
+
+    """
+    scheduler = _PollScheduler(
+        task_ids, priorities, initial_interval, max_interval, multiplier, jitter,
+        requests_per_second, timeout, is_complete,
+    )
+    while scheduler:
+        now = time.monotonic()
+        if scheduler.expired(now):
+            yield from scheduler.drain_expired()
+            return
+        wait = scheduler.wait_time(now)
+        if wait > 0:
+            if scheduler.deadline is not None:
+                wait = min(wait, scheduler.deadline - now)
+            time.sleep(wait)
+            continue
+        entry = scheduler.pop(now)
+        try:
+            outcome = scheduler.handle(entry, get_status(entry.task_id), None)
+        except Exception as e:
+            outcome = scheduler.handle(entry, None, e)
+        if outcome is not None:
+            yield outcome
+
+
+async def async_wait_for_tasks(
+    get_status: Callable[[str], Awaitable[dict[str, Any]]],
+    task_ids: Iterable[str],
+    *,
+    priorities: Mapping[str, int] | None = None,
+    initial_interval: float = 5.0,
+    max_interval: float = 300.0,
+    multiplier: float = 2.0,
+    jitter: float = 0.5,
+    requests_per_second: float | None = None,
+    timeout: float | None = None,
+    max_concurrency: int = 10,
+    is_complete: Callable[[dict[str, Any]], bool] = is_terminal_status,
+) -> AsyncIterator[TaskOutcome]:
+    """Asynchronously poll many tasks and yield each as it finishes.
+
+    Takes the same scheduling options as ``wait_for_tasks`` plus
+    ``max_concurrency``, the number of status requests allowed in flight.
+
+    Yields:
+        TaskOutcome: The final state of each task, in completion order.
+
+    """
+    import asyncio
+
+    scheduler = _PollScheduler(
+        task_ids, priorities, initial_interval, max_interval, multiplier, jitter,
+        requests_per_second, timeout, is_complete,
+    )
+    in_flight: dict[asyncio.Task[dict[str, Any]], _PollEntry] = {}
+    try:
+        while scheduler or in_flight:
+            now = time.monotonic()
+            if scheduler.expired(now):
+                for task in in_flight:
+                    task.cancel()
+                scheduler.heap.extend(in_flight.values())
+                in_flight.clear()
+                for outcome in scheduler.drain_expired():
+                    yield outcome
+                return
+            while scheduler and len(in_flight) < max_concurrency and scheduler.wait_time(now) <= 0:
+                entry = scheduler.pop(now)
+                in_flight[asyncio.ensure_future(get_status(entry.task_id))] = entry
+            wait = None
+            if scheduler and len(in_flight) < max_concurrency:
+                wait = max(scheduler.wait_time(now), 0)
+            if scheduler.deadline is not None:
+                remaining = max(scheduler.deadline - now, 0)
+                wait = remaining if wait is None else min(wait, remaining)
+            if not in_flight:
+                await asyncio.sleep(wait or 0)
+                continue
+            done, _ = await asyncio.wait(in_flight, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            outcomes = []
+            for task in done:
+                entry = in_flight.pop(task)
+                error = task.exception()
+                outcome = scheduler.handle(entry, None if error else task.result(), error)
+                if outcome is not None:
+                    outcomes.append((entry.priority, entry.seq, outcome))
+            for _, _, outcome in sorted(outcomes, key=lambda item: item[:2]):
+                yield outcome
+    finally:
+        for task in in_flight:
+            task.cancel()
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+# Values of X-RateLimit-Reset above this are epoch timestamps rather than delays.
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date.
+
+    Returns:
+        float | None: The delay in seconds, or None if the header is absent or invalid.
+
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket that paces requests before they are sent.
+
+    Every request takes ``cost`` tokens, looked up per endpoint template, and
+    the bucket refills at ``rate`` tokens per second up to ``capacity``. Tokens
+    are reserved under a lock and the caller sleeps outside of it, so a single
+    limiter can be shared by any number of threads, event loops and client
+    instances in one process.
+
+    The limiter also adapts to the server: ``Retry-After`` pauses the bucket,
+    ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` lower the rate so the
+    remaining quota lasts until the reset, and a 429 without headers halves the
+    rate. The rate recovers gradually after successful responses.
+
+    Args:
+        rate (float): Maximum sustained requests (tokens) per second.
+        capacity (float | None): Burst size. Defaults to ``rate``, and at least 1.
+        costs (Mapping[Any, float] | None): Tokens per endpoint template, keyed
+            by template string or ``Endpoints`` member. Unlisted endpoints cost 1.
+        min_rate (float): Floor for the adaptive rate.
+
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        costs: Mapping[Any, float] | None = None,
+        min_rate: float = 0.1,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.costs = {getattr(endpoint, "value", endpoint): cost for endpoint, cost in (costs or {}).items()}
+        self._tokens = self.capacity
+        # Time at which ``_tokens`` is valid; may lie in the future while paused.
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, endpoint: str, cost: float | None) -> float:
+        """Take tokens for one request and return how long the caller must wait."""
+        if cost is None:
+            cost = self.costs.get(endpoint, 1.0)
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= cost
+            ready_at = self._updated + max(-self._tokens, 0.0) / self.rate
+            return max(ready_at - now, 0.0)
+
+    def acquire(self, endpoint: str = "", cost: float | None = None) -> float:
+        """Block the current thread until a request to ``endpoint`` may be sent.
+
+        Returns:
+            float: The number of seconds waited.
+
+        """
+        wait = self._reserve(endpoint, cost)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def async_acquire(self, endpoint: str = "", cost: float | None = None) -> float:
+        """Wait, without blocking the event loop, until a request may be sent.
+
+        Returns:
+            float: The number of seconds waited.
+
+        """
+        import asyncio
+
+        wait = self._reserve(endpoint, cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds``."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, time.monotonic() + seconds)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt the bucket to the rate limit information in a response.
+
+        Args:
+            status_code (int): The HTTP status code of the response.
+            headers (Mapping[str, str]): The response headers.
+
+        """
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            self.pause(retry_after)
+
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        if reset is not None and reset > _EPOCH_THRESHOLD:
+            reset -= time.time()
+
+        with self._lock:
+            if remaining is not None and reset is not None and reset > 0:
+                # Spread what is left of the quota evenly until it resets.
+                self.rate = min(self.max_rate, max(self.min_rate, remaining / reset))
+            elif status_code == 429:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif status_code < 400 and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+
+        if retry_after is None and remaining == 0 and reset is not None and reset > 0:
+            self.pause(reset)
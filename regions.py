@@ -0,0 +1,173 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, NamedTuple
+
+
+class Region(NamedTuple):
+    """A single entry of a ``RegionCatalog``."""
+
+    id: Any
+    name: str
+    parent_id: Any = None
+    country: str | None = None
+
+    def as_payload(self) -> dict[str, Any]:
+        """Return the region in the form expected by ``TaskPayload`` region lists."""
+        return {"id": self.id, "name": self.name}
+
+
+def _region_rows(response: Any) -> list[Mapping[str, Any]]:
+    """Extract the list of region records from a regions endpoint response."""
+    if isinstance(response, Mapping):
+        for key in ("regions", "data", "results"):
+            if isinstance(response.get(key), list):
+                return response[key]
+        raise ValueError("Could not find a list of regions in the response")
+    return list(response)
+
+
+class RegionCatalog:
+    """Indexed, read-only view of the regions returned by the API.
+
+    Regions are stored column by column, and lookups go through prebuilt
+    indexes: by ID and exact name in O(1), by case-insensitive name prefix in
+    O(log n) plus the number of matches, and by parent or country in O(1).
+    Build it once per region list and reuse it for every payload.
+
+    Args:
+        regions (Iterable[Mapping[str, Any]]): Region records as returned by the API.
+        id_field (str): Name of the field holding the region ID.
+        name_field (str): Name of the field holding the region name.
+        parent_field (str): Name of the field holding the parent region ID.
+        country_field (str): Name of the field holding the country code.
+
+    """
+
+    def __init__(
+        self,
+        regions: Iterable[Mapping[str, Any]],
+        id_field: str = "id",
+        name_field: str = "name",
+        parent_field: str = "parent_id",
+        country_field: str = "country_code",
+    ) -> None:
+        self._ids: list[Any] = []
+        self._names: list[str] = []
+        self._parents: list[Any] = []
+        self._countries: list[str | None] = []
+        self._by_id: dict[Any, int] = {}
+        self._by_name: dict[str, array] = {}
+        self._by_parent: dict[Any, array] = {}
+        self._by_country: dict[str, array] = {}
+
+        for row, record in enumerate(regions):
+            region_id = record[id_field]
+            name = str(record.get(name_field, ""))
+            parent = record.get(parent_field)
+            country = record.get(country_field)
+            self._ids.append(region_id)
+            self._names.append(name)
+            self._parents.append(parent)
+            self._countries.append(country)
+            self._by_id[region_id] = row
+            self._by_name.setdefault(name.casefold(), array("l")).append(row)
+            if parent is not None:
+                self._by_parent.setdefault(parent, array("l")).append(row)
+            if country is not None:
+                self._by_country.setdefault(country.casefold(), array("l")).append(row)
+
+        order = sorted(range(len(self._names)), key=lambda row: self._names[row].casefold())
+        self._sorted_rows = array("l", order)
+        self._sorted_names = [self._names[row].casefold() for row in order]
+
+    @classmethod
+    def from_response(cls, response: Any, **fields: str) -> "RegionCatalog":
+        """Build a catalog from a ``list_google_regions``/``list_yandex_regions`` response.
+
+        Args:
+            response (Any): The API response, either a list of regions or an object holding one.
+            **fields (str): Field name overrides passed to the constructor.
+
+        Returns:
+            RegionCatalog: The indexed catalog.
+
+        """
+        return cls(_region_rows(response), **fields)
+
+    def _region(self, row: int) -> Region:
+        return Region(self._ids[row], self._names[row], self._parents[row], self._countries[row])
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, region_id: Any) -> bool:
+        return region_id in self._by_id
+
+    def __iter__(self) -> Iterator[Region]:
+        return (self._region(row) for row in range(len(self._ids)))
+
+    def get(self, region_id: Any) -> Region | None:
+        """Return the region with the given ID, or None."""
+        row = self._by_id.get(region_id)
+        return None if row is None else self._region(row)
+
+    def by_name(self, name: str, country: str | None = None) -> list[Region]:
+        """Return every region whose name matches ``name``, ignoring case.
+
+        Args:
+            name (str): The region name.
+            country (str | None): Only return regions in this country.
+
+        Returns:
+            list[Region]: Matching regions in catalog order.
+
+        """
+        rows = self._by_name.get(name.casefold(), ())
+        regions = [self._region(row) for row in rows]
+        if country is not None:
+            country = country.casefold()
+            regions = [r for r in regions if r.country is not None and r.country.casefold() == country]
+        return regions
+
+    def search(self, prefix: str, limit: int | None = None) -> list[Region]:
+        """Return regions whose name starts with ``prefix``, ignoring case, sorted by name."""
+        prefix = prefix.casefold()
+        start = bisect_left(self._sorted_names, prefix)
+        matches = []
+        for index in range(start, len(self._sorted_names)):
+            if not self._sorted_names[index].startswith(prefix) or (limit is not None and len(matches) >= limit):
+                break
+            matches.append(self._region(self._sorted_rows[index]))
+        return matches
+
+    def children(self, region_id: Any) -> list[Region]:
+        """Return the regions whose parent is ``region_id``."""
+        return [self._region(row) for row in self._by_parent.get(region_id, ())]
+
+    def in_country(self, country: str) -> list[Region]:
+        """Return every region of a country."""
+        return [self._region(row) for row in self._by_country.get(country.casefold(), ())]
+
+    def resolve(self, names: Iterable[str], country: str | None = None, strict: bool = False) -> list[Region | None]:
+        """Resolve many region names in one call.
+
+        Each name maps to the first region with that exact (case-insensitive)
+        name, so thousands of names resolve in linear time.
+
+        Args:
+            names (Iterable[str]): The region names to resolve.
+            country (str | None): Only consider regions in this country.
+            strict (bool): Raise ``KeyError`` for unknown names instead of returning None.
+
+        Returns:
+            list[Region | None]: One entry per name, in input order.
+
+        """
+        resolved: list[Region | None] = []
+        for name in names:
+            matches = self.by_name(name, country)
+            if not matches and strict:
+                raise KeyError(f"Unknown region: {name!r}")
+            resolved.append(matches[0] if matches else None)
+        return resolved
@@ -0,0 +1,362 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .cache import default_cache_dir, upgrade_schema
+from .export import flatten_row, row_field
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the table layout changes, and add a migration from the previous version.
+RESULTS_SCHEMA_VERSION = 1
+
+# Statements that upgrade a database from the version of their key to the next one.
+_MIGRATIONS: dict[int, tuple[str, ...]] = {}
+
+# Rows written per transaction while results stream through the store.
+DEFAULT_BATCH_SIZE = 5000
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS results ("
+    "task_id TEXT NOT NULL, keyword TEXT NOT NULL, region TEXT NOT NULL, engine TEXT NOT NULL, date TEXT NOT NULL, "
+    "position, url TEXT, data TEXT NOT NULL, "
+    "PRIMARY KEY (task_id, keyword, region, engine, date)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS results_by_keyword ON results (keyword, region, engine, date)",
+)
+
+_UPSERT = (
+    "INSERT INTO results (task_id, keyword, region, engine, date, position, url, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (task_id, keyword, region, engine, date) DO UPDATE SET "
+    "position = excluded.position, url = excluded.url, data = excluded.data"
+)
+
+
+class RankPoint(NamedTuple):
+    """The position of a keyword on one date."""
+
+    task_id: str
+    keyword: str
+    region: str
+    engine: str
+    date: str
+    position: Any
+    url: str | None
+
+
+@dataclass
+class RankTrend:
+    """Summary of the positions of a keyword over a period.
+
+    Attributes:
+        points (int): Number of observations.
+        first (Any): Position at the earliest observation.
+        last (Any): Position at the latest observation.
+        best (Any): Lowest (best) position.
+        worst (Any): Highest (worst) position.
+        average (float | None): Mean position.
+
+    """
+
+    points: int
+    first: Any = None
+    last: Any = None
+    best: Any = None
+    worst: Any = None
+    average: float | None = None
+
+    @property
+    def change(self) -> Any:
+        """Places gained over the period; positive means the keyword moved up."""
+        if self.first is None or self.last is None:
+            return None
+        return self.first - self.last
+
+
+def result_rows(response: Any, key: str | None = None) -> list[Any]:
+    """Extract the result rows from a task results response.
+
+    Args:
+        response (Any): The parsed response.
+        key (str | None): Member holding the rows. Defaults to the first array.
+
+    """
+    if isinstance(response, list):
+        return response
+    if isinstance(response, Mapping):
+        if key is not None:
+            return response.get(key) or []
+        for value in response.values():
+            if isinstance(value, list):
+                return value
+    return []
+
+
+class ResultsStore:
+    """Local SQLite database of task results for offline history and trend queries.
+
+    Rows are keyed by task, keyword, region, engine and date, so fetching the
+    same results again updates them in place. A second index on keyword,
+    region, engine and date serves lookups across tasks. Pass the store to a
+    client as ``results_store`` to fill it whenever results are fetched, or call
+    ``upsert`` directly.
+
+    Args:
+        path (str | os.PathLike[str] | None): Database file, or ``":memory:"``.
+            Defaults to ``results.sqlite3`` in the user cache directory.
+        batch_size (int): Rows written per transaction while results stream in.
+
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if path is None:
+            path = default_cache_dir() / "results.sqlite3"
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Serve reads from a memory map of the file rather than copying pages into SQLite's cache.
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        upgrade_schema(self._conn, path, RESULTS_SCHEMA_VERSION, _MIGRATIONS, "results")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    @staticmethod
+    def _records(task_id: str, row: Any) -> Iterator[tuple[Any, ...] | None]:
+        """Yield the record of every entry of ``row``, or None for an entry without a keyword or date."""
+        if not isinstance(row, Mapping):
+            yield None
+            return
+        for leaf, context in flatten_row(row):
+            keyword = row_field(leaf, context, "keyword")
+            day = row_field(leaf, context, "date")
+            if keyword is None or day is None:
+                yield None
+                continue
+            yield (
+                task_id,
+                str(keyword),
+                str(row_field(leaf, context, "region") or ""),
+                str(row_field(leaf, context, "engine") or ""),
+                str(day),
+                row_field(leaf, context, "position"),
+                row_field(leaf, context, "url"),
+                # Entries of a nested list keep the keyword, region and date of their parent row.
+                dumps({**context, **leaf} if context else leaf).decode(),
+            )
+
+    def upsert(self, task_id: str, rows: Iterable[Any]) -> int:
+        """Insert or update result rows of a task in a single transaction.
+
+        Nested per-date position lists are stored as one row per entry and
+        alternative field names are recognized, as in ``ResultColumns``. Rows
+        without a keyword or date cannot be indexed; they are skipped, counted
+        in ``skipped`` and logged.
+
+        Args:
+            task_id (str): The task the rows belong to.
+            rows (Iterable[Any]): Result rows as returned by the API.
+
+        Returns:
+            int: The number of rows written.
+
+        """
+        records, skipped = [], 0
+        for row in rows:
+            for record in self._records(str(task_id), row):
+                if record is None:
+                    skipped += 1
+                else:
+                    records.append(record)
+        if skipped:
+            with self._lock:
+                self.skipped += skipped
+            logger.warning("Skipped %d result rows of task %s without a keyword or date", skipped, task_id)
+        if not records:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_UPSERT, records)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(records)
+
+    async def async_upsert(self, task_id: str, rows: Iterable[Any]) -> int:
+        """Asynchronous version of ``upsert``, run in a worker thread so the event loop is not blocked."""
+        import asyncio
+
+        return await asyncio.to_thread(self.upsert, task_id, list(rows))
+
+    def tee(self, task_id: str, rows: Iterable[Any]) -> Iterator[Any]:
+        """Yield ``rows`` unchanged while storing them in batches.
+
+        Every row handed to the consumer is stored, also when it stops early.
+        """
+        batch = []
+        try:
+            for row in rows:
+                batch.append(row)
+                yield row
+                if len(batch) >= self.batch_size:
+                    batch, full = [], batch
+                    self.upsert(task_id, full)
+        finally:
+            if batch:
+                self.upsert(task_id, batch)
+
+    async def async_tee(self, task_id: str, rows: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """Asynchronous version of ``tee``."""
+        batch = []
+        try:
+            async for row in rows:
+                batch.append(row)
+                yield row
+                if len(batch) >= self.batch_size:
+                    batch, full = [], batch
+                    await self.async_upsert(task_id, full)
+        finally:
+            if batch:
+                await self.async_upsert(task_id, batch)
+
+    def _select(self, sql: str, args: Iterable[Any]) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(args)).fetchall()
+
+    @staticmethod
+    def _where(
+        keyword: str,
+        region: Any,
+        engine: str | None,
+        task_id: str | None,
+        since: str | date | None,
+        until: str | date | None,
+        days: int | None,
+    ) -> tuple[str, list[Any]]:
+        if days is not None:
+            since = date.today() - timedelta(days=days)
+        clauses, args = ["keyword = ?"], [keyword]
+        for column, value in (("region", region), ("engine", engine), ("task_id", task_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(str(value))
+        if since is not None:
+            clauses.append("date >= ?")
+            args.append(str(since))
+        if until is not None:
+            clauses.append("date <= ?")
+            args.append(str(until))
+        return " AND ".join(clauses), args
+
+    def history(
+        self,
+        keyword: str,
+        region: Any = None,
+        engine: str | None = None,
+        *,
+        task_id: str | None = None,
+        since: str | date | None = None,
+        until: str | date | None = None,
+        days: int | None = None,
+    ) -> list[RankPoint]:
+        """Return the stored positions of a keyword, oldest first.
+
+        Args:
+            keyword (str): The keyword.
+            region (Any): Only this region, if given.
+            engine (str | None): Only this search engine, if given.
+            task_id (str | None): Only rows of this task, if given.
+            since (str | date | None): First ISO date to include.
+            until (str | date | None): Last ISO date to include.
+            days (int | None): Only the last ``days`` days up to today; overrides ``since``.
+
+        Returns:
+            list[RankPoint]: One point per task, region, engine and date.
+
+        """
+        where, args = self._where(keyword, region, engine, task_id, since, until, days)
+        rows = self._select(
+            f"SELECT task_id, keyword, region, engine, date, position, url FROM results WHERE {where} "
+            "ORDER BY date, task_id, region, engine",
+            args,
+        )
+        return [RankPoint(*row) for row in rows]
+
+    def trend(
+        self,
+        keyword: str,
+        region: Any = None,
+        engine: str | None = None,
+        *,
+        task_id: str | None = None,
+        since: str | date | None = None,
+        until: str | date | None = None,
+        days: int | None = None,
+    ) -> RankTrend:
+        """Summarize the positions of a keyword over a period.
+
+        Takes the same filters as ``history``. Rows without a numeric position
+        are ignored.
+        """
+        where, args = self._where(keyword, region, engine, task_id, since, until, days)
+        where += " AND typeof(position) IN ('integer', 'real')"
+        points, best, worst, average = self._select(
+            f"SELECT count(*), min(position), max(position), avg(position) FROM results WHERE {where}", args
+        )[0]
+        if not points:
+            return RankTrend(0)
+        first = self._select(f"SELECT position FROM results WHERE {where} ORDER BY date LIMIT 1", args)[0][0]
+        last = self._select(f"SELECT position FROM results WHERE {where} ORDER BY date DESC LIMIT 1", args)[0][0]
+        return RankTrend(points, first, last, best, worst, average)
+
+    def latest(self, task_id: str) -> list[dict[str, Any]]:
+        """Return the full rows of the most recent date stored for a task."""
+        rows = self._select(
+            "SELECT data FROM results WHERE task_id = ? AND date = "
+            "(SELECT max(date) FROM results WHERE task_id = ?) ORDER BY keyword, region, engine",
+            (str(task_id), str(task_id)),
+        )
+        return [loads(row[0]) for row in rows]
+
+    def rows(self, task_id: str) -> Iterator[dict[str, Any]]:
+        """Yield every stored row of a task as returned by the API."""
+        for (data,) in self._select(
+            "SELECT data FROM results WHERE task_id = ? ORDER BY date, keyword, region, engine", (str(task_id),)
+        ):
+            yield loads(data)
+
+    def keywords(self, task_id: str | None = None) -> list[str]:
+        """Return the distinct keywords stored, optionally for one task."""
+        if task_id is None:
+            rows = self._select("SELECT DISTINCT keyword FROM results ORDER BY keyword", ())
+        else:
+            rows = self._select(
+                "SELECT DISTINCT keyword FROM results WHERE task_id = ? ORDER BY keyword", (str(task_id),)
+            )
+        return [row[0] for row in rows]
+
+    def delete(self, task_id: str) -> None:
+        """Remove every row of a task."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE task_id = ?", (str(task_id),))
+
+    def __len__(self) -> int:
+        return self._select("SELECT count(*) FROM results", ())[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,238 @@
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+
+from .exceptions import CircuitOpenError, RateLimitExceededError
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Failures that guarantee the request never reached the server, so even a
+# non-idempotent POST can be sent again without creating a duplicate.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _is_outage(error: Exception) -> bool:
+    """Return True for failures that suggest the API itself is down."""
+    if isinstance(error, httpx.TransportError):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and status_code >= 500
+
+
+class CircuitBreaker:
+    """Stop sending requests after repeated outages and probe for recovery.
+
+    After ``failure_threshold`` consecutive network errors or 5xx responses the
+    breaker opens and every call fails immediately with ``CircuitOpenError``.
+    Once ``recovery_timeout`` seconds have passed a single trial request is let
+    through; its success closes the breaker, its failure opens it again. The
+    breaker is thread-safe and may be shared between clients.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        recovery_timeout (float): Seconds to wait before sending a trial request.
+
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return self.CLOSED
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self.OPEN
+
+    def allow(self) -> bool:
+        """Raise ``CircuitOpenError`` unless a request may be sent now.
+
+        Returns:
+            bool: True if the request is the trial of a half-open breaker.
+
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed >= self.recovery_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            raise CircuitOpenError(retry_in=max(self.recovery_timeout - elapsed, 0.0))
+
+    def release_trial(self) -> None:
+        """Let another trial through after one ended without an outcome, e.g. when it was cancelled."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Exception) -> None:
+        if not _is_outage(error):
+            # The API answered, so it is up even if the request was rejected.
+            self.record_success()
+            return
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how often failed requests are retried.
+
+    Network errors and the statuses in ``retry_statuses`` are retried with
+    decorrelated jitter between ``base_delay`` and ``max_delay``; a 429 waits
+    for its ``Retry-After`` instead. Non-idempotent requests, such as the POST
+    that creates a task, are only retried when the failure proves the request
+    never reached the server, unless ``retry_non_idempotent`` is set.
+
+    Attributes:
+        max_attempts (int): Total attempts, including the first one.
+        deadline (float | None): Give up once this many seconds have passed since the first attempt.
+        base_delay (float): Smallest delay between attempts.
+        max_delay (float): Largest delay between attempts.
+        retry_statuses (frozenset[int]): HTTP statuses that are retried.
+        retry_non_idempotent (bool): Also retry POST requests on any retryable failure.
+
+    """
+
+    max_attempts: int = 3
+    deadline: float | None = 30.0
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    retry_statuses: frozenset[int] = RETRYABLE_STATUSES
+    retry_non_idempotent: bool = False
+
+    def is_retryable(self, error: Exception, idempotent: bool) -> bool:
+        if isinstance(error, CircuitOpenError):
+            return False
+        if isinstance(error, _NOT_SENT_ERRORS) or isinstance(error, RateLimitExceededError):
+            return True
+        if not idempotent and not self.retry_non_idempotent:
+            return False
+        if isinstance(error, httpx.TransportError):
+            return True
+        return getattr(error, "status_code", None) in self.retry_statuses
+
+    def next_delay(self, error: Exception, attempt: int, elapsed: float, previous: float, idempotent: bool) -> float | None:
+        """Return the delay before the next attempt, or None to give up."""
+        if attempt >= self.max_attempts or not self.is_retryable(error, idempotent):
+            return None
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = min(self.max_delay, random.uniform(self.base_delay, max(previous * 3, self.base_delay)))
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+    def call(
+        self,
+        func: Callable[[], T],
+        idempotent: bool = True,
+        breaker: CircuitBreaker | None = None,
+        on_retry: Callable[[Exception, int, float], None] | None = None,
+    ) -> T:
+        """Call ``func`` and retry it according to this policy.
+
+        Args:
+            func (Callable[[], T]): The call to make.
+            idempotent (bool): Whether repeating the call is harmless.
+            breaker (CircuitBreaker | None): Breaker consulted before each attempt.
+            on_retry (Callable[[Exception, int, float], None] | None): Called with
+                the error, the failed attempt number and the delay before each retry.
+
+        """
+        start = time.monotonic()
+        previous = self.base_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = breaker is not None and breaker.allow()
+            try:
+                result = func()
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record_failure(e)
+                delay = self.next_delay(e, attempt, time.monotonic() - start, previous, idempotent)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(e, attempt, delay)
+                previous = delay
+                time.sleep(delay)
+            except BaseException:
+                if trial:
+                    # Cancelled or interrupted: the trial says nothing about the API.
+                    breaker.release_trial()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+
+    async def async_call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        idempotent: bool = True,
+        breaker: CircuitBreaker | None = None,
+        on_retry: Callable[[Exception, int, float], None] | None = None,
+    ) -> T:
+        """Asynchronous version of ``call``."""
+        import asyncio
+
+        start = time.monotonic()
+        previous = self.base_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = breaker is not None and breaker.allow()
+            try:
+                result = await func()
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record_failure(e)
+                delay = self.next_delay(e, attempt, time.monotonic() - start, previous, idempotent)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(e, attempt, delay)
+                previous = delay
+                await asyncio.sleep(delay)
+            except BaseException:
+                if trial:
+                    breaker.release_trial()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
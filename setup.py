@@ -14,7 +14,8 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=[
-        "requests",
+        "httpx>=0.28.1",
+        "pydantic>=2.0",
     ],
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,161 @@
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .batch import BatchResult
+
+# Keywords per shard when no size is given; large enough to keep the number of
+# tasks low, small enough for the API to process and return each one quickly.
+DEFAULT_SHARD_SIZE = 1000
+
+_REGION_FIELDS = ("google_regions", "yandex_regions")
+
+
+def task_id_of(response: Any) -> str | None:
+    """Return the task ID from a ``create_task`` response, or None."""
+    if isinstance(response, Mapping):
+        for key in ("task_id", "taskId", "id"):
+            if response.get(key) is not None:
+                return str(response[key])
+    return None
+
+
+def split_task(
+    payload: Mapping[str, Any],
+    shard_size: int | None = DEFAULT_SHARD_SIZE,
+    by_region: bool = False,
+) -> list[dict[str, Any]]:
+    """Split one task payload into several smaller ones.
+
+    Keywords are cut into consecutive chunks of ``shard_size``. With
+    ``by_region`` every Google and Yandex region additionally gets shards of its
+    own, so each task covers a single region. Every other field is copied to
+    all shards, and shard names get an ``[i/n]`` suffix.
+
+    Args:
+        payload (Mapping[str, Any]): The keyword arguments of a ``TaskPayload``.
+        shard_size (int | None): Maximum keywords per shard; None keeps them together.
+        by_region (bool): Create separate shards for every region.
+
+    Returns:
+        list[dict[str, Any]]: The shard payloads, in keyword and region order.
+
+    """
+    if shard_size is not None and shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+
+    groups: list[dict[str, Any]] = [dict(payload)]
+    if by_region:
+        groups = [
+            {**payload, **{other: [] for other in _REGION_FIELDS}, region_field: [region]}
+            for region_field in _REGION_FIELDS
+            for region in payload.get(region_field) or ()
+        ] or groups
+
+    keywords = list(payload.get("keywords") or ())
+    size = shard_size or max(len(keywords), 1)
+    chunks = [keywords[start : start + size] for start in range(0, len(keywords), size)] or [[]]
+
+    shards = [{**group, "keywords": chunk} for group in groups for chunk in chunks]
+    if len(shards) > 1:
+        for number, shard in enumerate(shards, 1):
+            shard["name"] = f"{payload['name']} [{number}/{len(shards)}]"
+    return shards
+
+
+@dataclass
+class Shard:
+    """One task of a ``ShardedJob``.
+
+    Attributes:
+        index (int): Position of the shard within the job.
+        payload (dict[str, Any]): The keyword arguments the task is created with.
+        task_id (str | None): The ID of the created task, once submitted.
+        error (Exception | None): Why the last submission failed, if it did.
+
+    """
+
+    index: int
+    payload: dict[str, Any]
+    task_id: str | None = None
+    error: Exception | None = None
+
+    @property
+    def submitted(self) -> bool:
+        return self.task_id is not None
+
+
+@dataclass
+class ShardedJob:
+    """A large task split into several API tasks that are tracked together.
+
+    Attributes:
+        name (str): The name of the original task.
+        shards (list[Shard]): The shards, in the order their results are merged.
+
+    """
+
+    name: str
+    shards: list[Shard] = field(default_factory=list)
+
+    @classmethod
+    def split(
+        cls,
+        payload: Mapping[str, Any],
+        shard_size: int | None = DEFAULT_SHARD_SIZE,
+        by_region: bool = False,
+    ) -> "ShardedJob":
+        """Create an unsubmitted job from a task payload; see ``split_task``."""
+        shards = split_task(payload, shard_size, by_region)
+        return cls(payload["name"], [Shard(index, shard) for index, shard in enumerate(shards)])
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    @property
+    def task_ids(self) -> list[str]:
+        """IDs of the submitted shards, in shard order."""
+        return [shard.task_id for shard in self.shards if shard.task_id is not None]
+
+    @property
+    def pending(self) -> list[Shard]:
+        """Shards that still have to be submitted, including failed ones."""
+        return [shard for shard in self.shards if shard.task_id is None]
+
+    @property
+    def failed(self) -> list[Shard]:
+        """Shards whose last submission failed."""
+        return [shard for shard in self.shards if shard.error is not None]
+
+    @property
+    def complete(self) -> bool:
+        """True once every shard has been submitted."""
+        return not self.pending
+
+    def require_complete(self) -> None:
+        """Raise ``ValueError`` unless every shard has been submitted."""
+        if not self.complete:
+            raise ValueError(f"{len(self.pending)} of {len(self.shards)} shards of {self.name!r} were not submitted")
+
+    def shard_for(self, task_id: str) -> Shard | None:
+        """Return the shard that created the task ``task_id``, or None."""
+        return next((shard for shard in self.shards if shard.task_id == task_id), None)
+
+    def reset(self, task_ids: Iterable[str]) -> None:
+        """Mark the shards of ``task_ids`` for resubmission, e.g. after the tasks failed."""
+        task_ids = set(task_ids)
+        for shard in self.shards:
+            if shard.task_id in task_ids:
+                shard.task_id = None
+                shard.error = None
+
+    def record(self, shards: list[Shard], results: list[BatchResult[dict[str, Any]]]) -> None:
+        """Store the outcome of submitting ``shards`` with ``create_tasks``."""
+        for shard, result in zip(shards, results):
+            if result.ok:
+                shard.task_id = task_id_of(result.value)
+                shard.error = None if shard.task_id is not None else ValueError(
+                    f"No task ID in create_task response: {result.value!r}"
+                )
+            else:
+                shard.error = result.error
@@ -0,0 +1,154 @@
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that may follow a complete value: separators, closing brackets and the colon after a key.
+_DELIMITERS = ",]}:"
+
+
+class JSONArrayParser:
+    """Incrementally extract the items of a JSON array from a stream of bytes.
+
+    The parser accepts either a top-level array or an object holding the array
+    under ``key``. When ``key`` is ``None`` the first array-valued member of the
+    object is used. Only the current item is ever held in memory, so result
+    payloads of any size can be processed with a flat memory profile.
+
+    Example:
+        >>> parser = JSONArrayParser(key="results")
+        >>> parser.feed(b'{"results": [{"keyword": "a"}, {"key')
+        [{'keyword': 'a'}]
+        >>> parser.feed(b'word": "b"}]}')
+        [{'keyword': 'b'}]
+
+    """
+
+    def __init__(self, key: str | None = None) -> None:
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = "start"
+        self._items_seen = 0
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Consume a chunk of the response body and return the items it completed."""
+        self._buffer += self._text.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> list[Any]:
+        """Flush the remaining input and verify that the array was complete."""
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._drain(final=True)
+        if self._state not in ("done", "trailer"):
+            raise json.JSONDecodeError("Unexpected end of JSON results stream", self._buffer, len(self._buffer))
+        return items
+
+    def _skip(self, pos: int) -> int:
+        buffer = self._buffer
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def _decode(self, pos: int, final: bool) -> tuple[Any, int] | None:
+        """Decode one value at ``pos``; return None if it may still be incomplete."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        if final:
+            return value, end
+        # A number cut by a chunk boundary decodes as a shorter number ("12" from "12." or "1e"),
+        # so a value only counts once the delimiter that follows it has arrived.
+        after = self._skip(end)
+        if after == len(self._buffer) or self._buffer[after] not in _DELIMITERS:
+            return None
+        return value, end
+
+    def _drain(self, final: bool) -> list[Any]:
+        items: list[Any] = []
+        pos = 0
+        buffer = self._buffer
+        while True:
+            pos = self._skip(pos)
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == "start":
+                if char == "[":
+                    self._state = "item"
+                elif char == "{":
+                    self._state = "member"
+                else:
+                    raise json.JSONDecodeError("Expected a JSON array or object", buffer, pos)
+                pos += 1
+            elif self._state == "member":
+                if char == "}":
+                    self._state = "done"
+                    pos += 1
+                    continue
+                if char == ",":
+                    pos += 1
+                    continue
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                name, after_name = decoded
+                colon = self._skip(after_name)
+                if colon >= len(buffer):
+                    break
+                if buffer[colon] != ":":
+                    raise json.JSONDecodeError("Expected ':' after object key", buffer, colon)
+                value_start = self._skip(colon + 1)
+                if value_start >= len(buffer):
+                    break
+                if (name == self.key or self.key is None) and buffer[value_start] == "[":
+                    self._state = "item"
+                    pos = value_start + 1
+                    continue
+                decoded = self._decode(value_start, final)
+                if decoded is None:
+                    break
+                pos = decoded[1]
+            elif self._state == "item":
+                if char == "]":
+                    self._state = "trailer"
+                    pos += 1
+                    continue
+                if char == "," and self._items_seen:
+                    pos += 1
+                    continue
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    break
+                item, pos = decoded
+                items.append(item)
+                self._items_seen += 1
+            else:
+                # Anything after the array is irrelevant to the rows being streamed.
+                pos = len(buffer)
+        self._buffer = buffer[pos:]
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str | None = None) -> Iterator[Any]:
+    """Yield the items of a JSON array read from an iterable of byte chunks."""
+    parser = JSONArrayParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes], key: str | None = None) -> AsyncIterator[Any]:
+    """Asynchronously yield the items of a JSON array read from byte chunks."""
+    parser = JSONArrayParser(key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
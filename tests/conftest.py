@@ -0,0 +1,17 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+# The repository root is the package itself; load it under its import name so
+# tests can exercise the relative imports the way an installed copy would.
+ROOT = Path(__file__).resolve().parent.parent
+
+if "rush_analytics" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "rush_analytics",
+        ROOT / "__init__.py",
+        submodule_search_locations=[str(ROOT)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["rush_analytics"] = module
+    spec.loader.exec_module(module)
@@ -0,0 +1,109 @@
+import asyncio
+import inspect
+import time
+import unittest
+from typing import Any
+
+import httpx
+
+from rush_analytics import NO_RETRY, AsyncRushAnalyticsAPI, ResultsStore, RushAnalyticsAPI, Transport
+
+LATENCY = 0.05
+
+
+class SlowAPI:
+    """Async fake API that answers every request after ``LATENCY`` seconds."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(LATENCY)
+        finally:
+            self.in_flight -= 1
+        path = request.url.path.removeprefix("/api/")
+        if request.method == "POST":
+            return httpx.Response(200, json={"task_id": "1"})
+        if path.startswith("tasks/") and path.endswith("/results"):
+            return httpx.Response(200, json={"results": [{"keyword": "shoes", "date": "2024-05-01", "position": 3}]})
+        if path.startswith("tasks/"):
+            return httpx.Response(200, json={"task_id": path.split("/")[1], "status": "completed"})
+        return httpx.Response(200, json={"regions": [{"id": 1, "name": "Moscow"}]})
+
+    def client(self, **kwargs: Any) -> AsyncRushAnalyticsAPI:
+        transport = Transport(async_http_transport=httpx.MockTransport(self.handler))
+        return AsyncRushAnalyticsAPI(api_key="test_api_key", transport=transport, retry_policy=NO_RETRY, **kwargs)
+
+
+class TestAsyncEngine(unittest.TestCase):
+    def test_same_methods_as_sync_client(self) -> None:
+        """Every public I/O method of the sync client is a coroutine or async iterator on the async client."""
+        for name, method in inspect.getmembers(RushAnalyticsAPI, inspect.isfunction):
+            if name.startswith("_") or name in ("cache_stats", "clear_cache"):
+                continue
+            with self.subTest(name):
+                async_method = getattr(AsyncRushAnalyticsAPI, name)
+                self.assertTrue(
+                    inspect.iscoroutinefunction(async_method)
+                    or inspect.isasyncgenfunction(async_method)
+                    or "AsyncIterator" in str(inspect.signature(async_method).return_annotation),
+                    name,
+                )
+
+    def test_concurrent_calls_share_the_loop(self) -> None:
+        """Hundreds of concurrent requests finish in about one round trip."""
+        fake = SlowAPI()
+
+        async def run() -> list[dict[str, Any]]:
+            async with fake.client(coalesce_requests=False) as api_client:
+                return await asyncio.gather(*(api_client.get_task_status(str(i)) for i in range(200)))
+
+        start = time.perf_counter()
+        statuses = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        self.assertEqual([status["task_id"] for status in statuses], [str(i) for i in range(200)])
+        self.assertGreater(fake.peak, 50)
+        self.assertLess(elapsed, 40 * LATENCY)
+
+    def test_sync_names_await_the_async_engine(self) -> None:
+        fake = SlowAPI()
+        store = ResultsStore(":memory:")
+        self.addCleanup(store.close)
+
+        async def run() -> None:
+            async with fake.client(results_store=store) as api_client:
+                created = await api_client.create_task(name="Task", url="https://example.com", keywords=["shoes"])
+                self.assertEqual(created["task_id"], "1")
+                await api_client.get_task_results("1")
+                rows = [row async for row in api_client.iter_task_results("2", key="results")]
+                self.assertEqual(rows[0]["position"], 3)
+                catalog = await api_client.google_region_catalog()
+                self.assertEqual(len(catalog), 1)
+                self.assertEqual(await api_client.get_data("tasks/3"), {"task_id": "3", "status": "completed"})
+                statuses = await api_client.get_task_statuses(["4", "5"])
+                self.assertEqual([result.value["task_id"] for result in statuses], ["4", "5"])
+                streamed = [result.index async for result in api_client.iter_task_results_many(["6", "7"])]
+                self.assertEqual(sorted(streamed), [0, 1])
+
+        asyncio.run(run())
+        self.assertEqual(store.keywords("1"), ["shoes"])
+        self.assertEqual(store.keywords("2"), ["shoes"])
+
+    def test_async_with_closes_owned_pool(self) -> None:
+        async def run() -> AsyncRushAnalyticsAPI:
+            async with AsyncRushAnalyticsAPI(api_key="test_api_key") as api_client:
+                pass
+            return api_client
+
+        self.assertTrue(asyncio.run(run()).client.is_closed)
+        with self.assertRaises(TypeError):
+            with AsyncRushAnalyticsAPI(api_key="test_api_key"):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,71 +1,82 @@
+import asyncio
+import json
 import unittest
-from unittest.mock import AsyncMock, patch
-
-from endpoints import AsyncRushAnalyticsAPI
-
-
-@patch("httpx.AsyncClient.get")
-async def test_async_get_data(mock_get: AsyncMock):
-    mock_response = AsyncMock()
-    mock_response.json.return_value = {"success": True}
-    mock_response.raise_for_status = AsyncMock()
-    mock_get.return_value = mock_response
-
-    api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
-    response = await api_client.get_data("test_endpoint", {"param": "value"})
-
-    assert response == {"success": True}
-    mock_get.assert_called_once_with(
-        "https://rush-analytics.com/api/test_endpoint",
-        headers={
-            "Authorization": "Bearer test_api_key",
-            "Content-Type": "application/json",
-        },
-        params={"param": "value"},
-        timeout=10,
-    )
-
-@patch("httpx.AsyncClient.post")
-async def test_async_post_data(mock_post: AsyncMock):
-    mock_response = AsyncMock()
-    mock_response.json.return_value = {"success": True}
-    mock_response.raise_for_status = AsyncMock()
-    mock_post.return_value = mock_response
-
-    api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
-    response = await api_client.async_post_data("test_endpoint", {"key": "value"})
-
-    assert response == {"success": True}
-    mock_post.assert_called_once_with(
-        "https://rush-analytics.com/api/test_endpoint",
-        headers={
-            "Authorization": "Bearer test_api_key",
-            "Content-Type": "application/json",
-        },
-        json={"key": "value"},
-        timeout=10,
-    )
-
-@patch("httpx.AsyncClient.get")
-async def test_async_invalid_api_key_error(mock_get: AsyncMock):
-    """Test that InvalidAPIKeyError is raised for a 403 response in async_get_data."""
-    mock_response = AsyncMock()
-    mock_response.status_code = 403
-    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError("Forbidden", request=None, response=mock_response)
-    mock_get.return_value = mock_response
-
-    api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
-    with pytest.raises(InvalidAPIKeyError):
-        await api_client.async_get_data("test_endpoint")
-
-@patch("httpx.AsyncClient.get")
-async def test_async_rate_limit_exceeded_error(mock_get: AsyncMock):
-    """Test that RateLimitExceededError is raised for a 429 response in async_get_data."""
-    mock_response = AsyncMock()
-    mock_response.status_code = 429
-    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError("Rate Limit Exceeded", request=None, response=mock_response)
-    mock_get.return_value = mock_response
-
-    api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
-    with pytest.raises(RateLimitExceededError):
-        await api_client.async_get_data("test_endpoint")
+from typing import Any
+
+import httpx
+
+from rush_analytics import NO_RETRY, Transport
+from rush_analytics.endpoints import AsyncRushAnalyticsAPI, InvalidAPIKeyError, RateLimitExceededError
+
+
+class RecordingAPI:
+    """Async fake API that answers every request with one canned response and records the requests."""
+
+    def __init__(self, status_code: int = 200, body: dict[str, Any] | None = None) -> None:
+        self.status_code = status_code
+        self.body = body if body is not None else {"success": True}
+        self.requests: list[httpx.Request] = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        self.requests.append(request)
+        return httpx.Response(self.status_code, json=self.body)
+
+    def client(self) -> AsyncRushAnalyticsAPI:
+        transport = Transport(async_http_transport=httpx.MockTransport(self.handler))
+        return AsyncRushAnalyticsAPI(api_key="test_api_key", transport=transport, retry_policy=NO_RETRY)
+
+
+class TestAsyncRushAnalyticsAPI(unittest.TestCase):
+    def test_async_get_data(self) -> None:
+        fake = RecordingAPI()
+
+        async def run() -> dict[str, Any]:
+            async with fake.client() as api_client:
+                return await api_client.get_data("test_endpoint", {"param": "value"})
+
+        self.assertEqual(asyncio.run(run()), {"success": True})
+        [request] = fake.requests
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(str(request.url), "https://rush-analytics.com/api/test_endpoint?param=value")
+        self.assertEqual(request.headers["Authorization"], "Bearer test_api_key")
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+
+    def test_async_post_data(self) -> None:
+        fake = RecordingAPI()
+
+        async def run() -> dict[str, Any]:
+            async with fake.client() as api_client:
+                return await api_client.async_post_data("test_endpoint", {"key": "value"})
+
+        self.assertEqual(asyncio.run(run()), {"success": True})
+        [request] = fake.requests
+        self.assertEqual(request.method, "POST")
+        self.assertEqual(str(request.url), "https://rush-analytics.com/api/test_endpoint")
+        self.assertEqual(request.headers["Authorization"], "Bearer test_api_key")
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(request.content), {"key": "value"})
+
+    def test_async_invalid_api_key_error(self) -> None:
+        """Test that InvalidAPIKeyError is raised for a 403 response in async_get_data."""
+
+        async def run() -> None:
+            async with RecordingAPI(403).client() as api_client:
+                await api_client.async_get_data("test_endpoint")
+
+        with self.assertRaises(InvalidAPIKeyError):
+            asyncio.run(run())
+
+    def test_async_rate_limit_exceeded_error(self) -> None:
+        """Test that RateLimitExceededError is raised for a 429 response in async_get_data."""
+
+        async def run() -> None:
+            async with RecordingAPI(429).client() as api_client:
+                await api_client.async_get_data("test_endpoint")
+
+        with self.assertRaises(RateLimitExceededError):
+            asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
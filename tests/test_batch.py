@@ -0,0 +1,161 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from typing import Any
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, RushAnalyticsAPI
+from rush_analytics.exceptions import NotFoundError
+from rush_analytics.batch import aiter_bounded, gather_bounded, iter_bounded, map_bounded
+
+
+def _task_handler(request: httpx.Request) -> httpx.Response:
+    body: dict[str, Any] = json.loads(request.content)
+    if body["name"] == "fail":
+        return httpx.Response(500)
+    return httpx.Response(200, json={"task_id": body["name"]})
+
+
+VALID = {"name": "one", "url": "https://example.com", "keywords": [{"keyword": "test"}]}
+
+
+class TestBoundedHelpers(unittest.TestCase):
+    def test_map_bounded_preserves_order_and_errors(self) -> None:
+        """Results come back in input order with per-item errors."""
+
+        def func(value: int) -> int:
+            if value == 2:
+                raise ValueError("boom")
+            return value * 10
+
+        results = map_bounded(func, range(5), max_concurrency=3)
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual([r.value for r in results if r.ok], [0, 10, 30, 40])
+        self.assertIsInstance(results[2].error, ValueError)
+
+    def test_gather_bounded_limits_concurrency(self) -> None:
+        """No more than max_concurrency coroutines run at the same time."""
+        in_flight = 0
+        peak = 0
+
+        async def func(value: int) -> int:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return value
+
+        results = asyncio.run(gather_bounded(func, range(20), max_concurrency=4))
+        self.assertEqual([r.value for r in results], list(range(20)))
+        self.assertLessEqual(peak, 4)
+
+    def test_iter_bounded_yields_as_completed(self) -> None:
+        """Fast items come out first and only max_concurrency items are taken ahead."""
+        taken = 0
+
+        def items():
+            nonlocal taken
+            for value in (0.2, 0.0, 0.0, 0.0):
+                taken += 1
+                yield value
+
+        def func(delay: float) -> float:
+            time.sleep(delay)
+            return delay
+
+        results = iter_bounded(func, items(), max_concurrency=2)
+        first = next(results)
+        self.assertEqual(first.index, 1)
+        self.assertLessEqual(taken, 3)
+        self.assertEqual(sorted(r.index for r in [first, *results]), [0, 1, 2, 3])
+
+    def test_aiter_bounded_yields_as_completed(self) -> None:
+        async def func(delay: float) -> float:
+            await asyncio.sleep(delay)
+            if delay == 0.02:
+                raise ValueError("boom")
+            return delay
+
+        async def run() -> list:
+            return [r async for r in aiter_bounded(func, [0.05, 0.0, 0.02], max_concurrency=3)]
+
+        results = asyncio.run(run())
+        self.assertEqual([r.index for r in results], [1, 2, 0])
+        self.assertIsInstance(results[1].error, ValueError)
+
+    def test_invalid_concurrency(self) -> None:
+        with self.assertRaises(ValueError):
+            map_bounded(str, [1], max_concurrency=0)
+
+
+class TestCreateTasks(unittest.TestCase):
+    def test_sync_create_tasks(self) -> None:
+        """The sync client submits on a thread pool and isolates failures."""
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(_task_handler))
+
+        results = api_client.create_tasks(
+            [VALID, {**VALID, "name": "fail"}, {"name": "bad", "url": "not a url"}, {**VALID, "name": "two"}],
+            max_concurrency=2,
+        )
+        self.assertEqual(results[0].value, {"task_id": "one"})
+        self.assertIsNotNone(results[1].error)
+        self.assertIsNotNone(results[2].error)
+        self.assertEqual(results[3].value, {"task_id": "two"})
+
+    def test_sync_status_and_results_batches(self) -> None:
+        """Status and results batches run on worker threads over one shared client."""
+        threads: set[int] = set()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            threads.add(threading.get_ident())
+            task_id = request.url.path.split("/")[3]
+            if task_id == "missing":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"task_id": task_id, "status": "completed"})
+
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(handler))
+        task_ids = [str(i) for i in range(20)] + ["missing"]
+
+        statuses = api_client.get_task_statuses(task_ids, max_concurrency=4)
+        self.assertEqual([r.value["task_id"] for r in statuses[:-1]], task_ids[:-1])
+        self.assertIsInstance(statuses[-1].error, NotFoundError)
+        self.assertGreater(len(threads), 1)
+
+        results = list(api_client.iter_task_results_many(task_ids, max_concurrency=4))
+        self.assertEqual(sorted(r.index for r in results), list(range(21)))
+        self.assertEqual(sum(not r.ok for r in results), 1)
+        self.assertEqual(len(api_client.get_task_results_many(task_ids[:3])), 3)
+        self.assertEqual(len(list(api_client.iter_task_statuses(task_ids[:3]))), 3)
+
+    def test_async_create_tasks(self) -> None:
+        """The async client sends validated camelCase bodies over the AsyncClient."""
+        seen: list[dict[str, Any]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(json.loads(request.content))
+            return _task_handler(request)
+
+        async def run() -> list[Any]:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await api_client.create_tasks([VALID, {**VALID, "name": "fail"}], max_concurrency=5)
+            finally:
+                await api_client.close()
+
+        results = asyncio.run(run())
+        self.assertTrue(results[0].ok)
+        self.assertFalse(results[1].ok)
+        self.assertEqual(seen[0]["apikey"], "test_api_key")
+        self.assertEqual(seen[0]["keywords"], [{"keyword": "test"}])
+        self.assertIn("dataCollectionFrequency", seen[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
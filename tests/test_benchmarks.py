@@ -0,0 +1,93 @@
+import asyncio
+import io
+import json
+import logging
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import run  # noqa: E402
+from benchmarks.fake_api import FakeAPIConfig, FakeRushAnalytics  # noqa: E402
+
+from rush_analytics import AsyncRushAnalyticsAPI, RetryPolicy, RushAnalyticsAPI  # noqa: E402
+
+FAST_RETRY = RetryPolicy(max_attempts=10, base_delay=0, max_delay=0)
+
+
+class TestFakeAPI(unittest.TestCase):
+    def test_task_lifecycle(self) -> None:
+        fake = FakeRushAnalytics(FakeAPIConfig(result_rows=3, polls_until_complete=2))
+        with RushAnalyticsAPI(api_key="bench", transport=fake.transport()) as client:
+            task_id = client.create_task(name="Bench", url="https://example.com", keywords=["a"])["task_id"]
+            self.assertEqual(client.get_task_status(task_id)["status"], "pending")
+            self.assertEqual(client.get_task_status(task_id)["status"], "completed")
+            self.assertEqual(len(list(client.iter_task_results(task_id, key="results"))), 3)
+            self.assertEqual(client.list_languages(), {"languages": [{"code": "en", "name": "English"}]})
+
+        self.assertEqual(fake.requests["POST tasks"], 1)
+        self.assertEqual(fake.requests["GET tasks/{task_id}"], 2)
+        self.assertEqual(fake.requests["GET tasks/{task_id}/results"], 1)
+
+    def test_injected_faults_are_retried(self) -> None:
+        fake = FakeRushAnalytics(FakeAPIConfig(error_rate=0.2, rate_limit_rate=0.2, seed=1))
+
+        async def run_requests() -> list[dict]:
+            async with AsyncRushAnalyticsAPI(
+                api_key="bench", transport=fake.transport(), retry_policy=FAST_RETRY
+            ) as client:
+                return await asyncio.gather(*(client.async_get_task_status(str(i)) for i in range(20)))
+
+        statuses = asyncio.run(run_requests())
+        self.assertTrue(all(status["status"] == "completed" for status in statuses))
+        self.assertGreater(fake.requests["GET tasks/{task_id}"], 20)
+
+
+class TestRunner(unittest.TestCase):
+    def test_quick_report(self) -> None:
+        report = run.run(["polling", "payload"], quick=True)
+        self.assertEqual(report["schema"], run.REPORT_SCHEMA)
+        names = {result["name"] for result in report["results"]}
+        self.assertIn("polling.sync_polls_per_task", names)
+        self.assertIn("payload.build_columns", names)
+        self.assertFalse(any(name.startswith("throughput.") for name in names))
+        json.dumps(report)
+
+    def test_compare_respects_direction(self) -> None:
+        def report(seconds: float, rate: float) -> dict:
+            return {
+                "results": [
+                    {"name": "a.seconds", "value": seconds, "unit": "s", "higher_is_better": False, "params": {"n": 1}},
+                    {"name": "a.rate", "value": rate, "unit": "req/s", "higher_is_better": True, "params": {"n": 1}},
+                ]
+            }
+
+        baseline = report(1.0, 100.0)
+        self.assertEqual(run.compare(report(1.1, 90.0), baseline, 0.2), [])
+        self.assertEqual(run.compare(report(0.5, 200.0), baseline, 0.2), [])
+        regressions = run.compare(report(1.5, 50.0), baseline, 0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a.seconds"))
+
+    def test_main_exit_status(self) -> None:
+        self.addCleanup(logging.disable, logging.NOTSET)
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "report.json"
+            self.assertEqual(run.main(["payload", "--quick", "--output", str(output)]), 0)
+            report = json.loads(output.read_text())
+
+            for result in report["results"]:
+                result["value"] /= 100
+            baseline = Path(directory) / "baseline.json"
+            baseline.write_text(json.dumps(report))
+            with redirect_stderr(io.StringIO()) as stderr:
+                status = run.main(["payload", "--quick", "--output", str(output), "--baseline", str(baseline)])
+            self.assertEqual(status, 1)
+            self.assertIn("REGRESSION payload.build_dicts", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, Endpoints, RushAnalyticsAPI
+from rush_analytics.cache import CachePolicy, FileCache, ReferenceCache, ResponseCache, SQLiteCache, cache_key
+
+
+class CountingHandler:
+    """MockTransport handler that counts the requests it serves."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(200, json={"regions": [{"id": 1, "name": "Moscow"}], "call": self.calls})
+
+
+class TestPersistentBackends(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_roundtrip_and_versioning(self) -> None:
+        for backend_type, location in ((SQLiteCache, "cache.sqlite3"), (FileCache, "files")):
+            with self.subTest(backend=backend_type.__name__):
+                path = Path(self.tmp.name) / location
+                backend = backend_type(path)
+                backend.set("key", {"a": [1, 2]}, stored_at=123.0)
+                entry = backend.get("key")
+                self.assertEqual((entry.value, entry.stored_at), ({"a": [1, 2]}, 123.0))
+
+                self.assertIsNone(backend_type(path, version=2).get("key"))
+
+                backend.delete("key")
+                self.assertIsNone(backend.get("key"))
+                backend.close()
+
+    def test_cache_key_is_normalized(self) -> None:
+        """Parameter order does not matter and the API key is never embedded."""
+        key = cache_key("apiLanguages.php", {"b": 1, "apikey": "secret"})
+        self.assertEqual(key, cache_key("apiLanguages.php", {"apikey": "secret", "b": 1}))
+        self.assertNotIn("secret", key)
+
+    def test_stale_entries_are_refreshed(self) -> None:
+        backend = SQLiteCache(Path(self.tmp.name) / "cache.sqlite3")
+        self.addCleanup(backend.close)
+        backend.set(cache_key("apiLanguages.php"), "old", stored_at=time.time() - 100)
+        calls = []
+        reference = ReferenceCache(backend, {"apiLanguages.php": 50})
+        self.assertEqual(reference.get_or_fetch("apiLanguages.php", None, lambda: calls.append(1) or "new"), "new")
+        self.assertEqual(reference.get_or_fetch("apiLanguages.php", None, lambda: calls.append(1) or "newer"), "new")
+        self.assertEqual(len(calls), 1)
+
+
+class TestClientWarmStart(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "cache.sqlite3"
+
+    def _client(self) -> RushAnalyticsAPI:
+        backend = SQLiteCache(self.path)
+        self.addCleanup(backend.close)
+        return RushAnalyticsAPI(api_key="test_api_key", persistent_cache=backend)
+
+    @patch("rush_analytics.endpoints.RushAnalyticsAPI.get_data")
+    def test_new_client_starts_warm(self, mock_get_data: Mock) -> None:
+        """A second client (e.g. a new process) reads reference data from disk."""
+        mock_get_data.return_value = {"regions": [{"id": 1, "name": "Moscow"}]}
+        self.assertEqual(self._client().list_google_regions(), mock_get_data.return_value)
+        self.assertEqual(self._client().list_google_regions(), mock_get_data.return_value)
+        mock_get_data.assert_called_once_with(Endpoints.LIST_GOOGLE_REGIONS.value, {"apikey": "test_api_key"})
+
+    def test_async_client_uses_persistent_cache(self) -> None:
+        handler = CountingHandler()
+
+        async def run() -> dict:
+            backend = SQLiteCache(self.path)
+            self.addCleanup(backend.close)
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key", persistent_cache=backend)
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await api_client.async_list_yandex_regions()
+            finally:
+                await api_client.close()
+
+        self.assertEqual(asyncio.run(run())["call"], 1)
+        self.assertEqual(asyncio.run(run())["call"], 1)
+        self.assertEqual(handler.calls, 1)
+
+    def test_volatile_endpoints_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            RushAnalyticsAPI(
+                api_key="test_api_key",
+                persistent_cache=SQLiteCache(self.path),
+                reference_ttls={Endpoints.TASK_STATUS: 60},
+            )
+
+
+class TestResponseCache(unittest.TestCase):
+    def _client(self, handler: CountingHandler) -> RushAnalyticsAPI:
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(handler))
+        return api_client
+
+    def test_reference_data_is_fetched_once(self) -> None:
+        handler = CountingHandler()
+        api_client = self._client(handler)
+        api_client.list_languages()
+        api_client.list_languages()
+        self.assertEqual(handler.calls, 1)
+        stats = api_client.cache_stats()[Endpoints.LIST_LANGUAGES.value]
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+
+    def test_status_is_never_cached(self) -> None:
+        handler = CountingHandler()
+        api_client = self._client(handler)
+        self.assertEqual(api_client.get_task_status("1")["call"], 1)
+        self.assertEqual(api_client.get_task_status("1")["call"], 2)
+        self.assertEqual(api_client.cache_stats()[Endpoints.TASK_STATUS.value].size, 0)
+
+    def test_instances_are_isolated(self) -> None:
+        first, second = CountingHandler(), CountingHandler()
+        self._client(first).list_languages()
+        self._client(second).list_languages()
+        self.assertEqual((first.calls, second.calls), (1, 1))
+
+    def test_templates_ttl_and_eviction(self) -> None:
+        cache = ResponseCache({"tasks/{task_id}/results": CachePolicy(cacheable=True, ttl=60, maxsize=2)})
+        for task_id in ("1", "2", "3"):
+            cache.set(f"tasks/{task_id}/results", {"apikey": "k"}, task_id)
+        self.assertEqual(cache.get("tasks/3/results", {"apikey": "k"}), (True, "3"))
+        self.assertEqual(cache.get("tasks/1/results", {"apikey": "k"}), (False, None))
+        self.assertEqual(cache.get("tasks/3", {"apikey": "k"}), (False, None))
+        self.assertEqual(cache.stats()["tasks/{task_id}/results"].evictions, 1)
+
+        expired = ResponseCache({"apiLanguages.php": CachePolicy(cacheable=True, ttl=0)})
+        expired.set("apiLanguages.php", None, "value")
+        self.assertEqual(expired.get("apiLanguages.php"), (False, None))
+
+    def test_volatile_policies_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            RushAnalyticsAPI(api_key="test_api_key", cache_policies={Endpoints.TASK_STATUS: CachePolicy(cacheable=True)})
+
+
+if __name__ == "__main__":
+    unittest.main()
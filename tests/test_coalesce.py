@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, RushAnalyticsAPI
+from rush_analytics.coalesce import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_threads_share_one_call(self) -> None:
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow() -> str:
+            calls.append(1)
+            release.wait(1)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((flight.stats.calls, flight.stats.executed, flight.stats.coalesced), (5, 1, 4))
+
+    def test_errors_are_shared_and_not_cached(self) -> None:
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("k", lambda: int("x"))
+        self.assertEqual(flight.do("k", lambda: 1), 1)
+
+    def test_async_cancellation_does_not_affect_others(self) -> None:
+        async def run() -> str:
+            flight = AsyncSingleFlight()
+
+            async def slow() -> str:
+                await asyncio.sleep(0.01)
+                return "value"
+
+            first = asyncio.ensure_future(flight.do("k", slow))
+            second = asyncio.ensure_future(flight.do("k", slow))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), "value")
+
+
+class TestClientCoalescing(unittest.TestCase):
+    def test_async_status_requests_are_coalesced(self) -> None:
+        sent = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"status": "in_progress"})
+
+        async def run() -> tuple[list[dict], AsyncRushAnalyticsAPI]:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                results = await asyncio.gather(*(api_client.async_get_task_status("1") for _ in range(20)))
+                # Once the shared request is finished, status is fetched afresh.
+                await api_client.async_get_task_status("1")
+                return results, api_client
+            finally:
+                await api_client.close()
+
+        results, api_client = asyncio.run(run())
+        self.assertEqual(len(results), 20)
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(api_client.coalescing_stats.coalesced, 19)
+
+    def test_can_be_disabled(self) -> None:
+        api_client = RushAnalyticsAPI(api_key="test_api_key", coalesce_requests=False)
+        api_client.client = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(200, json={})))
+        api_client.get_task_status("1")
+        self.assertIsNone(api_client.single_flight)
+        self.assertEqual(api_client.coalescing_stats.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import gzip
+import importlib.util
+import json
+import unittest
+from typing import Any
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, CompressionPolicy, RushAnalyticsAPI
+from rush_analytics.compression import TransferStats
+
+HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+
+KEYWORDS = [{"keyword": f"keyword {i}", "url": f"https://example.com/page/{i}"} for i in range(2000)]
+RESULTS = json.dumps({"results": KEYWORDS}).encode()
+
+
+class TestCompressionPolicy(unittest.TestCase):
+    def test_threshold(self) -> None:
+        policy = CompressionPolicy(threshold=100)
+        self.assertEqual(policy.encode(b"x" * 99), (b"x" * 99, {}))
+        body, headers = policy.encode(b"x" * 1000)
+        self.assertEqual(headers, {"Content-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(body), b"x" * 1000)
+
+    def test_unknown_encoding(self) -> None:
+        with self.assertRaises(ValueError):
+            CompressionPolicy(encoding="br")
+
+    @unittest.skipUnless(HAS_ZSTD, "zstandard is not installed")
+    def test_zstd(self) -> None:
+        import zstandard
+
+        body, headers = CompressionPolicy(encoding="zstd", threshold=0).encode(RESULTS)
+        self.assertEqual(headers, {"Content-Encoding": "zstd"})
+        self.assertEqual(zstandard.ZstdDecompressor().decompress(body), RESULTS)
+
+    def test_ratio(self) -> None:
+        self.assertEqual(TransferStats().compression_ratio, 1.0)
+        self.assertEqual(TransferStats(bytes_received=10, bytes_received_decoded=40).compression_ratio, 4.0)
+
+
+class CompressingServerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "POST":
+            body = request.content
+            if request.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return httpx.Response(200, json={"task_id": "1", "keywords": len(json.loads(body)["keywords"])})
+        return httpx.Response(200, stream=httpx.ByteStream(gzip.compress(RESULTS)), headers={"Content-Encoding": "gzip"})
+
+
+class TestClientCompression(CompressingServerTestCase):
+    def _client(self, **kwargs: Any) -> RushAnalyticsAPI:
+        api_client = RushAnalyticsAPI(api_key="test_api_key", **kwargs)
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self.handler))
+        return api_client
+
+    def test_large_task_is_compressed(self) -> None:
+        api_client = self._client(compression=CompressionPolicy())
+        response = api_client.create_task(name="Test", url="https://example.com", keywords=KEYWORDS)
+        self.assertEqual(response["keywords"], len(KEYWORDS))
+        self.assertEqual(self.requests[0].headers["Content-Encoding"], "gzip")
+        stats = api_client.transfer_stats
+        self.assertEqual(stats.bytes_sent, len(self.requests[0].content))
+        self.assertLess(stats.bytes_sent * 4, stats.bytes_sent_decoded)
+
+    def test_small_and_uncompressed_tasks(self) -> None:
+        self._client(compression=CompressionPolicy()).create_task(name="Test", url="https://example.com")
+        self._client().create_task(name="Test", url="https://example.com", keywords=KEYWORDS)
+        self.assertTrue(all("Content-Encoding" not in request.headers for request in self.requests))
+
+    def test_streamed_results_are_decoded(self) -> None:
+        api_client = self._client()
+        self.assertEqual(list(api_client.iter_task_results("1")), KEYWORDS)
+        self.assertIn("gzip", self.requests[0].headers["Accept-Encoding"])
+        stats = api_client.transfer_stats
+        self.assertEqual(stats.requests, 1)
+        self.assertEqual(stats.bytes_received, len(gzip.compress(RESULTS)))
+        self.assertEqual(stats.bytes_received_decoded, len(RESULTS))
+
+    def test_buffered_results_are_counted(self) -> None:
+        api_client = self._client()
+        self.assertEqual(api_client.get_task_results("1"), {"results": KEYWORDS})
+        self.assertEqual(api_client.transfer_stats.bytes_received_decoded, len(RESULTS))
+        self.assertGreater(api_client.transfer_stats.compression_ratio, 4)
+
+
+class TestAsyncClientCompression(CompressingServerTestCase):
+    def test_compressed_round_trip(self) -> None:
+        async def run() -> tuple[dict[str, Any], list[Any], TransferStats]:
+            async with AsyncRushAnalyticsAPI(api_key="test_api_key", compression=CompressionPolicy()) as api_client:
+                api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+                created = await api_client.create_task(name="Test", url="https://example.com", keywords=KEYWORDS)
+                rows = [row async for row in api_client.async_iter_task_results("1")]
+                return created, rows, api_client.transfer_stats
+
+        created, rows, stats = asyncio.run(run())
+        self.assertEqual(created["keywords"], len(KEYWORDS))
+        self.assertEqual(rows, KEYWORDS)
+        self.assertEqual(stats.requests, 2)
+        self.assertGreater(stats.bytes_received_decoded, len(RESULTS))
+        self.assertLess(stats.bytes_sent * 4, stats.bytes_sent_decoded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,21 @@
+import json
 import os
 import unittest
 from typing import Any
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
-from endpoints import RushAnalyticsAPI
+import httpx
+from pydantic import ValidationError
 
-
-class UnexpectedResponseError(Exception):
-    """Custom exception for unexpected API responses."""
-
-    def __init__(self, response: dict[str, Any]) -> None:
-        message = f"Unexpected response from API: {response}"
-        super().__init__(message)
+from rush_analytics import NO_RETRY, Transport
+from rush_analytics.endpoints import (
+    InvalidAPIKeyError,
+    RateLimitExceededError,
+    RequestError,
+    RushAnalyticsAPI,
+    retry_request,
+)
+from rush_analytics.payload import TaskPayload
 
 
 class MissingKeyError(Exception):
@@ -22,39 +26,47 @@ class MissingKeyError(Exception):
         super().__init__(message)
 
 
+class RecordingAPI:
+    """Fake API that answers every request with one canned response and records the requests."""
+
+    def __init__(self, status_code: int = 200, body: dict[str, Any] | None = None) -> None:
+        self.status_code = status_code
+        self.body = body if body is not None else {"success": True}
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(self.status_code, json=self.body)
+
+    def client(self, api_key: str) -> RushAnalyticsAPI:
+        transport = Transport(http_transport=httpx.MockTransport(self.handler))
+        return RushAnalyticsAPI(api_key=api_key, transport=transport, retry_policy=NO_RETRY)
+
+
 class TestRushAnalyticsAPI(unittest.TestCase):
     def setUp(self) -> None:
         """Set up the API client for testing."""
         self.api_key: str = os.getenv("RUSH_ANALYTICS_API_KEY", "test_api_key")
         self.api_client: RushAnalyticsAPI = RushAnalyticsAPI(api_key=self.api_key)
+        self.addCleanup(self.api_client.close)
         self.run_live_tests: bool = os.getenv("RUN_LIVE_API_TESTS") == "1"
 
-    @patch("requests.get")
-    def test_get_data_mocked(self, mock_get: Mock) -> None:
-        """Test the get_data method with mocked requests."""
-        mock_response: Mock = Mock()
-        mock_response.json.return_value = {"success": True}
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
-
-        response: dict[str, Any] = self.api_client.get_data("test_endpoint", {"param": "value"})
-        if response != {"success": True}:
-            error_message: str = (
-                f"Expected response to be {{'success': True}}, but got: {response}"
-            )
-            raise AssertionError(error_message)
-        mock_get.assert_called_once_with(
-            "https://rush-analytics.com/api/test_endpoint",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            params={"param": "value"},
-            timeout=10,
-        )
-        key: str = "languages"
-        if key not in response:
-            raise MissingKeyError(key)
+    def fake_client(self, fake: RecordingAPI) -> RushAnalyticsAPI:
+        api_client = fake.client(self.api_key)
+        self.addCleanup(api_client.close)
+        return api_client
+
+    def test_get_data_mocked(self) -> None:
+        """Test the get_data method against a fake transport."""
+        fake = RecordingAPI()
+
+        response: dict[str, Any] = self.fake_client(fake).get_data("test_endpoint", {"param": "value"})
+        self.assertEqual(response, {"success": True})
+        [request] = fake.requests
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(str(request.url), "https://rush-analytics.com/api/test_endpoint?param=value")
+        self.assertEqual(request.headers["Authorization"], f"Bearer {self.api_key}")
+        self.assertEqual(request.headers["Content-Type"], "application/json")
 
     def test_get_data_live(self) -> None:
         """Test the get_data method with live API requests."""
@@ -65,29 +77,18 @@ class TestRushAnalyticsAPI(unittest.TestCase):
         if key not in response:
             raise MissingKeyError(key)
 
-    @patch("requests.post")
-    def test_post_data_mocked(self, mock_post: Mock) -> None:
-        """Test the post_data method with mocked requests."""
-        mock_response: Mock = Mock()
-        mock_response.json.return_value = {"success": True}
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-
-        response: dict[str, Any] = self.api_client.post_data("test_endpoint", {"key": "value"})
-        if response != {"success": True}:
-            error_message: str = (
-                f"Expected response to be {{'success': True}}, but got: {response}"
-            )
-            raise AssertionError(error_message)
-        mock_post.assert_called_once_with(
-            "https://rush-analytics.com/api/test_endpoint",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            json={"key": "value"},
-            timeout=10,
-        )
+    def test_post_data_mocked(self) -> None:
+        """Test the post_data method against a fake transport."""
+        fake = RecordingAPI()
+
+        response: dict[str, Any] = self.fake_client(fake).post_data("test_endpoint", {"key": "value"})
+        self.assertEqual(response, {"success": True})
+        [request] = fake.requests
+        self.assertEqual(request.method, "POST")
+        self.assertEqual(str(request.url), "https://rush-analytics.com/api/test_endpoint")
+        self.assertEqual(request.headers["Authorization"], f"Bearer {self.api_key}")
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(request.content), {"key": "value"})
 
     def test_post_data_live(self) -> None:
         """Test the post_data method with live API requests."""
@@ -99,43 +100,35 @@ class TestRushAnalyticsAPI(unittest.TestCase):
             error_message: str = "Expected 'task_id' in the response."
             raise ValueError(error_message)
 
-    def test_invalid_api_key(self):
-        with patch("requests.post") as mock_post:
-            mock_post.side_effect = InvalidAPIKeyError()
-            with self.assertRaises(InvalidAPIKeyError):
-                self.api_client.post_data("test_endpoint", {"key": "value"})
+    def test_invalid_api_key(self) -> None:
+        """Test that InvalidAPIKeyError is raised for a 403 response in post_data."""
+        api_client = self.fake_client(RecordingAPI(403))
+        with self.assertRaises(InvalidAPIKeyError):
+            api_client.post_data("test_endpoint", {"key": "value"})
 
-    def test_retry_logic(self):
-        with patch("requests.post") as mock_post:
-            mock_post.side_effect = RequestError("Temporary error", 500)
-            with self.assertRaises(RequestError):
-                retry_request(lambda: self.api_client.post_data("test_endpoint", {"key": "value"}), retries=2)
+    def test_retry_logic(self) -> None:
+        """Test that retry_request retries a failing call and re-raises the last error."""
+        fake = RecordingAPI(500)
+        api_client = self.fake_client(fake)
+        with patch("rush_analytics.endpoints.time.sleep"), self.assertRaises(RequestError):
+            retry_request(lambda: api_client.post_data("test_endpoint", {"key": "value"}), retries=2)
+        self.assertEqual(len(fake.requests), 2)
 
-    @patch("requests.get")
-    def test_invalid_api_key_error(self, mock_get: Mock) -> None:
+    def test_invalid_api_key_error(self) -> None:
         """Test that InvalidAPIKeyError is raised for a 403 response."""
-        mock_response = Mock()
-        mock_response.status_code = 403
-        mock_response.raise_for_status.side_effect = requests.HTTPError()
-        mock_get.return_value = mock_response
-
+        api_client = self.fake_client(RecordingAPI(403))
         with self.assertRaises(InvalidAPIKeyError):
-            self.api_client.get_data("test_endpoint")
+            api_client.get_data("test_endpoint")
 
-    @patch("requests.get")
-    def test_rate_limit_exceeded_error(self, mock_get: Mock) -> None:
+    def test_rate_limit_exceeded_error(self) -> None:
         """Test that RateLimitExceededError is raised for a 429 response."""
-        mock_response = Mock()
-        mock_response.status_code = 429
-        mock_response.raise_for_status.side_effect = requests.HTTPError()
-        mock_get.return_value = mock_response
-
+        api_client = self.fake_client(RecordingAPI(429))
         with self.assertRaises(RateLimitExceededError):
-            self.api_client.get_data("test_endpoint")
+            api_client.get_data("test_endpoint")
 
-    def test_invalid_task_payload(self):
-    with self.assertRaises(ValidationError):
-        TaskPayload(name="Test", url="invalid_url")
+    def test_invalid_task_payload(self) -> None:
+        with self.assertRaises(ValidationError):
+            TaskPayload(name="Test", url="invalid_url")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+import asyncio
+import importlib.util
+import json
+import math
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, ResultColumns, RushAnalyticsAPI
+from rush_analytics.export import COMPETITOR_PREFIX
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+HAS_PANDAS = HAS_PYARROW and importlib.util.find_spec("pandas") is not None
+
+RESULTS = {
+    "status": "completed",
+    "results": [
+        {"keyword": "shoes", "region": "Moscow", "position": 3, "url": "https://a.example/shoes", "date": "2024-05-01"},
+        {
+            "query": "boots",
+            "region_id": 213,
+            "positions": [
+                {"date": "2024-05-01", "pos": 0},
+                {"date": "2024-05-02", "pos": "7", "competitors": {"b.example": 2}},
+            ],
+        },
+        {"keyword": "sandals", "position": None, "competitors": [{"domain": "c.example", "position": 5}]},
+    ],
+}
+
+
+class TestResultColumns(unittest.TestCase):
+    def setUp(self) -> None:
+        self.columns = ResultColumns.from_results(RESULTS, defaults={"engine": "google"})
+
+    def test_flattens_nested_rows(self) -> None:
+        data = self.columns.to_dict()
+        self.assertEqual(len(self.columns), 4)
+        self.assertEqual(data["keyword"], ["shoes", "boots", "boots", "sandals"])
+        self.assertEqual(data["region"], ["Moscow", 213, 213, None])
+        self.assertEqual(data["date"], ["2024-05-01", "2024-05-01", "2024-05-02", None])
+        self.assertEqual(data["engine"], ["google"] * 4)
+
+    def test_positions_are_normalized(self) -> None:
+        """Zero, missing and non-numeric positions mean "not ranked"."""
+        self.assertEqual(self.columns.to_dict()["position"], [3, None, 7, None])
+
+    def test_competitor_columns_are_padded(self) -> None:
+        data = self.columns.to_dict()
+        self.assertEqual(data[COMPETITOR_PREFIX + "b.example"], [None, None, 2, None])
+        self.assertEqual(data[COMPETITOR_PREFIX + "c.example"], [None, None, None, 5])
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_to_numpy(self) -> None:
+        arrays = self.columns.to_numpy()
+        self.assertEqual(arrays["position"].dtype.kind, "f")
+        self.assertEqual(arrays["position"][0], 3.0)
+        self.assertTrue(math.isnan(arrays["position"][1]))
+        self.assertEqual(list(arrays["keyword"]), ["shoes", "boots", "boots", "sandals"])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_to_arrow(self) -> None:
+        import pyarrow as pa
+
+        table = self.columns.to_arrow()
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.schema.field("position").type, pa.int32())
+        self.assertEqual(table.column("position").to_pylist(), [3, None, 7, None])
+        self.assertEqual(table.column("region").to_pylist(), ["Moscow", "213", "213", None])
+
+    @unittest.skipUnless(HAS_PANDAS, "pandas is not installed")
+    def test_to_pandas(self) -> None:
+        frame = self.columns.to_pandas()
+        self.assertEqual(list(frame["keyword"]), ["shoes", "boots", "boots", "sandals"])
+        self.assertEqual(int(frame[COMPETITOR_PREFIX + "c.example"].notna().sum()), 1)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_file_round_trips(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        expected = self.columns.to_arrow()
+        with tempfile.TemporaryDirectory() as directory:
+            parquet_path = os.path.join(directory, "results.parquet")
+            self.columns.write_parquet(parquet_path, compression="zstd")
+            self.assertTrue(pq.read_table(parquet_path).equals(expected))
+
+            ipc_path = os.path.join(directory, "results.arrow")
+            self.columns.write_ipc(ipc_path)
+            with pa.memory_map(ipc_path) as source:
+                self.assertTrue(pa.ipc.open_file(source).read_all().equals(expected))
+
+
+class TestGetTaskResultsColumns(unittest.TestCase):
+    @staticmethod
+    def _handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps(RESULTS).encode())
+
+    def test_sync(self) -> None:
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self._handler))
+
+        columns = api_client.get_task_results_columns("12345", key="results")
+        self.assertEqual(columns.to_dict(), ResultColumns.from_results(RESULTS).to_dict())
+
+    def test_async(self) -> None:
+        async def run() -> ResultColumns:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
+            try:
+                return await api_client.async_get_task_results_columns("12345", defaults={"engine": "yandex"})
+            finally:
+                await api_client.close()
+
+        columns = asyncio.run(run())
+        self.assertEqual(len(columns), 4)
+        self.assertEqual(columns.to_dict()["engine"], ["yandex"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
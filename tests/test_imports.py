@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Generous enough for slow CI machines; the package itself imports in well under 0.3 s.
+IMPORT_BUDGET = 1.0
+
+# Modules that must not be loaded by a plain ``import rush_analytics``.
+DEFERRED_MODULES = ("requests", "pydantic", "pydantic_core", "asyncio", "numpy", "pyarrow", "pandas", "zstandard")
+
+PROBE = """
+import importlib.util, json, logging, sys, time
+
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location(
+    "rush_analytics", sys.argv[1] + "/__init__.py", submodule_search_locations=[sys.argv[1]]
+)
+module = importlib.util.module_from_spec(spec)
+sys.modules["rush_analytics"] = module
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - start
+loaded = sorted(name for name in json.loads(sys.argv[2]) if name in sys.modules)
+root_handlers = len(logging.getLogger().handlers)
+task_payload = module.TaskPayload.__name__
+print(json.dumps({"elapsed": elapsed, "loaded": loaded, "root_handlers": root_handlers,
+                  "task_payload": task_payload, "pydantic_after": "pydantic" in sys.modules}))
+"""
+
+
+class TestImportCost(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE, str(ROOT), json.dumps(DEFERRED_MODULES)],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        cls.result = json.loads(output)
+
+    def test_heavy_modules_are_deferred(self) -> None:
+        self.assertEqual(self.result["loaded"], [])
+
+    def test_lazy_exports_load_on_first_use(self) -> None:
+        self.assertEqual(self.result["task_payload"], "TaskPayload")
+        self.assertTrue(self.result["pydantic_after"])
+
+    def test_no_logging_configuration(self) -> None:
+        self.assertEqual(self.result["root_handlers"], 0)
+
+    def test_import_time_budget(self) -> None:
+        self.assertLess(self.result["elapsed"], IMPORT_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, IncrementalSync, RushAnalyticsAPI, SQLiteCache
+
+
+def _row(keyword: str, day: str, position: int) -> dict[str, Any]:
+    return {"keyword": keyword, "region": "Moscow", "engine": "google", "date": day, "position": position}
+
+
+class FakeResults:
+    def __init__(self) -> None:
+        self.rows: dict[str, list[dict[str, Any]]] = {}
+        self.queries: list[dict[str, str]] = []
+        self.failing: set[str] = set()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        task_id = request.url.path.split("/")[-2]
+        self.queries.append(dict(request.url.params))
+        if task_id in self.failing:
+            return httpx.Response(404)
+        rows = self.rows[task_id]
+        since = request.url.params.get("date_from")
+        if since is not None:
+            rows = [row for row in rows if row["date"] >= since]
+        return httpx.Response(200, json={"status": "completed", "results": rows})
+
+
+class IncrementalTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = SQLiteCache(Path(self.tmp.name) / "sync.sqlite3")
+        self.addCleanup(self.store.close)
+        self.fake = FakeResults()
+        self.api = RushAnalyticsAPI(api_key="test_api_key")
+        self.api.client = httpx.Client(transport=httpx.MockTransport(self.fake.handler))
+
+    def changes(self, sync: IncrementalSync, task_id: str = "1") -> list[tuple[str, str, int]]:
+        return [
+            (change.kind, change.row["date"], change.row["position"])
+            for change in self.api.sync_task_results(task_id, sync, key="results")
+        ]
+
+
+class TestIncrementalSync(IncrementalTestCase):
+    def test_only_new_and_changed_rows(self) -> None:
+        sync = IncrementalSync(self.store)
+        self.fake.rows["1"] = [_row("a", "2024-05-01", 3), _row("b", "2024-05-01", 7)]
+        self.assertEqual(self.changes(sync), [("new", "2024-05-01", 3), ("new", "2024-05-01", 7)])
+        self.assertEqual(self.changes(sync), [])
+
+        self.fake.rows["1"] = [_row("a", "2024-05-01", 3), _row("b", "2024-05-01", 5), _row("a", "2024-05-02", 2)]
+        self.assertEqual(self.changes(sync), [("changed", "2024-05-01", 5), ("new", "2024-05-02", 2)])
+
+        checkpoint = sync.checkpoint("1")
+        self.assertEqual((checkpoint.watermark, checkpoint.scanned, checkpoint.emitted), ("2024-05-02", 3, 2))
+
+    def test_checkpoint_survives_restart(self) -> None:
+        self.fake.rows["1"] = [_row("a", "2024-05-01", 3)]
+        self.changes(IncrementalSync(self.store))
+        self.store.close()
+        self.store = SQLiteCache(Path(self.tmp.name) / "sync.sqlite3")
+        self.assertEqual(self.changes(IncrementalSync(self.store)), [])
+
+    def test_interrupted_sync_is_repeated(self) -> None:
+        sync = IncrementalSync(self.store)
+        self.fake.rows["1"] = [_row("a", "2024-05-01", 3), _row("b", "2024-05-01", 7)]
+        changes = self.api.sync_task_results("1", sync, key="results")
+        next(changes)
+        changes.close()
+        self.assertEqual(len(self.changes(sync)), 2)
+
+        sync.reset("1")
+        self.assertEqual(len(self.changes(sync)), 2)
+
+    def test_settled_rows_are_skipped_and_pruned(self) -> None:
+        sync = IncrementalSync(self.store, settle_days=2)
+        self.fake.rows["1"] = [_row("a", f"2024-05-0{day}", day) for day in range(1, 6)]
+        self.assertEqual(len(self.changes(sync)), 5)
+        self.assertEqual(len(sync.checkpoint("1").fingerprints), 3)
+
+        # A rewritten row older than the settle window is ignored; a recent one is reported.
+        self.fake.rows["1"][0]["position"] = 90
+        self.fake.rows["1"][3]["position"] = 40
+        self.assertEqual(self.changes(sync), [("changed", "2024-05-04", 40)])
+
+    def test_nested_positions_are_compared_per_date(self) -> None:
+        sync = IncrementalSync(self.store, settle_days=2)
+
+        def history(days: int) -> list[dict[str, Any]]:
+            positions = [{"date": f"2024-05-{day:02}", "position": day} for day in range(1, days + 1)]
+            return [{"query": "a", "region": "Moscow", "se": "google", "positions": positions}]
+
+        self.fake.rows["1"] = history(10)
+        self.assertEqual(len(self.changes(sync)), 10)
+        self.fake.rows["1"] = history(11)
+        self.assertEqual(self.changes(sync), [("new", "2024-05-11", 11)])
+
+        checkpoint = sync.checkpoint("1")
+        self.assertEqual(checkpoint.watermark, "2024-05-11")
+        self.assertEqual(len(checkpoint.fingerprints), 3)
+        self.assertIn('"a"', next(iter(checkpoint.fingerprints)))
+
+    def test_since_param_limits_the_download(self) -> None:
+        sync = IncrementalSync(self.store, settle_days=1, since_param="date_from")
+        self.fake.rows["1"] = [_row("a", "2024-05-01", 1), _row("a", "2024-05-03", 3)]
+        self.changes(sync)
+        self.fake.rows["1"].append(_row("a", "2024-05-04", 4))
+        self.assertEqual(self.changes(sync), [("new", "2024-05-04", 4)])
+        self.assertNotIn("date_from", self.fake.queries[0])
+        self.assertEqual(self.fake.queries[1]["date_from"], "2024-05-02")
+        self.assertEqual(self.fake.queries[1]["apikey"], "test_api_key")
+
+    def test_rows_without_key_fields(self) -> None:
+        sync = IncrementalSync(self.store, date_field=None)
+        self.fake.rows["1"] = [{"position": 1}, {"position": 2}]
+        changes = [change.row for change in self.api.sync_task_results("1", sync, key="results")]
+        self.assertEqual(changes, [{"position": 1}, {"position": 2}])
+        self.assertEqual(list(self.api.sync_task_results("1", sync, key="results")), [])
+
+    def test_sync_tasks(self) -> None:
+        sync = IncrementalSync(self.store)
+        self.fake.rows = {"1": [_row("a", "2024-05-01", 1)], "2": [_row("b", "2024-05-01", 2)]}
+        self.fake.failing = {"3"}
+        results = self.api.sync_tasks(["1", "2", "3"], sync, key="results", max_concurrency=2)
+        self.assertEqual([len(result.value) for result in results[:2]], [1, 1])
+        self.assertEqual(results[1].value[0].task_id, "2")
+        self.assertFalse(results[2].ok)
+        self.assertIsNone(sync.checkpoint("3").watermark)
+
+    def test_async_client(self) -> None:
+        sync = IncrementalSync(self.store)
+        self.fake.rows = {"1": [_row("a", "2024-05-01", 1)], "2": [_row("b", "2024-05-01", 2)]}
+
+        async def run() -> list[int]:
+            async with AsyncRushAnalyticsAPI(api_key="test_api_key") as api_client:
+                api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self.fake.handler))
+                first = await api_client.async_sync_tasks(["1", "2"], sync, key="results")
+                second = [change async for change in api_client.async_sync_task_results("1", sync, key="results")]
+                return [len(result.value) for result in first] + [len(second)]
+
+        self.assertEqual(asyncio.run(run()), [1, 1, 0])
+
+    def test_digest_ignores_key_order(self) -> None:
+        sync = IncrementalSync(self.store)
+        self.fake.rows["1"] = [_row("a", "2024-05-01", 3)]
+        self.changes(sync)
+        self.fake.rows["1"] = [dict(reversed(list(_row("a", "2024-05-01", 3).items())))]
+        self.assertEqual(self.changes(sync), [])
+        json.dumps(sync.checkpoint("1").to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import unittest
+from typing import Any
+
+import httpx
+
+from rush_analytics import (
+    AsyncRushAnalyticsAPI,
+    LoggingHooks,
+    MetricsHooks,
+    MetricsRegistry,
+    RateLimiter,
+    RequestHooks,
+    RequestInfo,
+    RetryPolicy,
+    RushAnalyticsAPI,
+)
+from rush_analytics.endpoints import NotFoundError
+from rush_analytics.instrumentation import summarize_payload
+
+
+class RecordingHooks(RequestHooks):
+    def __init__(self) -> None:
+        self.events: list[tuple[Any, ...]] = []
+
+    def on_request_start(self, method: str, endpoint: str) -> None:
+        self.events.append(("start", method, endpoint))
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        self.events.append(("end", info.method, info.endpoint, info.status_code))
+        self.last = info
+
+    def on_retry(self, method: str, endpoint: str, attempt: int, delay: float, error: Exception) -> None:
+        self.events.append(("retry", method, endpoint, attempt))
+
+    def on_cache_hit(self, endpoint: str, cache: str) -> None:
+        self.events.append(("hit", endpoint, cache))
+
+    def on_cache_miss(self, endpoint: str, cache: str) -> None:
+        self.events.append(("miss", endpoint, cache))
+
+    def on_rate_limit_wait(self, endpoint: str, seconds: float) -> None:
+        self.events.append(("wait", endpoint))
+
+
+class BrokenHooks(RequestHooks):
+    def on_request_start(self, method: str, endpoint: str) -> None:
+        raise RuntimeError("broken hook")
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_prometheus_text(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.counter("demo_total", "A counter.", ("code",))
+        counter.inc("200")
+        counter.inc("200", amount=2)
+        histogram = registry.histogram("demo_seconds", "A histogram.", ("path",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, 'a"b')
+        histogram.observe(0.5, 'a"b')
+        histogram.observe(5, 'a"b')
+
+        self.assertEqual(
+            registry.render(),
+            "# HELP demo_seconds A histogram.\n"
+            "# TYPE demo_seconds histogram\n"
+            'demo_seconds_bucket{path="a\\"b",le="0.1"} 1\n'
+            'demo_seconds_bucket{path="a\\"b",le="1"} 2\n'
+            'demo_seconds_bucket{path="a\\"b",le="+Inf"} 3\n'
+            'demo_seconds_sum{path="a\\"b"} 5.55\n'
+            'demo_seconds_count{path="a\\"b"} 3\n'
+            "# HELP demo_total A counter.\n"
+            "# TYPE demo_total counter\n"
+            'demo_total{code="200"} 3\n',
+        )
+
+    def test_registration_is_idempotent(self) -> None:
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter("x_total", "X."), registry.counter("x_total", "X."))
+        with self.assertRaises(ValueError):
+            registry.histogram("x_total", "X.")
+        self.assertEqual(MetricsRegistry().render(), "")
+
+
+class TestClientHooks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.statuses = [503, 200]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        if request.url.path.endswith("apiLanguages.php"):
+            return httpx.Response(200, json={"languages": ["en"]})
+        return httpx.Response(self.statuses.pop(0) if self.statuses else 200, json={"status": "done"})
+
+    def _client(self, *hooks: RequestHooks, **kwargs: Any) -> RushAnalyticsAPI:
+        api_client = RushAnalyticsAPI(
+            api_key="test_api_key", retry_policy=RetryPolicy(base_delay=0, max_delay=0), hooks=hooks, **kwargs
+        )
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self.handler))
+        return api_client
+
+    def test_request_and_retry_events(self) -> None:
+        hooks = RecordingHooks()
+        self._client(hooks).get_task_status("12345")
+        self.assertEqual(
+            hooks.events,
+            [
+                ("start", "GET", "tasks/{task_id}"),
+                ("end", "GET", "tasks/{task_id}", 503),
+                ("retry", "GET", "tasks/{task_id}", 1),
+                ("start", "GET", "tasks/{task_id}"),
+                ("end", "GET", "tasks/{task_id}", 200),
+            ],
+        )
+        self.assertGreater(hooks.last.bytes_received, 0)
+
+    def test_cache_events(self) -> None:
+        hooks = RecordingHooks()
+        api_client = self._client(hooks)
+        api_client.list_languages()
+        api_client.list_languages()
+        cache_events = [event for event in hooks.events if event[0] in ("hit", "miss")]
+        self.assertEqual(cache_events, [("miss", "apiLanguages.php", "response"), ("hit", "apiLanguages.php", "response")])
+
+    def test_rate_limit_wait_event(self) -> None:
+        hooks = RecordingHooks()
+        api_client = self._client(hooks, rate_limiter=RateLimiter(rate=50, capacity=1))
+        self.statuses = []
+        api_client.get_task_status("1")
+        api_client.get_task_status("2")
+        self.assertIn(("wait", "tasks/{task_id}"), hooks.events)
+
+    def test_streams_and_errors_are_reported(self) -> None:
+        hooks = RecordingHooks()
+        api_client = self._client(hooks)
+        with self.assertRaises(NotFoundError):
+            list(api_client.stream_data("missing"))
+        self.assertEqual(hooks.events[-1], ("end", "GET", "missing", 404))
+
+    def test_broken_hook_does_not_fail_requests(self) -> None:
+        hooks = RecordingHooks()
+        with self.assertLogs("rush_analytics.instrumentation", "ERROR"):
+            self.assertEqual(self._client(BrokenHooks(), hooks).get_task_status("1"), {"status": "done"})
+        self.assertEqual(hooks.events[-1], ("end", "GET", "tasks/{task_id}", 200))
+
+    def test_metrics_hooks(self) -> None:
+        metrics = MetricsHooks()
+        api_client = self._client(metrics)
+        api_client.get_task_status("1")
+        api_client.list_languages()
+        api_client.list_languages()
+
+        self.assertEqual(metrics.requests.value("GET", "tasks/{task_id}", "503"), 1)
+        self.assertEqual(metrics.requests.value("GET", "tasks/{task_id}", "200"), 1)
+        self.assertEqual(metrics.retries.value("GET", "tasks/{task_id}"), 1)
+        self.assertEqual(metrics.latency.count("GET", "tasks/{task_id}"), 2)
+        self.assertEqual(metrics.cache.value("response", "apiLanguages.php", "hit"), 1)
+        text = metrics.render()
+        self.assertIn('rush_analytics_requests_total{method="GET",endpoint="tasks/{task_id}",status="503"} 1', text)
+        self.assertIn("# TYPE rush_analytics_request_duration_seconds histogram", text)
+
+    def test_logging_hooks(self) -> None:
+        with self.assertLogs("rush_analytics.requests", "INFO") as logs:
+            self._client(LoggingHooks()).get_task_status("12345")
+        failed, retry, succeeded = logs.records
+        self.assertEqual((failed.levelno, failed.status_code), (logging.WARNING, 503))
+        self.assertEqual(retry.attempt, 1)
+        self.assertEqual(succeeded.levelno, logging.INFO)
+        self.assertEqual((succeeded.method, succeeded.endpoint, succeeded.status_code), ("GET", "tasks/{task_id}", 200))
+        self.assertGreater(succeeded.bytes_received, 0)
+        self.assertNotIn("12345", "\n".join(logs.output))
+        self.assertNotIn("test_api_key", "\n".join(logs.output))
+
+    def test_logging_hooks_sampling(self) -> None:
+        api_client = self._client(LoggingHooks(sample_rate=0.0))
+        with self.assertLogs("rush_analytics.requests", "INFO") as logs:
+            api_client.get_task_status("1")
+            api_client.get_task_status("2")
+        self.assertEqual([record.levelname for record in logs.records], ["WARNING", "WARNING"])
+        with self.assertRaises(ValueError):
+            LoggingHooks(sample_rate=2)
+
+    def test_logging_hooks_respect_logger_level(self) -> None:
+        hooks = LoggingHooks(level=logging.DEBUG)
+        self.statuses = []
+        with self.assertNoLogs("rush_analytics.requests", "DEBUG"):
+            logging.getLogger("rush_analytics.requests").setLevel(logging.INFO)
+            self.addCleanup(logging.getLogger("rush_analytics.requests").setLevel, logging.NOTSET)
+            self._client(hooks).get_task_status("1")
+
+    def test_post_bodies_are_summarized_at_debug(self) -> None:
+        self.statuses = []
+        api_client = self._client()
+        body = {"apikey": "test_api_key", "name": "Task", "keywords": [f"keyword {i}" for i in range(1000)]}
+        with self.assertNoLogs("rush_analytics.endpoints", "INFO"):
+            api_client.post_data("tasks", body)
+        with self.assertLogs("rush_analytics.endpoints", "DEBUG") as logs:
+            api_client.post_data("tasks", body)
+        self.assertIn("[1000 items]", logs.output[0])
+        self.assertNotIn("test_api_key", logs.output[0])
+        self.assertNotIn("keyword 1", logs.output[0])
+        self.assertGreater(logs.records[0].bytes_sent, 10_000)
+
+    def test_async_client(self) -> None:
+        hooks = RecordingHooks()
+
+        async def run() -> None:
+            async with AsyncRushAnalyticsAPI(
+                api_key="test_api_key", retry_policy=RetryPolicy(base_delay=0, max_delay=0), hooks=[hooks]
+            ) as api_client:
+                api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+                await api_client.async_get_task_status("1")
+                await api_client.async_list_languages()
+
+        asyncio.run(run())
+        self.assertEqual([event[0] for event in hooks.events], ["start", "end", "retry", "start", "end", "miss", "start", "end"])
+
+
+class TestSummarizePayload(unittest.TestCase):
+    def test_summary(self) -> None:
+        summary = summarize_payload(
+            {"apikey": "secret", "keywords": ["a", "b"], "url": "x" * 500, "google": {"region": 1}, "yandex": False}
+        )
+        self.assertEqual(summary["apikey"], "[redacted]")
+        self.assertEqual(summary["keywords"], "[2 items]")
+        self.assertEqual(summary["google"], "[1 items]")
+        self.assertEqual(len(summary["url"]), 103)
+        self.assertIs(summary["yandex"], False)
+        self.assertEqual(summarize_payload(b"raw"), {"type": "bytes"})
+
+
+class TestWithoutHooks(unittest.TestCase):
+    def test_no_observers_are_built(self) -> None:
+        """Without hooks the request path skips timing and builds no callbacks."""
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        self.assertEqual(api_client.hooks, ())
+        self.assertIsNone(api_client._retry_observer("GET", "tasks/1"))
+        self.assertIsNone(api_client._cache_observer("tasks/1", "response"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import json
+import sqlite3
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from rush_analytics import NO_RETRY, AsyncRushAnalyticsAPI, JobJournal, RushAnalyticsAPI, TaskPipeline, Transport
+from rush_analytics.exceptions import UncertainSubmissionError
+from rush_analytics.journal import CREATED, FAILED, FETCHED, FINISHED, SUBMITTING, payload_digest, payload_keys
+
+
+def _payload(name: str) -> dict:
+    return {"name": name, "url": "https://example.com", "keywords": ["shoes"]}
+
+
+class FakeTasks:
+    """Fake API that creates tasks and can fail submissions by name."""
+
+    def __init__(self) -> None:
+        self.ids = itertools.count(1)
+        self.created: Counter[str] = Counter()
+        self.fail: dict[str, Exception | int] = {}
+        self.bodies: dict[str, dict] = {}
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            name = json.loads(request.content)["name"]
+            failure = self.fail.get(name)
+            if isinstance(failure, Exception):
+                raise failure
+            if failure is not None:
+                return httpx.Response(failure)
+            self.created[name] += 1
+            return httpx.Response(200, json=self.bodies.get(name, {"task_id": str(next(self.ids))}))
+        if request.url.path.endswith("results"):
+            return httpx.Response(200, json={"results": [{"k": 1}]})
+        return httpx.Response(200, json={"status": "completed"})
+
+    async def async_respond(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0)
+        return self.respond(request)
+
+    def transport(self) -> Transport:
+        return Transport(
+            http_transport=httpx.MockTransport(self.respond),
+            async_http_transport=httpx.MockTransport(self.async_respond),
+        )
+
+
+class TestJobJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "journal.sqlite3"
+        self.fake = FakeTasks()
+
+    def journal(self, **kwargs) -> JobJournal:
+        journal = JobJournal(self.path, **kwargs)
+        self.addCleanup(journal.close)
+        return journal
+
+    def client(self) -> RushAnalyticsAPI:
+        return RushAnalyticsAPI(api_key="test_api_key", transport=self.fake.transport(), retry_policy=NO_RETRY)
+
+    def test_payload_keys(self) -> None:
+        keys = [key for key, _ in payload_keys([_payload("a"), _payload("b"), _payload("a")])]
+        self.assertEqual(len(set(keys)), 3)
+        self.assertEqual(keys[0].rsplit(".", 1)[0], keys[2].rsplit(".", 1)[0])
+        self.assertEqual(keys, [key for key, _ in payload_keys([_payload("a"), _payload("b"), _payload("a")])])
+
+    def test_payload_keys_hash_the_request_body(self) -> None:
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        first = np.array([f"keyword {i}" for i in range(5000)])
+        second = first.copy()
+        second[2500] = "other"
+        keys = [key for key, _ in payload_keys([{**_payload("a"), "keywords": k} for k in (first, second)])]
+        self.assertNotEqual(keys[0].rsplit(".", 1)[0], keys[1].rsplit(".", 1)[0])
+
+    def test_payload_keys_ignore_the_input_form(self) -> None:
+        from rush_analytics import TaskPayload
+
+        forms = [_payload("a"), {**_payload("a"), "keywords": [{"keyword": "shoes"}]}, TaskPayload(**_payload("a"))]
+        self.assertEqual(len({payload_digest(form) for form in forms}), 1)
+        self.assertTrue(payload_digest({"name": "a", "url": "not a url"}).startswith("invalid-"))
+
+    def test_rerun_skips_created_tasks(self) -> None:
+        payloads = [_payload(name) for name in ("a", "b", "rejected", "bad_gateway", "timeout", "c")]
+        self.fake.fail = {"rejected": 400, "bad_gateway": 502, "timeout": httpx.ReadTimeout("no answer")}
+
+        first = self.client().create_tasks(payloads, journal=self.journal(), job="nightly")
+        self.assertEqual([result.ok for result in first], [True, True, False, False, False, True])
+        self.assertEqual(
+            Counter(entry.state for entry in self.journal().entries("nightly").values()),
+            {CREATED: 3, FAILED: 1, SUBMITTING: 2},
+        )
+
+        self.fake.fail = {}
+        second = self.client().create_tasks(payloads, journal=self.journal(), job="nightly")
+        self.assertEqual(self.fake.created, {"a": 1, "b": 1, "c": 1, "rejected": 1})
+        self.assertEqual([result.value["task_id"] for result in second[:2]], [first[0].value["task_id"], first[1].value["task_id"]])
+        self.assertIsInstance(second[3].error, UncertainSubmissionError)
+        self.assertIsInstance(second[4].error, UncertainSubmissionError)
+
+        self.client().create_tasks(payloads, journal=self.journal(resubmit_uncertain=True), job="nightly")
+        self.assertEqual(self.fake.created["bad_gateway"], 1)
+        self.assertEqual(self.fake.created["timeout"], 1)
+        self.assertEqual(self.journal().counts("nightly"), {CREATED: 6})
+
+    def test_response_without_task_id_is_uncertain(self) -> None:
+        self.fake.bodies = {"nested": {"data": {"taskId": "7"}}}
+        payloads = [_payload("nested")]
+        self.client().create_tasks(payloads, journal=self.journal(), job="job")
+        (entry,) = self.journal().entries("job").values()
+        self.assertEqual((entry.state, entry.task_id), (SUBMITTING, None))
+        self.assertIn('"taskId":"7"', entry.error)
+
+        rerun = self.client().create_tasks(payloads, journal=self.journal(), job="job")
+        self.assertIsInstance(rerun[0].error, UncertainSubmissionError)
+        self.assertEqual(self.fake.created["nested"], 1)
+        self.assertEqual(self.journal().pending("job"), [])
+
+    def test_progress_is_batched(self) -> None:
+        journal = self.journal(batch_size=100, flush_interval=60)
+        results = self.client().create_tasks([_payload("a"), _payload("b")], journal=journal, job="job")
+        task_ids = [result.value["task_id"] for result in results]
+        for task_id in task_ids:
+            journal.finished("job", task_id, {"status": "completed"})
+        journal.fetched("job", task_ids[0])
+
+        reader = sqlite3.connect(self.path)
+        self.addCleanup(reader.close)
+        states = "SELECT state FROM submissions ORDER BY task_id"
+        self.assertEqual(reader.execute(states).fetchall(), [(CREATED,), (CREATED,)])
+        journal.flush()
+        self.assertEqual(reader.execute(states).fetchall(), [(FETCHED,), (FINISHED,)])
+        self.assertEqual(journal.unfetched("job"), [task_ids[1]])
+        self.assertEqual(journal.pending("job"), [])
+        with self.assertRaises(KeyError):
+            journal.finished("job", "999", {})
+
+    def test_newer_journal_is_not_dropped(self) -> None:
+        journal = self.journal()
+        self.client().create_tasks([_payload("a")], journal=journal, job="job")
+        journal.close()
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA user_version=2")
+        conn.close()
+        with self.assertRaises(RuntimeError):
+            JobJournal(self.path)
+        conn = sqlite3.connect(self.path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT state FROM submissions").fetchall(), [(CREATED,)])
+
+    def test_pipeline_resumes(self) -> None:
+        payloads = [_payload(str(n)) for n in range(6)]
+
+        async def run(stop_after: int | None) -> TaskPipeline:
+            async with AsyncRushAnalyticsAPI(
+                api_key="test_api_key", transport=self.fake.transport(), retry_policy=NO_RETRY
+            ) as api_client:
+                pipeline = TaskPipeline(api_client, submit_concurrency=2, max_pending=3, initial_interval=0.001)
+                delivered = 0
+                async for result in pipeline.run(payloads, journal=self.journal(), job="nightly"):
+                    delivered += result.ok
+                    if delivered == stop_after:
+                        pipeline.cancel()
+                return pipeline
+
+        first = asyncio.run(run(stop_after=2)).summary
+        self.assertTrue(first.cancelled)
+        second = asyncio.run(run(stop_after=None)).summary
+        self.assertEqual(first.abandoned, sorted(first.abandoned))
+        self.assertEqual(second.skipped, 2)
+        self.assertEqual(second.completed, 4)
+        self.assertEqual(second.resumed, len(first.abandoned))
+        self.assertEqual(second.resumed + second.submitted, 4)
+        self.assertEqual(sum(self.fake.created.values()), 6)
+        self.assertEqual(self.journal().counts("nightly"), {FETCHED: 6})
+
+
+if __name__ == "__main__":
+    unittest.main()
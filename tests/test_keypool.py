@@ -0,0 +1,198 @@
+import asyncio
+import inspect
+import itertools
+import json
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from rush_analytics import NO_RETRY, APIKey, AsyncKeyPool, KeyPool, SQLiteCache, Transport
+from rush_analytics.exceptions import InvalidAPIKeyError, NoAvailableKeyError, RateLimitExceededError
+
+
+class FakeAccounts:
+    """Fake API that owns tasks per API key and can reject or throttle keys."""
+
+    def __init__(self) -> None:
+        self.ids = itertools.count(1)
+        self.owners: dict[str, str] = {}
+        self.requests: Counter[str] = Counter()
+        self.invalid: set[str] = set()
+        self.throttled: set[str] = set()
+        self.lock = threading.Lock()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        key = request.headers["Authorization"].removeprefix("Bearer ")
+        with self.lock:
+            self.requests[key] += 1
+        if key in self.invalid:
+            return httpx.Response(403)
+        if key in self.throttled:
+            return httpx.Response(429)
+        parts = request.url.path.removeprefix("/api/").split("/")
+        if request.method == "POST":
+            task_id = str(next(self.ids))
+            self.owners[task_id] = json.loads(request.content)["apikey"]
+            return httpx.Response(200, json={"task_id": task_id})
+        if parts[0] == "tasks":
+            if self.owners.get(parts[1]) != key:
+                return httpx.Response(404)
+            return httpx.Response(200, json={"task_id": parts[1], "status": "completed", "results": [{"k": 1}]})
+        return httpx.Response(200, json={"languages": ["en"]})
+
+    def transport(self) -> Transport:
+        return Transport(
+            http_transport=httpx.MockTransport(self.handler), async_http_transport=httpx.MockTransport(self.handler)
+        )
+
+
+TASK = {"name": "Task", "url": "https://example.com", "keywords": ["shoes"]}
+
+
+class TestKeyPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fake = FakeAccounts()
+
+    def pool(self, keys: list, **kwargs) -> KeyPool:
+        return KeyPool(keys, transport=self.fake.transport(), retry_policy=NO_RETRY, **kwargs)
+
+    def test_tasks_are_pinned_to_their_key(self) -> None:
+        pool = self.pool(["a", "b", "c"])
+        task_ids = [pool.create_task(**TASK)["task_id"] for _ in range(6)]
+        self.assertEqual(Counter(self.fake.owners.values()), {"a": 2, "b": 2, "c": 2})
+        for task_id in task_ids:
+            self.assertEqual(pool.get_task_status(task_id)["status"], "completed")
+            self.assertEqual(list(pool.iter_task_results(task_id, key="results")), [{"k": 1}])
+        outcomes = pool.wait_for_tasks(task_ids[:2], initial_interval=0)
+        self.assertEqual(sorted(outcome.task_id for outcome in outcomes), sorted(task_ids[:2]))
+        self.assertEqual({stats["in_flight"] for stats in pool.stats().values()}, {0})
+        with self.assertRaises(KeyError):
+            pool.get_task_status("999")
+
+    def test_weighted_round_robin(self) -> None:
+        pool = self.pool([APIKey("a", weight=3), APIKey("b", weight=1)], strategy="weighted_round_robin")
+        for _ in range(8):
+            pool.create_task(**TASK)
+        self.assertEqual(Counter(self.fake.owners.values()), {"a": 6, "b": 2})
+
+    def test_least_loaded_prefers_idle_keys(self) -> None:
+        pool = self.pool(["a", "b"])
+        busy = pool._acquire("tasks")
+        self.assertNotEqual(pool._acquire("tasks").name, busy.name)
+
+    def test_credit_budget(self) -> None:
+        pool = self.pool([APIKey("a", credits=2), APIKey("b", credits=1)], costs={"tasks": 1})
+        for _ in range(3):
+            pool.create_task(**TASK)
+        with self.assertRaises(NoAvailableKeyError) as caught:
+            pool.create_task(**TASK)
+        self.assertIsNone(caught.exception.retry_in)
+        self.assertEqual(pool.stats()["key0"]["credits_remaining"], 0)
+
+    def test_invalid_key_is_quarantined_and_skipped(self) -> None:
+        self.fake.invalid.add("a")
+        pool = self.pool(["a", "b"])
+        for _ in range(4):
+            pool.create_task(**TASK)
+        self.assertEqual(self.fake.requests["a"], 1)
+        self.assertEqual(self.fake.requests["b"], 4)
+        self.assertGreater(pool.stats()["key0"]["quarantined_for"], 0)
+        self.assertEqual(pool.stats()["key0"]["failures"], 1)
+
+        pool.release_quarantine("key0")
+        self.fake.invalid.clear()
+        pool.create_task(**TASK)
+        self.assertEqual(self.fake.requests["a"], 2)
+
+    def test_repeated_rate_limits_quarantine_a_key(self) -> None:
+        pool = self.pool(["a", "b"], max_rate_limits=2, quarantine=30)
+        task_id = pool.create_task(**TASK)["task_id"]
+        owner = self.fake.owners[task_id]
+        self.fake.throttled.add(owner)
+        for _ in range(2):
+            with self.assertRaises(RateLimitExceededError):
+                pool.get_task_status(task_id)
+        with self.assertRaises(NoAvailableKeyError) as caught:
+            pool.get_task_status(task_id)
+        self.assertGreater(caught.exception.retry_in, 0)
+        # New work keeps flowing through the other key.
+        pool.create_task(**TASK)
+
+    def test_every_key_rejected(self) -> None:
+        self.fake.invalid.update({"a", "b"})
+        pool = self.pool(["a", "b"])
+        with self.assertRaises(InvalidAPIKeyError):
+            pool.create_task(**TASK)
+        with self.assertRaises(NoAvailableKeyError):
+            pool.create_task(**TASK)
+
+    def test_pins_persist(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = SQLiteCache(Path(directory) / "pins.sqlite3")
+            task_id = self.pool(["a", "b"], pins=store).create_task(**TASK)["task_id"]
+            pool = self.pool(["a", "b"], pins=store)
+            self.assertEqual(pool.get_task_status(task_id)["task_id"], task_id)
+            store.close()
+
+    def test_concurrent_creation(self) -> None:
+        pool = self.pool(["a", "b", "c", "d"])
+        results = pool.create_tasks([TASK] * 40, max_concurrency=8)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(set(self.fake.owners.values()), {"a", "b", "c", "d"})
+        self.assertEqual(sum(stats["requests"] for stats in pool.stats().values()), 40)
+
+    def test_validation(self) -> None:
+        with self.assertRaises(ValueError):
+            KeyPool([])
+        with self.assertRaises(ValueError):
+            KeyPool(["a"], strategy="random")
+        with self.assertRaises(ValueError):
+            KeyPool([APIKey("a", name="x"), APIKey("b", name="x")])
+
+
+class TestAsyncKeyPool(unittest.TestCase):
+    def test_async_pool(self) -> None:
+        fake = FakeAccounts()
+        fake.invalid.add("a")
+
+        async def run() -> list[str]:
+            async with AsyncKeyPool(["a", "b", "c"], transport=fake.transport(), retry_policy=NO_RETRY) as pool:
+                created = await pool.create_tasks([TASK] * 4)
+                task_ids = [result.unwrap()["task_id"] for result in created]
+                statuses = await asyncio.gather(*(pool.async_get_task_status(task_id) for task_id in task_ids))
+                rows = [row async for row in pool.async_iter_task_results(task_ids[0], key="results")]
+                self.assertEqual(rows, [{"k": 1}])
+                return [status["status"] for status in statuses]
+
+        self.assertEqual(asyncio.run(run()), ["completed"] * 4)
+        self.assertNotIn("a", fake.owners.values())
+
+    def test_sync_names_go_through_the_pool(self) -> None:
+        fake = FakeAccounts()
+
+        async def run() -> AsyncKeyPool:
+            async with AsyncKeyPool(["a", "b"], transport=fake.transport(), retry_policy=NO_RETRY) as pool:
+                task_id = (await pool.create_task(**TASK))["task_id"]
+                self.assertEqual((await pool.get_task_status(task_id))["status"], "completed")
+                self.assertEqual((await pool.get_task_results(task_id))["results"], [{"k": 1}])
+                self.assertEqual([row async for row in pool.iter_task_results(task_id, key="results")], [{"k": 1}])
+                # The idle key answers 429, so the call fails over to the other one.
+                fake.throttled.add("b")
+                self.assertEqual(await pool.list_languages(), {"languages": ["en"]})
+                self.assertEqual({stats["in_flight"] for stats in pool.stats().values()}, {0})
+                self.assertEqual(pool.stats()["key1"]["failures"], 1)
+            return pool
+
+        pool = asyncio.run(run())
+        self.assertTrue(inspect.iscoroutinefunction(pool.close))
+        with self.assertRaises(TypeError):
+            with pool:
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import unittest
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+from pydantic import ValidationError
+
+from rush_analytics import AsyncRushAnalyticsAPI, RushAnalyticsAPI, TaskPayload, build_task_request, keywords_from_rows
+from rush_analytics.payload import normalize_keywords
+from rush_analytics.serialization import dumps, loads
+
+KEYWORDS = [{"keyword": "shoes", "url": "https://example.com/shoes"}, {"keyword": "boots", "url": "https://example.com/boots"}]
+
+
+class TestKeywordForms(unittest.TestCase):
+    def test_strings(self) -> None:
+        payload = TaskPayload(name="Test", url="https://example.com", keywords=["shoes", "boots"])
+        self.assertEqual(payload.keywords, [{"keyword": "shoes"}, {"keyword": "boots"}])
+
+    def test_parallel_columns(self) -> None:
+        columns = {"keyword": ("shoes", "boots"), "url": ["https://example.com/shoes", "https://example.com/boots"]}
+        self.assertEqual(TaskPayload(name="Test", url="https://example.com", keywords=columns).keywords, KEYWORDS)
+
+    def test_rows(self) -> None:
+        rows = [("shoes", "https://example.com/shoes"), ("boots", "https://example.com/boots")]
+        self.assertEqual(normalize_keywords(keywords_from_rows(rows, ("keyword", "url"))), KEYWORDS)
+        with self.assertRaises(ValueError):
+            keywords_from_rows([("shoes",)], ("keyword", "url"))
+
+    def test_dicts_are_unchanged(self) -> None:
+        self.assertEqual(TaskPayload(name="Test", url="https://example.com", keywords=KEYWORDS).keywords, KEYWORDS)
+
+    def test_invalid_compact_input(self) -> None:
+        for keywords in (["shoes", 1], {"keyword": ["shoes", "boots"], "url": ["https://example.com"]}, [1, 2]):
+            with self.subTest(keywords=keywords), self.assertRaises(ValidationError):
+                TaskPayload(name="Test", url="https://example.com", keywords=keywords)
+
+
+class TestSerialization(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        body = build_task_request("key", {"name": "Test", "url": "https://example.com", "keywords": ["é"]})
+        encoded = dumps(body)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(loads(encoded), json.loads(encoded))
+        self.assertEqual(loads(encoded)["keywords"], [{"keyword": "é"}])
+
+    def test_without_orjson(self) -> None:
+        with patch("rush_analytics.serialization.orjson", None):
+            self.assertEqual(dumps({"a": [1, "b"]}), b'{"a":[1,"b"]}')
+            self.assertEqual(loads(b'{"a": 1}'), {"a": 1})
+
+
+class TestCreateTask(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bodies: list[Any] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+        self.bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"task_id": "12345"})
+
+    def test_sync_compact_keywords(self) -> None:
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self.handler))
+
+        response = api_client.create_task(name="Test", url="https://example.com", keywords=["shoes"])
+        self.assertEqual(response, {"task_id": "12345"})
+        self.assertEqual(self.bodies[0]["keywords"], [{"keyword": "shoes"}])
+        self.assertEqual(self.bodies[0]["apikey"], "test_api_key")
+
+    def test_create_task_body(self) -> None:
+        """Both clients send the API's camelCase body with the API key, as the async client always did."""
+        kwargs = {
+            "name": "Test",
+            "url": "https://example.com",
+            "competitors": ["competitor.com"],
+            "data_collection_frequency": 1,
+            "yandex_regions": [{"id": 1}],
+            "google_regions": [{"id": 2}],
+            "keywords": [{"keyword": "shoes"}],
+        }
+        expected = {
+            "apikey": "test_api_key",
+            "name": "Test",
+            "url": "https://example.com/",
+            "competitors": ["competitor.com"],
+            "dataCollectionFrequency": 1,
+            "yandexRegions": [{"id": 1}],
+            "googleRegions": [{"id": 2}],
+            "keywords": [{"keyword": "shoes"}],
+        }
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self.handler))
+        api_client.create_task(**kwargs)
+
+        async def run() -> None:
+            async with AsyncRushAnalyticsAPI(api_key="test_api_key") as async_client:
+                async_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+                await async_client.create_task(**kwargs)
+
+        asyncio.run(run())
+        self.assertEqual(self.bodies, [expected, expected])
+
+    def test_async_validates(self) -> None:
+        async def run(**kwargs: Any) -> dict[str, Any]:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+            try:
+                return await api_client.create_task(**kwargs)
+            finally:
+                await api_client.close()
+
+        with self.assertRaises(ValidationError):
+            asyncio.run(run(name="Test", url="not a url"))
+        self.assertEqual(self.bodies, [])
+
+        response = asyncio.run(run(name="Test", url="https://example.com", keywords={"keyword": ["shoes"]}))
+        self.assertEqual(response, {"task_id": "12345"})
+        self.assertEqual(self.bodies[0]["dataCollectionFrequency"], 0)
+        self.assertEqual(self.bodies[0]["keywords"], [{"keyword": "shoes"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
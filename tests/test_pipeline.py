@@ -0,0 +1,144 @@
+import asyncio
+import itertools
+import json
+import unittest
+from collections import Counter
+
+import httpx
+
+from rush_analytics import NO_RETRY, AsyncRushAnalyticsAPI, TaskPipeline, Transport
+from rush_analytics.exceptions import InternalServerError, RequestError, TaskFailedError
+
+FAST = {"initial_interval": 0.001, "max_interval": 0.004}
+
+
+class FakePipelineAPI:
+    """Async fake API whose tasks finish after a number of polls given in their name."""
+
+    def __init__(self) -> None:
+        self.ids = itertools.count(1)
+        self.names: dict[str, str] = {}
+        self.polls: Counter[str] = Counter()
+        self.in_flight: Counter[str] = Counter()
+        self.peak: Counter[str] = Counter()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        stage = "submit" if request.method == "POST" else "results" if request.url.path.endswith("results") else "wait"
+        self.in_flight[stage] += 1
+        self.peak[stage] = max(self.peak[stage], self.in_flight[stage])
+        try:
+            await asyncio.sleep(0.001)
+            return self.respond(request, stage)
+        finally:
+            self.in_flight[stage] -= 1
+
+    def respond(self, request: httpx.Request, stage: str) -> httpx.Response:
+        if stage == "submit":
+            name = json.loads(request.content)["name"]
+            if name == "reject":
+                return httpx.Response(500)
+            task_id = str(next(self.ids))
+            self.names[task_id] = name
+            return httpx.Response(200, json={"task_id": task_id})
+        task_id = request.url.path.split("/")[3]
+        name = self.names[task_id]
+        if stage == "results":
+            return httpx.Response(200, json={"results": [{"name": name}]})
+        self.polls[task_id] += 1
+        if name == "broken":
+            return httpx.Response(200, json={"status": "failed"})
+        done = self.polls[task_id] >= int(name.split("-")[1])
+        return httpx.Response(200, json={"status": "completed" if done else "in_progress"})
+
+    def client(self) -> AsyncRushAnalyticsAPI:
+        transport = Transport(async_http_transport=httpx.MockTransport(self.handler))
+        return AsyncRushAnalyticsAPI(api_key="test_api_key", transport=transport, retry_policy=NO_RETRY)
+
+
+def _payload(name: str) -> dict:
+    return {"name": name, "url": "https://example.com", "keywords": ["shoes"]}
+
+
+class TestTaskPipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fake = FakePipelineAPI()
+
+    def run_pipeline(self, payloads, consume=None, **options) -> tuple[list, TaskPipeline]:
+        async def run() -> tuple[list, TaskPipeline]:
+            async with self.fake.client() as api_client:
+                pipeline = TaskPipeline(api_client, **{**FAST, **options})
+                seen = []
+                async for result in pipeline.run(payloads):
+                    seen.append(result)
+                    if consume is not None:
+                        await consume(pipeline, result)
+                return seen, pipeline
+
+        return asyncio.run(run())
+
+    def test_results_stream_as_tasks_finish(self) -> None:
+        payloads = [_payload("slow-6"), _payload("fast-1"), _payload("reject"), _payload("broken"), _payload("mid-3")]
+        results, pipeline = self.run_pipeline(payloads)
+        delivered = [result.index for result in results if result.ok]
+        self.assertEqual(delivered, [1, 4, 0])
+        self.assertEqual(results[-1].results, {"results": [{"name": "slow-6"}]})
+        self.assertEqual(self.fake.polls[results[-1].task_id], 6)
+
+        summary = pipeline.summary
+        self.assertEqual((summary.submitted, summary.completed), (4, 3))
+        self.assertEqual(summary.failed, {"submit": 1, "wait": 1})
+        errors = {result.stage: result.error for result in summary.failures}
+        self.assertIsInstance(errors["submit"], InternalServerError)
+        self.assertIsInstance(errors["wait"], TaskFailedError)
+        self.assertFalse(summary.cancelled)
+        self.assertEqual(summary.abandoned, [])
+
+    def test_stage_concurrency_limits(self) -> None:
+        payloads = [_payload(f"task-{n % 3 + 1}") for n in range(40)]
+        results, _ = self.run_pipeline(
+            payloads, submit_concurrency=3, poll_concurrency=5, results_concurrency=2, max_pending=40
+        )
+        self.assertEqual(len(results), 40)
+        self.assertLessEqual(self.fake.peak["submit"], 3)
+        self.assertLessEqual(self.fake.peak["wait"], 5)
+        self.assertLessEqual(self.fake.peak["results"], 2)
+
+    def test_slow_consumer_pauses_submission(self) -> None:
+        backlog = []
+
+        async def slow(pipeline: TaskPipeline, result) -> None:
+            await asyncio.sleep(0.01)
+            backlog.append(pipeline.summary.submitted - len(backlog) - 1)
+
+        self.run_pipeline([_payload("task-1") for _ in range(30)], slow, max_pending=4)
+        self.assertLessEqual(max(backlog), 4)
+
+    def test_cancel(self) -> None:
+        async def stop(pipeline: TaskPipeline, result) -> None:
+            pipeline.cancel()
+
+        results, pipeline = self.run_pipeline([_payload("task-1")] + [_payload("task-50") for _ in range(5)], stop)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(pipeline.summary.cancelled)
+        self.assertEqual(len(pipeline.summary.abandoned), pipeline.summary.submitted - 1)
+        self.assertGreater(len(pipeline.summary.abandoned), 0)
+
+    def test_timeout_and_poll_errors(self) -> None:
+        class Flaky(FakePipelineAPI):
+            def respond(self, request: httpx.Request, stage: str) -> httpx.Response:
+                if stage == "wait":
+                    return httpx.Response(500)
+                return super().respond(request, stage)
+
+        self.fake = Flaky()
+        results, _ = self.run_pipeline([_payload("task-1")], timeout=0.05)
+        self.assertIsInstance(results[0].error, TimeoutError)
+        self.assertIsInstance(results[0].error.__cause__, RequestError)
+
+    def test_validation(self) -> None:
+        with self.assertRaises(ValueError):
+            TaskPipeline(None, max_pending=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from collections import Counter
+from typing import Any
+
+from rush_analytics.endpoints import NotFoundError, RateLimitExceededError
+from rush_analytics.polling import async_wait_for_tasks, is_terminal_status, wait_for_tasks
+
+
+class FakeStatusSource:
+    """Report a task as completed after a fixed number of polls."""
+
+    def __init__(self, polls_needed: dict[str, int]) -> None:
+        self.polls_needed = polls_needed
+        self.calls: Counter[str] = Counter()
+
+    def __call__(self, task_id: str) -> dict[str, Any]:
+        self.calls[task_id] += 1
+        if task_id == "missing":
+            raise NotFoundError()
+        if task_id == "throttled" and self.calls[task_id] == 1:
+            raise RateLimitExceededError()
+        if self.calls[task_id] >= self.polls_needed.get(task_id, 1):
+            return {"status": "completed"}
+        return {"status": "in_progress"}
+
+
+FAST = {"initial_interval": 0.001, "max_interval": 0.004, "jitter": 0.5}
+
+
+class TestWaitForTasks(unittest.TestCase):
+    def test_is_terminal_status(self) -> None:
+        self.assertTrue(is_terminal_status({"status": "Completed"}))
+        self.assertFalse(is_terminal_status({"status": "queued"}))
+        self.assertFalse(is_terminal_status({}))
+
+    def test_yields_in_completion_order_and_stops_polling(self) -> None:
+        """Each task is polled until terminal and never again afterwards."""
+        source = FakeStatusSource({"a": 3, "b": 1, "c": 2})
+        outcomes = list(wait_for_tasks(source, ["a", "b", "c"], **FAST))
+
+        self.assertEqual([o.task_id for o in outcomes], ["b", "c", "a"])
+        self.assertEqual(dict(source.calls), {"a": 3, "b": 1, "c": 2})
+        self.assertTrue(all(o.ok for o in outcomes))
+
+    def test_priority_breaks_ties(self) -> None:
+        """Tasks due at the same time are polled most urgent first."""
+        source = FakeStatusSource({})
+        outcomes = list(wait_for_tasks(source, ["low", "high"], priorities={"high": -1}, **FAST))
+        self.assertEqual([o.task_id for o in outcomes], ["high", "low"])
+
+    def test_errors(self) -> None:
+        """Fatal errors end a task; transient ones are retried."""
+        source = FakeStatusSource({})
+        outcomes = {o.task_id: o for o in wait_for_tasks(source, ["missing", "throttled"], **FAST)}
+        self.assertIsInstance(outcomes["missing"].error, NotFoundError)
+        self.assertEqual(outcomes["throttled"].status, {"status": "completed"})
+        self.assertEqual(outcomes["throttled"].polls, 2)
+
+    def test_timeout(self) -> None:
+        source = FakeStatusSource({"slow": 10_000})
+        outcomes = list(wait_for_tasks(source, ["slow"], timeout=0.02, **FAST))
+        self.assertIsInstance(outcomes[0].error, TimeoutError)
+
+    def test_async_wait_for_tasks(self) -> None:
+        source = FakeStatusSource({"a": 3, "b": 1})
+
+        async def get_status(task_id: str) -> dict[str, Any]:
+            await asyncio.sleep(0)
+            return source(task_id)
+
+        async def run() -> list[str]:
+            stream = async_wait_for_tasks(get_status, ["a", "b", "missing"], max_concurrency=2, **FAST)
+            return [outcome.task_id async for outcome in stream]
+
+        self.assertEqual(sorted(asyncio.run(run())), ["a", "b", "missing"])
+        self.assertEqual(source.calls["a"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
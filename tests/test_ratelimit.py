@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import httpx
+
+from rush_analytics import NO_RETRY, AsyncRushAnalyticsAPI, Endpoints, RateLimiter, RushAnalyticsAPI
+from rush_analytics.endpoints import RateLimitExceededError, endpoint_template
+from rush_analytics.ratelimit import parse_retry_after
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_then_pacing(self) -> None:
+        """Requests within capacity pass immediately; later ones wait for refill."""
+        limiter = RateLimiter(rate=100, capacity=2)
+        self.assertEqual(limiter._reserve("", None), 0)
+        self.assertEqual(limiter._reserve("", None), 0)
+        self.assertAlmostEqual(limiter._reserve("", None), 0.01, delta=0.005)
+        self.assertAlmostEqual(limiter._reserve("", None), 0.02, delta=0.005)
+
+    def test_endpoint_costs(self) -> None:
+        limiter = RateLimiter(rate=10, capacity=10, costs={Endpoints.CREATE_TASK: 10})
+        self.assertEqual(limiter._reserve(Endpoints.CREATE_TASK.value, None), 0)
+        self.assertGreater(limiter._reserve(Endpoints.TASK_STATUS.value, None), 0.05)
+
+    def test_retry_after_pauses(self) -> None:
+        limiter = RateLimiter(rate=1000)
+        limiter.observe(429, {"Retry-After": "2"})
+        self.assertGreater(limiter._reserve("", None), 1.9)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+    def test_adapts_to_rate_limit_headers(self) -> None:
+        limiter = RateLimiter(rate=100)
+        limiter.observe(200, {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5"})
+        self.assertEqual(limiter.rate, 2)
+        limiter.observe(429, {})
+        self.assertEqual(limiter.rate, 1)
+        limiter.observe(200, {})
+        self.assertEqual(limiter.rate, 6)
+
+    def test_thread_safe_sharing(self) -> None:
+        """Threads sharing a limiter never exceed its budget."""
+        limiter = RateLimiter(rate=200, capacity=1)
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(5)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - start, 19 / 200 - 0.01)
+
+    def test_endpoint_template(self) -> None:
+        self.assertEqual(endpoint_template("tasks/42/results"), Endpoints.TASK_RESULTS.value)
+        self.assertEqual(endpoint_template("tasks"), Endpoints.CREATE_TASK.value)
+        self.assertEqual(endpoint_template("other/path"), "other/path")
+
+
+class TestClientRateLimiting(unittest.TestCase):
+    @staticmethod
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/throttled"):
+            return httpx.Response(429, headers={"Retry-After": "30"})
+        return httpx.Response(200, json={"status": "completed"})
+
+    def test_shared_between_clients(self) -> None:
+        limiter = RateLimiter(rate=1, capacity=2)
+        clients = [RushAnalyticsAPI(api_key=key, rate_limiter=limiter) for key in ("a", "b")]
+        for api_client in clients:
+            api_client.client = httpx.Client(transport=httpx.MockTransport(self._handler))
+            api_client.get_task_status("1")
+        self.assertGreater(limiter._reserve("", None), 0.9)
+
+    def test_retry_after_from_response(self) -> None:
+        limiter = RateLimiter(rate=1000)
+        api_client = RushAnalyticsAPI(api_key="test_api_key", rate_limiter=limiter, retry_policy=NO_RETRY)
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self._handler))
+        with self.assertRaises(RateLimitExceededError):
+            api_client.get_data("throttled")
+        self.assertGreater(limiter._reserve("", None), 29)
+
+    def test_async_client_waits_without_blocking(self) -> None:
+        limiter = RateLimiter(rate=50, capacity=1)
+
+        async def run() -> int:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key", rate_limiter=limiter)
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
+            ticks = 0
+
+            async def ticker() -> None:
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            task = asyncio.create_task(ticker())
+            await asyncio.gather(*(api_client.async_get_task_status(str(i)) for i in range(4)))
+            task.cancel()
+            await api_client.close()
+            return ticks
+
+        start = time.monotonic()
+        ticks = asyncio.run(run())
+        self.assertGreaterEqual(time.monotonic() - start, 3 / 50 - 0.01)
+        self.assertGreater(ticks, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
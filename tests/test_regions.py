@@ -0,0 +1,70 @@
+import unittest
+
+import httpx
+
+from rush_analytics import RegionCatalog, RushAnalyticsAPI
+from rush_analytics.regions import Region
+
+REGIONS = {
+    "regions": [
+        {"id": 1, "name": "United States", "country_code": "US"},
+        {"id": 2, "name": "New York", "parent_id": 1, "country_code": "US"},
+        {"id": 3, "name": "Newark", "parent_id": 1, "country_code": "US"},
+        {"id": 4, "name": "Moscow", "country_code": "RU"},
+        {"id": 5, "name": "Moscow", "parent_id": 1, "country_code": "US"},
+    ]
+}
+
+
+class TestRegionCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.catalog = RegionCatalog.from_response(REGIONS)
+
+    def test_lookup_by_id(self) -> None:
+        self.assertEqual(self.catalog.get(2), Region(2, "New York", 1, "US"))
+        self.assertIsNone(self.catalog.get(99))
+        self.assertIn(4, self.catalog)
+        self.assertEqual(len(self.catalog), 5)
+
+    def test_lookup_by_name(self) -> None:
+        self.assertEqual([r.id for r in self.catalog.by_name("moscow")], [4, 5])
+        self.assertEqual([r.id for r in self.catalog.by_name("MOSCOW", country="us")], [5])
+
+    def test_prefix_search(self) -> None:
+        self.assertEqual([r.name for r in self.catalog.search("new")], ["New York", "Newark"])
+        self.assertEqual(len(self.catalog.search("new", limit=1)), 1)
+        self.assertEqual(self.catalog.search("zzz"), [])
+
+    def test_parent_and_country(self) -> None:
+        self.assertEqual([r.id for r in self.catalog.children(1)], [2, 3, 5])
+        self.assertEqual([r.id for r in self.catalog.in_country("RU")], [4])
+
+    def test_bulk_resolve(self) -> None:
+        resolved = self.catalog.resolve(["Newark", "nowhere", "Moscow"], country="RU")
+        self.assertEqual(resolved, [None, None, Region(4, "Moscow", None, "RU")])
+        self.assertEqual([r.id for r in self.catalog.resolve(["newark", "new york"])], [3, 2])
+        self.assertEqual(self.catalog.resolve(["Newark"])[0].as_payload(), {"id": 3, "name": "Newark"})
+        with self.assertRaises(KeyError):
+            self.catalog.resolve(["nowhere"], strict=True)
+
+    def test_custom_fields_and_plain_list(self) -> None:
+        catalog = RegionCatalog.from_response([{"region_id": "a", "title": "Kyiv"}], id_field="region_id", name_field="title")
+        self.assertEqual(catalog.get("a").name, "Kyiv")
+
+    def test_client_reuses_catalog(self) -> None:
+        """The catalog is built once while the region list is served from cache."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json=REGIONS)
+
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(handler))
+        catalog = api_client.google_region_catalog()
+        self.assertIs(api_client.google_region_catalog(), catalog)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import unittest
+from contextlib import aclosing
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, RankTrend, ResultsStore, RushAnalyticsAPI
+
+
+def _row(keyword: str, day: str, position: Any, region: str = "Moscow", engine: str = "google") -> dict[str, Any]:
+    return {"keyword": keyword, "region": region, "engine": engine, "date": day, "position": position, "url": "/a"}
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = ResultsStore(":memory:")
+        self.addCleanup(self.store.close)
+        self.store.upsert(
+            "1",
+            [
+                _row("shoes", "2024-05-01", 10),
+                _row("shoes", "2024-05-02", 7),
+                _row("shoes", "2024-05-03", 4),
+                _row("shoes", "2024-05-02", 30, engine="yandex"),
+                _row("shoes", "2024-05-02", 12, region="Kazan"),
+                _row("boots", "2024-05-03", None),
+            ],
+        )
+
+    def test_history_filters(self) -> None:
+        history = self.store.history("shoes", "Moscow", "google")
+        self.assertEqual(
+            [(point.date, point.position) for point in history], [("2024-05-01", 10), ("2024-05-02", 7), ("2024-05-03", 4)]
+        )
+        self.assertEqual(len(self.store.history("shoes")), 5)
+        self.assertEqual(len(self.store.history("shoes", engine="google", since="2024-05-02", until="2024-05-02")), 2)
+        self.assertEqual(self.store.history("shoes", task_id="2"), [])
+
+    def test_days_is_relative_to_today(self) -> None:
+        today = date.today()
+        self.store.upsert("2", [_row("hats", (today - timedelta(days=d)).isoformat(), d) for d in (1, 30, 120)])
+        self.assertEqual([point.position for point in self.store.history("hats", days=90)], [30, 1])
+
+    def test_trend(self) -> None:
+        trend = self.store.trend("shoes", "Moscow", "google")
+        self.assertEqual(trend, RankTrend(3, first=10, last=4, best=4, worst=10, average=7.0))
+        self.assertEqual(trend.change, 6)
+        self.assertEqual(self.store.trend("boots"), RankTrend(0))
+        self.assertIsNone(RankTrend(0).change)
+
+    def test_upsert_replaces_rows(self) -> None:
+        with self.assertLogs("rush_analytics.results_store", "WARNING"):
+            self.assertEqual(self.store.upsert("1", [_row("shoes", "2024-05-03", 2), {"keyword": "no date"}, "junk"]), 1)
+        self.assertEqual(self.store.skipped, 2)
+        self.assertEqual(self.store.history("shoes", "Moscow", "google")[-1].position, 2)
+        self.assertEqual(len(self.store), 6)
+        self.assertEqual(self.store.latest("1")[0]["keyword"], "boots")
+        self.assertEqual(self.store.keywords("1"), ["boots", "shoes"])
+        self.assertEqual(len(list(self.store.rows("1"))), 6)
+        self.store.delete("1")
+        self.assertEqual(len(self.store), 0)
+
+    def test_nested_rows_and_aliases(self) -> None:
+        rows = [
+            {
+                "query": "boots",
+                "region_name": "Moscow",
+                "se": "yandex",
+                "positions": [{"checked_at": "2024-05-01", "pos": 9}, {"checked_at": "2024-05-02", "pos": 5}],
+            }
+        ]
+        self.assertEqual(self.store.upsert("3", rows), 2)
+        history = self.store.history("boots", "Moscow", "yandex")
+        self.assertEqual([(point.date, point.position) for point in history], [("2024-05-01", 9), ("2024-05-02", 5)])
+        self.assertEqual(
+            self.store.latest("3"),
+            [{"keyword": "boots", "region": "Moscow", "engine": "yandex", "checked_at": "2024-05-02", "pos": 5}],
+        )
+        self.assertEqual(self.store.skipped, 0)
+
+    def test_bulk_upsert_and_indexed_lookup(self) -> None:
+        start = date(2024, 1, 1)
+        rows = [_row(f"kw {i % 1000}", (start + timedelta(days=i // 1000)).isoformat(), i % 100) for i in range(50_000)]
+        self.assertEqual(self.store.upsert("big", rows), 50_000)
+        self.assertEqual(len(self.store.history("kw 7", "Moscow", "google", since="2024-01-10")), 41)
+        plan = self.store._select("EXPLAIN QUERY PLAN SELECT * FROM results WHERE keyword = ? AND region = ?", ("a", "b"))
+        self.assertIn("results_by_keyword", str(plan))
+
+    def test_persists_to_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "results.sqlite3"
+            store = ResultsStore(path)
+            store.upsert("1", [_row("shoes", "2024-05-01", 3)])
+            store.close()
+            store = ResultsStore(path)
+            self.assertEqual(store.history("shoes")[0].position, 3)
+            store.close()
+
+
+class TestSchemaVersions(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "results.sqlite3"
+        store = ResultsStore(self.path)
+        store.upsert("1", [_row("shoes", "2024-05-01", 3)])
+        store.close()
+
+    def _set_version(self, version: int) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute(f"PRAGMA user_version={version}")
+        conn.close()
+
+    def test_unknown_version_is_not_dropped(self) -> None:
+        self._set_version(99)
+        with self.assertRaises(RuntimeError):
+            ResultsStore(self.path)
+        self._set_version(1)
+        store = ResultsStore(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual(len(store), 1)
+
+    def test_older_version_is_migrated(self) -> None:
+        migrations = {1: ("ALTER TABLE results ADD COLUMN note TEXT",)}
+        with mock.patch("rush_analytics.results_store.RESULTS_SCHEMA_VERSION", 2), mock.patch(
+            "rush_analytics.results_store._MIGRATIONS", migrations
+        ):
+            store = ResultsStore(self.path)
+            self.addCleanup(store.close)
+        self.assertEqual(store.history("shoes")[0].position, 3)
+        self.assertEqual(store._conn.execute("PRAGMA user_version").fetchone()[0], 2)
+
+
+class TestClientFillsStore(unittest.TestCase):
+    ROWS = [_row("shoes", "2024-05-01", 3), _row("shoes", "2024-05-02", 2)]
+
+    @classmethod
+    def handler(cls, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"status": "completed", "results": cls.ROWS})
+
+    def setUp(self) -> None:
+        self.store = ResultsStore(":memory:", batch_size=1)
+        self.addCleanup(self.store.close)
+
+    def test_sync_client(self) -> None:
+        api_client = RushAnalyticsAPI(api_key="test_api_key", results_store=self.store)
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self.handler))
+        api_client.get_task_results("1")
+        self.assertEqual(len(self.store.history("shoes", task_id="1")), 2)
+        self.assertEqual(list(api_client.iter_task_results("2", key="results")), self.ROWS)
+        self.assertEqual(len(self.store.history("shoes", task_id="2")), 2)
+
+    def test_stopping_early_keeps_delivered_rows(self) -> None:
+        store = ResultsStore(":memory:", batch_size=100)
+        self.addCleanup(store.close)
+        rows = [_row("shoes", f"2024-05-{day:02}", day) for day in range(1, 11)]
+        for row in store.tee("1", rows):
+            if row["position"] == 3:
+                break
+        self.assertEqual(len(store), 3)
+
+        async def source():
+            for row in rows:
+                yield row
+
+        async def run() -> set[str]:
+            threads = set()
+            upsert = store.upsert
+
+            def recording_upsert(task_id: str, batch: list) -> int:
+                threads.add(threading.current_thread().name)
+                return upsert(task_id, batch)
+
+            store.upsert = recording_upsert
+            async with aclosing(store.async_tee("2", source())) as tee:
+                async for row in tee:
+                    if row["position"] == 4:
+                        break
+            return threads
+
+        threads = asyncio.run(run())
+        self.assertEqual(len(store.history("shoes", task_id="2")), 4)
+        self.assertNotIn(threading.main_thread().name, threads)
+
+    def test_async_client(self) -> None:
+        async def run() -> None:
+            async with AsyncRushAnalyticsAPI(api_key="test_api_key", results_store=self.store) as api_client:
+                api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+                await api_client.async_get_task_results_columns("1", key="results")
+
+        asyncio.run(run())
+        self.assertEqual(self.store.trend("shoes").last, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
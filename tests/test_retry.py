@@ -0,0 +1,161 @@
+import asyncio
+import unittest
+from collections.abc import Callable
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, CircuitBreaker, RetryPolicy, RushAnalyticsAPI
+from rush_analytics.endpoints import InternalServerError, NotFoundError, RateLimitExceededError, RequestError
+from rush_analytics.exceptions import CircuitOpenError
+
+FAST = RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.005, deadline=5)
+
+
+def _scripted(*responses: int | Exception) -> tuple[list[httpx.Request], Callable[[httpx.Request], httpx.Response]]:
+    """Build a handler that answers with the given statuses or raises the given errors in turn."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        outcome = responses[min(len(requests), len(responses)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        headers = {"Retry-After": "0.01"} if outcome == 429 else {}
+        return httpx.Response(outcome, json={"task_id": "1"}, headers=headers)
+
+    return requests, handler
+
+
+def _client(handler: Callable[[httpx.Request], httpx.Response], **kwargs) -> RushAnalyticsAPI:
+    api_client = RushAnalyticsAPI(api_key="test_api_key", retry_policy=kwargs.pop("retry_policy", FAST), **kwargs)
+    api_client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return api_client
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_get_retries_server_and_network_errors(self) -> None:
+        requests, handler = _scripted(503, httpx.ReadTimeout("slow"), 200)
+        self.assertEqual(_client(handler).get_task_status("1"), {"task_id": "1"})
+        self.assertEqual(len(requests), 3)
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        requests, handler = _scripted(500)
+        with self.assertRaises(InternalServerError):
+            _client(handler).get_task_status("1")
+        self.assertEqual(len(requests), 4)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        requests, handler = _scripted(404)
+        with self.assertRaises(NotFoundError):
+            _client(handler).get_task_status("1")
+        self.assertEqual(len(requests), 1)
+
+    def test_rate_limit_uses_retry_after(self) -> None:
+        requests, handler = _scripted(429, 200)
+        self.assertEqual(_client(handler).get_task_status("1"), {"task_id": "1"})
+        self.assertEqual(len(requests), 2)
+
+    def test_deadline(self) -> None:
+        requests, handler = _scripted(429)
+        policy = RetryPolicy(max_attempts=100, deadline=0.005)
+        with self.assertRaises(RateLimitExceededError):
+            _client(handler, retry_policy=policy).get_task_status("1")
+        self.assertLess(len(requests), 5)
+
+    def test_create_task_is_not_retried_by_default(self) -> None:
+        """A POST that may have reached the server is not resent unless the caller opts in."""
+        requests, handler = _scripted(500, 200)
+        with self.assertRaises(InternalServerError):
+            _client(handler).create_task(name="t", url="https://example.com")
+        self.assertEqual(len(requests), 1)
+
+        requests, handler = _scripted(500, 200)
+        opted_in = RetryPolicy(max_attempts=2, base_delay=0.001, retry_non_idempotent=True)
+        _client(handler, retry_policy=opted_in).create_task(name="t", url="https://example.com")
+        self.assertEqual(len(requests), 2)
+
+    def test_create_task_retried_when_never_sent(self) -> None:
+        requests, handler = _scripted(httpx.ConnectError("refused"), 429, 200)
+        self.assertEqual(_client(handler).create_task(name="t", url="https://example.com"), {"task_id": "1"})
+        self.assertEqual(len(requests), 3)
+
+    def test_async_retries(self) -> None:
+        requests, handler = _scripted(502, 200)
+
+        async def run() -> dict:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key", retry_policy=FAST)
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await api_client.async_get_task_status("1")
+            finally:
+                await api_client.close()
+
+        self.assertEqual(asyncio.run(run()), {"task_id": "1"})
+        self.assertEqual(len(requests), 2)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_fails_fast(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        requests, handler = _scripted(503)
+        api_client = _client(handler, retry_policy=RetryPolicy(max_attempts=1), circuit_breaker=breaker)
+        for _ in range(2):
+            with self.assertRaises(RequestError):
+                api_client.get_task_status("1")
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            api_client.get_task_status("1")
+        self.assertEqual(len(requests), 2)
+
+    def test_half_open_trial(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure(httpx.ConnectError("down"))
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.allow()
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_cancelled_trial_is_released(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure(httpx.ConnectError("down"))
+
+        async def hang() -> None:
+            await asyncio.Event().wait()
+
+        async def ok() -> str:
+            return "ok"
+
+        async def run() -> str:
+            trial = asyncio.ensure_future(FAST.async_call(hang, breaker=breaker))
+            await asyncio.sleep(0)
+            trial.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await trial
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            return await FAST.async_call(ok, breaker=breaker)
+
+        self.assertEqual(asyncio.run(run()), "ok")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_interrupted_trial_is_released(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure(httpx.ConnectError("down"))
+
+        def interrupt() -> None:
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            FAST.call(interrupt, breaker=breaker)
+        self.assertEqual(FAST.call(lambda: "ok", breaker=breaker), "ok")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_client_errors_do_not_trip(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure(NotFoundError())
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import unittest
+from typing import Any
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, RushAnalyticsAPI, ShardedJob
+from rush_analytics.sharding import split_task, task_id_of
+
+KEYWORDS = [{"keyword": f"kw {i}"} for i in range(25)]
+PAYLOAD: dict[str, Any] = {
+    "name": "Big",
+    "url": "https://example.com",
+    "google_regions": [{"id": 1}, {"id": 2}],
+    "yandex_regions": [{"id": 213}],
+    "keywords": KEYWORDS,
+}
+
+
+class TestSplitTask(unittest.TestCase):
+    def test_split_by_size(self) -> None:
+        shards = split_task(PAYLOAD, shard_size=10)
+        self.assertEqual([len(shard["keywords"]) for shard in shards], [10, 10, 5])
+        self.assertEqual([shard["name"] for shard in shards], ["Big [1/3]", "Big [2/3]", "Big [3/3]"])
+        self.assertEqual([kw for shard in shards for kw in shard["keywords"]], KEYWORDS)
+        self.assertTrue(all(shard["google_regions"] == PAYLOAD["google_regions"] for shard in shards))
+
+    def test_split_by_region(self) -> None:
+        shards = split_task(PAYLOAD, shard_size=None, by_region=True)
+        self.assertEqual(
+            [(shard["google_regions"], shard["yandex_regions"]) for shard in shards],
+            [([{"id": 1}], []), ([{"id": 2}], []), ([], [{"id": 213}])],
+        )
+        self.assertTrue(all(shard["keywords"] == KEYWORDS for shard in shards))
+
+    def test_split_by_region_and_size(self) -> None:
+        self.assertEqual(len(split_task(PAYLOAD, shard_size=20, by_region=True)), 6)
+
+    def test_small_task_is_untouched(self) -> None:
+        self.assertEqual(split_task(PAYLOAD, shard_size=100), [PAYLOAD])
+
+    def test_invalid_size(self) -> None:
+        with self.assertRaises(ValueError):
+            split_task(PAYLOAD, shard_size=0)
+
+    def test_task_id_of(self) -> None:
+        self.assertEqual(task_id_of({"task_id": 7}), "7")
+        self.assertEqual(task_id_of({"id": "a"}), "a")
+        self.assertIsNone(task_id_of({"status": "ok"}))
+
+
+class ShardedTaskTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.created: list[dict[str, Any]] = []
+        self.fail_names: set[str] = set()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            body = json.loads(request.content)
+            if body["name"] in self.fail_names:
+                return httpx.Response(400)
+            self.created.append(body)
+            return httpx.Response(200, json={"task_id": f"t{len(self.created)}"})
+        task_id = request.url.path.split("/")[-2]
+        body = self.created[int(task_id[1:]) - 1]
+        return httpx.Response(200, json={"results": [{"keyword": kw["keyword"]} for kw in body["keywords"]]})
+
+
+class TestShardedTask(ShardedTaskTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.api_client = RushAnalyticsAPI(api_key="test_api_key")
+        self.api_client.client = httpx.Client(transport=httpx.MockTransport(self.handler))
+
+    def test_submit_and_merge(self) -> None:
+        job = self.api_client.create_sharded_task(shard_size=10, **PAYLOAD)
+        self.assertTrue(job.complete)
+        self.assertEqual(sorted(job.task_ids), ["t1", "t2", "t3"])
+        self.assertTrue(all(body["apikey"] == "test_api_key" for body in self.created))
+
+        rows = list(self.api_client.iter_job_results(job, key="results"))
+        self.assertEqual(rows, KEYWORDS)
+        columns = self.api_client.get_job_results_columns(job)
+        self.assertEqual(columns.to_dict()["keyword"], [kw["keyword"] for kw in KEYWORDS])
+
+    def test_failed_shard_is_resubmitted_alone(self) -> None:
+        self.fail_names = {"Big [2/3]"}
+        job = self.api_client.create_sharded_task(shard_size=10, max_concurrency=1, **PAYLOAD)
+        self.assertFalse(job.complete)
+        self.assertEqual([shard.index for shard in job.failed], [1])
+        with self.assertRaises(ValueError):
+            self.api_client.iter_job_results(job)
+
+        self.fail_names = set()
+        self.api_client.submit_shards(job)
+        self.assertTrue(job.complete)
+        self.assertEqual(job.failed, [])
+        self.assertEqual(len(self.created), 3)
+        self.assertEqual(list(self.api_client.iter_job_results(job)), KEYWORDS)
+
+    def test_reset(self) -> None:
+        job = self.api_client.create_sharded_task(shard_size=10, max_concurrency=1, **PAYLOAD)
+        job.reset(["t2"])
+        self.assertEqual([shard.index for shard in job.pending], [1])
+        self.assertIsNone(job.shard_for("t2"))
+
+
+class TestAsyncShardedTask(ShardedTaskTestCase):
+    def test_submit_and_merge(self) -> None:
+        async def run() -> tuple[ShardedJob, list[Any]]:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+            try:
+                job = await api_client.create_sharded_task(shard_size=None, by_region=True, **PAYLOAD)
+                columns = await api_client.async_get_job_results_columns(job)
+                return job, columns.to_dict()["keyword"]
+            finally:
+                await api_client.close()
+
+        job, keywords = asyncio.run(run())
+        self.assertEqual(len(job), 3)
+        self.assertEqual(keywords, [kw["keyword"] for kw in KEYWORDS] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import unittest
+from typing import Any
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, RushAnalyticsAPI
+from rush_analytics.endpoints import NotFoundError
+from rush_analytics.streaming import JSONArrayParser, iter_json_array
+
+ROWS = [{"keyword": f"kw {i}", "position": i, "url": "https://example.com/é"} for i in range(50)]
+BODY = json.dumps({"status": "completed", "meta": {"pages": [1, 2]}, "results": ROWS, "total": 50}).encode()
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestJSONArrayParser(unittest.TestCase):
+    def test_every_chunk_size(self) -> None:
+        """Items are identical whatever the chunk boundaries, including mid-character splits."""
+        for size in (1, 2, 7, 64, len(BODY)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(_chunks(BODY, size), key="results")), ROWS)
+
+    def test_top_level_array_and_numbers(self) -> None:
+        """Numbers split across chunks are not emitted until they are complete."""
+        self.assertEqual(list(iter_json_array([b"[12", b"34, 5", b"6]"])), [1234, 56])
+
+    def test_numbers_split_after_dot_or_exponent(self) -> None:
+        """A chunk ending in "12." or "1e" does not yield the shorter number it happens to decode as."""
+        cases = [
+            ([b"[12.", b"5, 2]"], None, [12.5, 2]),
+            ([b"[1e", b"3]"], None, [1000.0]),
+            ([b"[2.5E", b"-1 , 1]"], None, [0.25, 1]),
+            ([b'{"status": "ok", "avg": 12.', b'5, "results": [{"keyword": "a"}]}'], "results", [{"keyword": "a"}]),
+            ([b'{"total": 1e', b'2, "results": [{"keyword": "a"}]}'], "results", [{"keyword": "a"}]),
+        ]
+        for chunks, key, expected in cases:
+            with self.subTest(chunks=chunks):
+                self.assertEqual(list(iter_json_array(chunks, key=key)), expected)
+        body = json.dumps({"avg": 12.5, "results": [1.25e-3, 3.5, 1e10]}).encode()
+        for size in range(1, 12):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(_chunks(body, size), key="results")), [1.25e-3, 3.5, 1e10])
+
+    def test_first_array_by_default(self) -> None:
+        body = b'{"status": "ok", "rows": [{"a": 1}], "other": [2]}'
+        self.assertEqual(list(iter_json_array([body])), [{"a": 1}])
+
+    def test_items_are_released_incrementally(self) -> None:
+        parser = JSONArrayParser()
+        self.assertEqual(parser.feed(b'[{"a": 1}, {"b"'), [{"a": 1}])
+        self.assertEqual(parser.feed(b": 2}]"), [{"b": 2}])
+        self.assertEqual(parser.close(), [])
+
+    def test_truncated_stream(self) -> None:
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array([b'{"results": [{"a": 1}, {"b":']))
+
+
+class TestIterTaskResults(unittest.TestCase):
+    @staticmethod
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/missing/results"):
+            return httpx.Response(404)
+        return httpx.Response(200, content=BODY)
+
+    def test_sync_iter_task_results(self) -> None:
+        api_client = RushAnalyticsAPI(api_key="test_api_key")
+        api_client.client = httpx.Client(transport=httpx.MockTransport(self._handler))
+
+        self.assertEqual(list(api_client.iter_task_results("12345", key="results")), ROWS)
+        with self.assertRaises(NotFoundError):
+            list(api_client.iter_task_results("missing"))
+
+    def test_async_iter_task_results(self) -> None:
+        async def run() -> list[Any]:
+            api_client = AsyncRushAnalyticsAPI(api_key="test_api_key")
+            api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
+            try:
+                return [row async for row in api_client.async_iter_task_results("12345")]
+            finally:
+                await api_client.close()
+
+        self.assertEqual(asyncio.run(run()), ROWS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+import httpx
+
+from rush_analytics import AsyncRushAnalyticsAPI, RushAnalyticsAPI, Transport
+
+
+class TestTransport(unittest.TestCase):
+    def test_settings_reach_the_pool(self) -> None:
+        timeout = httpx.Timeout(connect=1.0, read=60.0, write=5.0, pool=2.0)
+        with Transport(limits=httpx.Limits(max_connections=7, keepalive_expiry=3.0), timeout=timeout) as transport:
+            client = transport.client
+            self.assertIs(transport.client, client)
+            self.assertEqual(client.timeout, timeout)
+            pool = client._transport._pool
+            self.assertEqual(pool._max_connections, 7)
+            self.assertEqual(pool._keepalive_expiry, 3.0)
+        self.assertTrue(client.is_closed)
+
+    def test_clients_share_one_pool_across_keys(self) -> None:
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers["Authorization"])
+            return httpx.Response(200, json={"status": "ok"})
+
+        transport = Transport()
+        transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+        with RushAnalyticsAPI(api_key="key-a", transport=transport) as a, RushAnalyticsAPI(api_key="key-b", transport=transport) as b:
+            self.assertIs(a.client, b.client)
+            a.get_task_status("1")
+            b.get_task_status("1")
+        self.assertEqual(seen, ["Bearer key-a", "Bearer key-b"])
+        # A transport passed in belongs to the caller and survives the clients.
+        self.assertFalse(transport.client.is_closed)
+        transport.close()
+        self.assertIsNone(transport._client)
+
+    def test_private_transport_is_closed_with_the_client(self) -> None:
+        with RushAnalyticsAPI(api_key="key") as api_client:
+            client = api_client.client
+        self.assertTrue(client.is_closed)
+
+
+class TestAsyncTransport(unittest.TestCase):
+    def test_async_client_does_not_create_a_sync_pool(self) -> None:
+        async def run() -> tuple[Transport, httpx.AsyncClient]:
+            async with AsyncRushAnalyticsAPI(api_key="key") as api_client:
+                self.assertIsInstance(api_client.client, httpx.AsyncClient)
+                return api_client.transport, api_client.client
+
+        transport, client = asyncio.run(run())
+        self.assertIsNone(transport._client)
+        self.assertTrue(client.is_closed)
+
+    def test_sync_with_is_rejected(self) -> None:
+        api_client = AsyncRushAnalyticsAPI(api_key="key")
+        with self.assertRaises(TypeError):
+            with api_client:
+                pass
+        asyncio.run(api_client.close())
+
+    def test_shared_async_transport(self) -> None:
+        async def run() -> Transport:
+            async with Transport() as transport:
+                async with AsyncRushAnalyticsAPI(api_key="a", transport=transport) as a:
+                    async with AsyncRushAnalyticsAPI(api_key="b", transport=transport) as b:
+                        self.assertIs(a.client, b.client)
+                self.assertFalse(transport.async_client.is_closed)
+            return transport
+
+        transport = asyncio.run(run())
+        self.assertIsNone(transport._async_client)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import threading
+
+import httpx
+
+# Connection pool defaults: enough keep-alive connections for a busy worker
+# without holding dozens of idle TLS sessions open.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+# Fail fast on unreachable hosts, but give slow result downloads time to finish.
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=10.0)
+
+
+class Transport:
+    """Connection pool shared by any number of API clients.
+
+    A ``Transport`` owns one ``httpx.Client`` and one ``httpx.AsyncClient``,
+    each created on first use. API clients send their API key with every
+    request rather than baking it into the connection, so clients for
+    different keys can share the same pool, keep-alive connections and TLS
+    sessions. The async pool is bound to the event loop that first uses it.
+
+    Args:
+        limits (httpx.Limits | None): Pool size and keep-alive expiry. Defaults to ``DEFAULT_LIMITS``.
+        timeout (httpx.Timeout | None): Connect, read, write and pool timeouts. Defaults to ``DEFAULT_TIMEOUT``.
+        http2 (bool): Negotiate HTTP/2; requires ``pip install rush-analytics[http2]``.
+        http_transport (httpx.BaseTransport | None): Custom transport for the
+            sync client, such as an ``httpx.MockTransport``. ``limits`` and
+            ``http2`` do not apply to custom transports.
+        async_http_transport (httpx.AsyncBaseTransport | None): Custom transport for the async client.
+
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits | None = None,
+        timeout: httpx.Timeout | None = None,
+        http2: bool = False,
+        http_transport: httpx.BaseTransport | None = None,
+        async_http_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.limits = limits if limits is not None else DEFAULT_LIMITS
+        self.timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+        self.http2 = http2
+        self.http_transport = http_transport
+        self.async_http_transport = async_http_transport
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        """The shared synchronous client."""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    limits=self.limits, timeout=self.timeout, http2=self.http2, transport=self.http_transport
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """The shared asynchronous client."""
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    limits=self.limits, timeout=self.timeout, http2=self.http2, transport=self.async_http_transport
+                )
+            return self._async_client
+
+    def close(self) -> None:
+        """Close the synchronous pool. Use ``aclose`` to close both pools."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close both pools."""
+        self.close()
+        with self._lock:
+            client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.aclose()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Transport":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()